@@ -10,4 +10,4 @@ PORT="${DJANGO_PORT:-$PORT}"
 python -m src.manage migrate
 python -m src.manage collectstatic --noinput
 
-gunicorn src.config.wsgi --bind "$HOST:$PORT"
+gunicorn -c src/config/gunicorn_conf.py src.config.asgi --bind "$HOST:$PORT"
@@ -0,0 +1,70 @@
+"""Compute duration, convexity, DV01 and accrued interest for bond metrics loaded without them."""
+
+import datetime as dt
+import itertools
+from dataclasses import dataclass
+
+from django.db import transaction
+
+from scripts.get_bund_data import parse_arg_values
+from src.apps.yield_curves.models import BondMetric
+from src.curve_engine.analytics import ANALYTICS_FIELDS, annotate_bond_metrics
+from src.utils.logger import logger
+
+
+@dataclass(frozen=True)
+class BackfillAnalyticsArgs:
+    start: str | None = None
+    end: str | None = None
+    overwrite: bool = False  # Recompute rows that already have analytics.
+    chunk_size: int = 20000  # Rows computed and written at a time.
+
+
+def run(
+    *args: tuple[str, ...],
+):
+    parsed = BackfillAnalyticsArgs(**parse_arg_values(args))
+    try:
+        n_rows = backfill(
+            start=dt.date.fromisoformat(parsed.start) if parsed.start else None,
+            end=dt.date.fromisoformat(parsed.end) if parsed.end else None,
+            overwrite=parsed.overwrite,
+            chunk_size=int(parsed.chunk_size),
+        )
+    except Exception:
+        logger.exception("Error backfilling bond analytics.")
+        return -1
+
+    logger.info(f"Computed analytics for {n_rows} bond metric rows")
+    return 0
+
+
+def backfill(
+    start: dt.date | None = None,
+    end: dt.date | None = None,
+    overwrite: bool = False,
+    chunk_size: int = 20000,
+) -> int:
+    """Set the analytics fields of bond metrics in `chunk_size` batches; return how many."""
+    bond_metrics = BondMetric.objects.select_related("bond").order_by("date", "bond_id")
+    if start:
+        bond_metrics = bond_metrics.filter(date__gte=start)
+    if end:
+        bond_metrics = bond_metrics.filter(date__lte=end)
+    if not overwrite:
+        bond_metrics = bond_metrics.filter(modified_duration__isnull=True)
+
+    rows = bond_metrics.iterator(chunk_size=chunk_size)
+    n_rows = 0
+    for chunk in iter(lambda: list(itertools.islice(rows, chunk_size)), []):
+        annotate_bond_metrics(chunk)
+        with transaction.atomic():
+            BondMetric.objects.bulk_create(
+                chunk,
+                update_conflicts=True,
+                unique_fields=["date", "bond"],
+                update_fields=ANALYTICS_FIELDS,
+            )
+        n_rows += len(chunk)
+        logger.info(f"Backfilled bond analytics up to {chunk[-1].date}")
+    return n_rows
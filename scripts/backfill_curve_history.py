@@ -0,0 +1,96 @@
+"""Fit a Svensson curve for every date with bond data and add it to the curve history."""
+
+import datetime as dt
+import itertools
+from dataclasses import dataclass
+
+from scripts.get_bund_data import parse_arg_values
+from src.apps.yield_curves.models import BondMetric
+from src.curve_engine.executor import BondQuote, fit_zero_curve, get_executor
+from src.curve_engine.history import CurveHistory, get_curve_history
+from src.utils.logger import logger
+
+MIN_BONDS = 3
+
+
+@dataclass(frozen=True)
+class BackfillArgs:
+    country: str = "DE"
+    start: str | None = None
+    end: str | None = None
+    overwrite: bool = False  # Refit dates already in the history.
+    chunk_size: int = 64  # Dates fitted and written at a time.
+
+
+def run(
+    *args: tuple[str, ...],
+):
+    parsed = BackfillArgs(**parse_arg_values(args))
+    history = get_curve_history()
+    if history is None:
+        logger.error("Curve history is disabled; set history.enabled to backfill it.")
+        return 1
+
+    try:
+        n_dates = backfill(
+            history,
+            parsed.country,
+            start=dt.date.fromisoformat(parsed.start) if parsed.start else None,
+            end=dt.date.fromisoformat(parsed.end) if parsed.end else None,
+            overwrite=parsed.overwrite,
+            chunk_size=int(parsed.chunk_size),
+        )
+    except Exception:
+        logger.exception("Error backfilling curve history.")
+        return -1
+
+    logger.info(f"Added {n_dates} {parsed.country} curves to the history")
+    return 0
+
+
+def backfill(
+    history: CurveHistory,
+    country: str,
+    start: dt.date | None = None,
+    end: dt.date | None = None,
+    overwrite: bool = False,
+    chunk_size: int = 64,
+) -> int:
+    """Fit the curves missing from `history` in the calibration pool; return how many were added."""
+    bond_metrics = BondMetric.curve_universe(country).order_by("date")
+    if start:
+        bond_metrics = bond_metrics.filter(date__gte=start)
+    if end:
+        bond_metrics = bond_metrics.filter(date__lte=end)
+    existing = set() if overwrite else set(history.dates(country).astype(object))
+
+    days = (
+        (date, [BondQuote.from_bond_metric(metric) for metric in metrics])
+        for date, metrics in itertools.groupby(
+            bond_metrics.iterator(chunk_size=2000), key=lambda metric: metric.date
+        )
+        if date not in existing
+    )
+    executor = get_executor()
+    n_dates = 0
+    for chunk in iter(lambda: list(itertools.islice(days, chunk_size)), []):
+        futures = {
+            date: executor.submit(fit_zero_curve, quotes, date, [])
+            for date, quotes in chunk
+            if len(quotes) >= MIN_BONDS
+        }
+        dates, params, max_ttms = [], [], []
+        for date, future in futures.items():
+            try:
+                zero_curve = future.result()
+            except Exception as e:
+                logger.warning(f"Failed to fit {country} curve for {date}: {e}")
+                continue
+            dates.append(date)
+            params.append(zero_curve.parameters)
+            max_ttms.append(zero_curve.max_ttm)
+        history.extend(country, dates, params, max_ttms)
+        n_dates += len(dates)
+        if dates:
+            logger.info(f"Backfilled {country} curves up to {dates[-1]}")
+    return n_dates
@@ -0,0 +1,73 @@
+"""Benchmark yield curve calibration and check for regressions against the baseline."""
+
+from dataclasses import dataclass, field
+
+from scripts.get_bund_data import parse_arg_values
+from src.curve_engine.benchmark import (
+    UNIVERSE_SIZES,
+    baseline_environment,
+    environment,
+    find_regressions,
+    load_baseline,
+    run_benchmarks,
+    save_baseline,
+)
+from src.utils.configuration import conf
+from src.utils.logger import logger
+
+BASELINE_PATH = "benchmarks/calibration_baseline.json"
+BASELINE_REPEATS = 9
+
+
+@dataclass(frozen=True)
+class BenchmarkArgs:
+    methods: str | None = None  # Comma separated, default all.
+    sizes: str | None = None  # Comma separated, default UNIVERSE_SIZES.
+    repeats: int | None = None  # Default 3, or `BASELINE_REPEATS` when updating the baseline.
+    threshold: float = field(default_factory=lambda: float(conf.get("benchmark.threshold", 0.25)))
+    baseline: str = BASELINE_PATH
+    update_baseline: bool = False
+
+
+def run(
+    *args: tuple[str, ...],
+):
+    parsed = BenchmarkArgs(**parse_arg_values(args))
+    # A single size is parsed as an int.
+    sizes = (
+        tuple(int(size) for size in str(parsed.sizes).split(","))
+        if parsed.sizes
+        else UNIVERSE_SIZES
+    )
+    methods = parsed.methods.split(",") if parsed.methods else None
+    repeats = parsed.repeats or (BASELINE_REPEATS if parsed.update_baseline else 3)
+
+    results = run_benchmarks(methods=methods, sizes=sizes, repeats=int(repeats))
+    for result in results:
+        logger.info(
+            f"{result.key}: median {result.median_s * 1e3:.2f}ms, min {result.min_s * 1e3:.2f}ms"
+        )
+
+    if parsed.update_baseline:
+        save_baseline(results, parsed.baseline)
+        logger.info(f"Saved baseline to {parsed.baseline}")
+        return 0
+
+    recorded = baseline_environment(parsed.baseline)
+    current = environment()
+    for key in ("python", "quantlib"):
+        if recorded.get(key) != current[key]:
+            logger.warning(
+                f"Baseline was recorded with {key} {recorded.get(key)}, running {current[key]}"
+            )
+    regressions = find_regressions(results, load_baseline(parsed.baseline), float(parsed.threshold))
+    for regression in regressions:
+        logger.error(
+            f"Regression in {regression.key}: {regression.baseline_s * 1e3:.2f}ms -> "
+            f"{regression.current_s * 1e3:.2f}ms ({regression.ratio:.2f}x)"
+        )
+    if regressions:
+        return 1
+
+    logger.info(f"No regressions beyond {float(parsed.threshold):.0%} of baseline")
+    return 0
@@ -0,0 +1,116 @@
+"""Generate a synthetic Bund market for load tests and benchmarks.
+
+Synthetic bonds have DE ISINs, so once written to a database they are part of
+its Bund curve universe. Only pass `db=true` against a scratch database.
+"""
+
+import datetime as dt
+from dataclasses import dataclass
+
+from scripts.get_bund_data import parse_arg_values
+from src.apps.yield_curves.models import Bond, BondMetric
+from src.curve_engine.analytics import ANALYTICS_FIELDS, annotate_bond_metrics, bond_analytics
+from src.utils.logger import logger
+from src.utils.synthetic import (
+    SyntheticMarket,
+    SyntheticMarketConfig,
+    write_bundesbank_workbooks,
+)
+
+
+@dataclass(frozen=True)
+class SyntheticDataArgs:
+    start: str
+    end: str
+    n_bonds: int = 40
+    seed: int = 0
+    db: bool = False
+    xlsx_dir: str | None = None
+
+
+def run(
+    *args: tuple[str, ...],
+):
+    parsed = SyntheticDataArgs(**parse_arg_values(args))
+    market = SyntheticMarket(
+        SyntheticMarketConfig(
+            start_date=dt.date.fromisoformat(parsed.start),
+            end_date=dt.date.fromisoformat(parsed.end),
+            n_bonds=parsed.n_bonds,
+            seed=parsed.seed,
+        )
+    )
+    logger.info(f"Generated {len(market.bonds)} bonds over {len(market.dates)} dates")
+
+    try:
+        if parsed.db:
+            write_to_database(market)
+        if parsed.xlsx_dir:
+            paths = write_bundesbank_workbooks(market, parsed.xlsx_dir)
+            logger.info(f"Wrote {len(paths)} workbooks to {parsed.xlsx_dir}")
+    except Exception:
+        logger.exception("Error generating synthetic data.")
+        return -1
+
+    return 0
+
+
+def write_to_database(market: SyntheticMarket, batch_size: int = 5000) -> None:
+    bonds = [
+        Bond(
+            isin=row.isin,
+            description=row.description,
+            coupon=row.coupon,
+            maturity_date=row.maturity_date,
+            issue_volume=row.issue_volume,
+        )
+        for row in market.bonds.itertuples()
+    ]
+    logger.info(f"Upserting {len(bonds)} bond rows...")
+    Bond.objects.bulk_create(
+        bonds,
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=["isin"],
+        update_fields=["description", "coupon", "maturity_date", "issue_volume"],
+    )
+
+    n_rows = 0
+    for day in market.iter_days():
+        metrics = [
+            BondMetric(
+                date=date,
+                bond_id=isin,
+                clean_price=clean_price,
+                dirty_price=dirty_price,
+                _yield=_yield,
+            )
+            for date, isin, clean_price, dirty_price, _yield in zip(
+                day["date"],
+                day["isin"],
+                day["clean_price"],
+                day["dirty_price"],
+                day["yield"],
+                strict=True,
+            )
+        ]
+        annotate_bond_metrics(
+            metrics,
+            bond_analytics(
+                day["coupon"],
+                day["maturity_date"],
+                day["date"].iloc[0],
+                day["clean_price"],
+                day["dirty_price"],
+            ),
+        )
+        BondMetric.objects.bulk_create(
+            metrics,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=["date", "bond"],
+            update_fields=["clean_price", "dirty_price", "_yield", *ANALYTICS_FIELDS],
+        )
+        n_rows += len(metrics)
+
+    logger.info(f"Upserted {n_rows} bond metric rows")
@@ -1,21 +1,39 @@
 """Fetch Bund data from bundesbank."""
 
 import datetime as dt
+import hashlib
 import re
 import tempfile
+import threading
+from collections.abc import Iterator
 from dataclasses import dataclass, field
+from functools import cached_property
 from pathlib import Path
 from string import ascii_uppercase
 
 import pandas as pd
 import requests
 from bs4 import BeautifulSoup
-from django.db.models import Max
+from django.db import connection, transaction
 from pydantic import BaseModel as PydanticBaseModel
 
-from src.apps.yield_curves.models import Bond, BondMetric
-from src.utils.data import Extractor, Loader, Transformer, run_pipeline
+from src.apps.yield_curves.models import Bond, BondMetric, IngestManifest
+from src.curve_engine.analytics import ANALYTICS_FIELDS, annotate_bond_metrics
+from src.utils.configuration import conf
+from src.utils.data import (
+    Loader,
+    StreamingExtractor,
+    Transformer,
+    run_pipeline,
+    run_streaming_pipeline,
+)
 from src.utils.logger import logger
+from src.utils.scheduler import register_pipeline
+
+SOURCE = "bundesbank"
+
+# Manifest sheet name of the entry recording how many sheets a workbook has.
+WORKBOOK_ENTRY = "*"
 
 
 class ArbitraryBaseModel(PydanticBaseModel):
@@ -27,9 +45,12 @@ class ArbitraryBaseModel(PydanticBaseModel):
 class BundDataArgs:
     date: dt.date | None = None
     backfill: bool = False
+    stream: bool = False
+    max_queue_size: int = 2
+    metrics_path: str | None = field(default_factory=lambda: conf.get("pipeline.metrics_path"))
 
 
-def parse_args(args: tuple[str, ...]) -> BundDataArgs:
+def parse_arg_values(args: tuple[str, ...]) -> dict:
     validated_args = {}
     for arg in args:
         key, value = arg.split("=")
@@ -42,7 +63,14 @@ def parse_args(args: tuple[str, ...]) -> BundDataArgs:
         elif value.lower() == "none":
             value = None
         validated_args[key] = value
-    return BundDataArgs(**validated_args)
+    return validated_args
+
+
+def parse_args(args: tuple[str, ...]) -> BundDataArgs:
+    values = parse_arg_values(args)
+    if values.get("date"):
+        values["date"] = dt.date.fromisoformat(values["date"])
+    return BundDataArgs(**values)
 
 
 def run(
@@ -50,19 +78,29 @@ def run(
 ):
     parsed = parse_args(args)
 
-    extractor = BundesbankDataExtractor(
+    extractor, transformer, loader = build_pipeline(
         date=parsed.date,
         backfill=parsed.backfill,
     )
-    transformer = BundesbankDataTransformer()
-    loader = BundesbankDataLoader()
 
     try:
-        run_pipeline(
-            extractor,
-            transformer,
-            loader,
-        )
+        if parsed.stream:
+            run_streaming_pipeline(
+                extractor,
+                transformer,
+                loader,
+                max_queue_size=parsed.max_queue_size,
+                name="bundesbank",
+                metrics_path=parsed.metrics_path,
+            )
+        else:
+            run_pipeline(
+                extractor,
+                transformer,
+                loader,
+                name="bundesbank",
+                metrics_path=parsed.metrics_path,
+            )
     except Exception:
         logger.exception("Error in pipeline.")
         return -1
@@ -70,6 +108,12 @@ def run(
     return 0
 
 
+def file_version(headers) -> str:
+    """Hash of the HTTP validators identifying a version of a file, or "" if it has none."""
+    validator = headers.get("ETag") or headers.get("Last-Modified")
+    return hashlib.sha256(validator.encode()).hexdigest() if validator else ""
+
+
 @dataclass(frozen=True)
 class File:
     url: str = field(repr=False)
@@ -77,11 +121,30 @@ class File:
     year: int
     text: str
 
+    @property
+    def file_key(self) -> str:
+        return f"{self.year}-{self.month:02d}"
+
 
 @dataclass(frozen=True)
 class ExcelSheet:
     name: str
     data: pd.DataFrame
+    file_key: str = ""
+
+    @cached_property
+    def content_hash(self) -> str:
+        return hashlib.sha256(self.data.to_csv(index=False).encode()).hexdigest()
+
+
+@dataclass(frozen=True)
+class SheetRef:
+    """Identifies a transformed sheet so the loader can record it in the ingest manifest."""
+
+    file_key: str
+    name: str
+    content_hash: str
+    row_count: int
 
 
 @dataclass(frozen=True)
@@ -95,7 +158,7 @@ class ExcelFile:
         )
 
 
-class BundesbankDataExtractor(Extractor):
+class BundesbankDataExtractor(StreamingExtractor):
     def __init__(
         self,
         date: dt.date | None = None,
@@ -108,39 +171,64 @@ class BundesbankDataExtractor(Extractor):
         self.base_url = "https://www.bundesbank.de/en/service/federal-securities/prices-and-yields"
 
     class Extracted(ArbitraryBaseModel):
-        max_date_in_table: dt.date
         available_files: list[File]
         excel_files: list[ExcelFile]
 
     def extract(self) -> Extracted:
-        max_date_in_table = self._get_max_date_in_table()
         files = self._get_available_files()
         logger.info(f"Found {len(files)} files")
 
-        selected_files = self._select_files(files, max_date_in_table)
+        selected_files = self._select_files(files)
         logger.info(f"Selected {len(selected_files)} files")
 
         raw_data = []
         for file in selected_files:
+            if self._is_loaded(file, files):
+                continue
             logger.info(f"Downloading {file}")
             raw_data.append(self._download_and_parse_excel(file))
 
-        if not raw_data:
-            raise ValueError("No data found")
-
         return self.Extracted(
-            max_date_in_table=max_date_in_table,
             available_files=files,
             excel_files=raw_data,
         )
 
-    def _get_max_date_in_table(self) -> dt.date:
-        max_date = BondMetric.objects.aggregate(Max("date"))["date__max"]
-        return max_date or dt.date.min
+    def extract_batches(self) -> Iterator[Extracted]:
+        try:
+            yield from self._extract_batches()
+        finally:
+            # Streaming runs this in a worker thread, which must release its own DB connection.
+            if threading.current_thread() is not threading.main_thread():
+                connection.close()
+
+    def _extract_batches(self) -> Iterator[Extracted]:
+        files = self._get_available_files()
+        logger.info(f"Found {len(files)} files")
+
+        selected_files = self._select_files(files)
+        logger.info(f"Selected {len(selected_files)} files")
+
+        # One batch per sheet, oldest file first, so each batch only holds a single day.
+        n_batches = 0
+        for file in reversed(selected_files):
+            if self._is_loaded(file, files):
+                continue
+            logger.info(f"Downloading {file}")
+            for sheet in self._iter_excel_sheets(file):
+                n_batches += 1
+                yield self.Extracted(
+                    available_files=files,
+                    excel_files=[ExcelFile(sheets=[sheet])],
+                )
+
+        if not n_batches:
+            logger.info("No new or changed sheets to load")
 
     def _get_available_files(self) -> list[File]:
+        self.throttle()
         response = requests.get(self.base_url)
         response.raise_for_status()
+        self.metrics.bytes_downloaded += len(response.content)
 
         soup = BeautifulSoup(response.text, "html.parser")
 
@@ -172,7 +260,6 @@ class BundesbankDataExtractor(Extractor):
     def _select_files(
         self,
         files: list[File],
-        max_date_in_table: dt.date,
     ) -> list[File]:
         if not files:
             raise ValueError("No files found on the Bundesbank website")
@@ -185,12 +272,8 @@ class BundesbankDataExtractor(Extractor):
         )
 
         if self.backfill:
-            # If no date specified, return all files after latest date
-            return [
-                file
-                for file in sorted_files
-                if (file.year, file.month) >= (max_date_in_table.year, max_date_in_table.month)
-            ]
+            # Consider every file; the ingest manifest skips sheets already loaded and unchanged.
+            return sorted_files
 
         # Find the closest file date
         target_year_month = (self.date.year, self.date.month)
@@ -202,9 +285,47 @@ class BundesbankDataExtractor(Extractor):
 
         raise ValueError(f"No files found for date {self.date}")
 
+    def _is_loaded(self, file: File, available_files: list[File]) -> bool:
+        """Whether every sheet of `file` is loaded and it is unchanged since, so it is not downloaded.
+
+        The newest file gains a sheet every business day, so it is always downloaded. Older
+        files can still be revised, so their HTTP validators are checked against those of
+        the download that was loaded; a file without any is always downloaded.
+        """
+        latest = max((other.year, other.month) for other in available_files)
+        if (file.year, file.month) >= latest:
+            return False
+        entries = list(IngestManifest.objects.filter(source=SOURCE, file_key=file.file_key))
+        workbook = next((entry for entry in entries if entry.sheet_name == WORKBOOK_ENTRY), None)
+        if workbook is None:
+            return False
+        n_loaded = sum(
+            entry.status == IngestManifest.Status.LOADED
+            for entry in entries
+            if entry.sheet_name != WORKBOOK_ENTRY
+        )
+        if n_loaded < workbook.row_count:
+            return False
+
+        self.throttle()
+        response = requests.head(file.url, allow_redirects=True)
+        response.raise_for_status()
+        version = file_version(response.headers)
+        if not version or not workbook.is_loaded(version):
+            logger.info(f"{file} may have been revised since it was loaded, downloading")
+            return False
+        logger.info(f"Skipping {file}, unchanged and all {n_loaded} sheets loaded")
+        return True
+
     def _download_and_parse_excel(self, file: File) -> ExcelFile:
+        return ExcelFile(sheets=list(self._iter_excel_sheets(file)))
+
+    def _iter_excel_sheets(self, file: File) -> Iterator[ExcelSheet]:
+        self.throttle()
         response = requests.get(file.url)
         response.raise_for_status()
+        self.metrics.bytes_downloaded += len(response.content)
+        version = file_version(response.headers)
 
         with tempfile.TemporaryDirectory() as tempdir:
             filename = file.url.split("/")[-1]
@@ -214,31 +335,104 @@ class BundesbankDataExtractor(Extractor):
             filepath = Path(tempdir) / filename
             with filepath.open("wb") as f:
                 f.write(response.content)
+            del response
 
-            excel_data = pd.read_excel(filepath, engine="openpyxl", sheet_name=None)
-            return ExcelFile.from_dict(excel_data)
+            file_key = file.file_key
+            manifest = {
+                entry.sheet_name: entry
+                for entry in IngestManifest.objects.filter(source=SOURCE, file_key=file_key)
+            }
+
+            # Parse sheets lazily so only one sheet's frame is alive at a time.
+            with pd.ExcelFile(filepath, engine="openpyxl") as workbook:
+                for sheet_name in workbook.sheet_names:
+                    sheet = ExcelSheet(
+                        name=sheet_name,
+                        data=workbook.parse(sheet_name),
+                        file_key=file_key,
+                    )
+                    if not self._register_sheet(sheet, manifest.get(sheet_name)):
+                        continue
+                    self.metrics.rows_out += len(sheet.data)
+                    yield sheet
+
+                # Only once every sheet is registered, so an interrupted file is downloaded again.
+                IngestManifest.objects.update_or_create(
+                    source=SOURCE,
+                    file_key=file_key,
+                    sheet_name=WORKBOOK_ENTRY,
+                    defaults={
+                        "content_hash": version,
+                        "status": IngestManifest.Status.LOADED,
+                        "row_count": len(workbook.sheet_names),
+                    },
+                )
+
+    def _register_sheet(self, sheet: ExcelSheet, entry: IngestManifest | None) -> bool:
+        """Record the sheet as pending in the manifest, unless it is loaded and unchanged."""
+        if entry is not None and entry.is_loaded(sheet.content_hash):
+            logger.info(f"Skipping unchanged sheet {sheet.file_key}/{sheet.name}")
+            return False
+
+        if entry is not None and entry.status == IngestManifest.Status.LOADED:
+            logger.info(f"Sheet {sheet.file_key}/{sheet.name} changed, reloading")
+
+        IngestManifest.objects.update_or_create(
+            source=SOURCE,
+            file_key=sheet.file_key,
+            sheet_name=sheet.name,
+            defaults={
+                "content_hash": sheet.content_hash,
+                "status": IngestManifest.Status.PENDING,
+            },
+        )
+        return True
 
 
 class BundesbankDataTransformer(Transformer):
+    COLUMNS = (
+        "date",
+        "isin",
+        "description",
+        "coupon",
+        "maturity_date",
+        "issue_volume",
+        "clean_price",
+        "yield",
+        "dirty_price",
+    )
+
     class Transformed(ArbitraryBaseModel):
         data: pd.DataFrame
-        max_date_in_table: dt.date
+        sheets: list[SheetRef]
 
     def transform(self, extracted: BundesbankDataExtractor.Extracted) -> Transformed:
         data_by_date = []
+        sheets = []
         for excel_file in extracted.excel_files:
             for sheet in excel_file.sheets:
+                self.metrics.rows_in += len(sheet.data)
                 data = self._parse_sheet(sheet)
                 data_by_date.append(data)
+                sheets.append(
+                    SheetRef(
+                        file_key=sheet.file_key,
+                        name=sheet.name,
+                        content_hash=sheet.content_hash,
+                        row_count=len(data),
+                    )
+                )
 
         if not data_by_date:
-            raise ValueError("No data found")
+            logger.info("No new or changed sheets to transform")
+            return self.Transformed(data=pd.DataFrame(columns=list(self.COLUMNS)), sheets=[])
         all_data = pd.concat(data_by_date)
+        self.metrics.rows_out += len(all_data)
 
         logger.info(f"Successfully parsed {len(extracted.excel_files)} Excel files")
         return self.Transformed(
             data=all_data,
-            max_date_in_table=extracted.max_date_in_table,
+            sheets=sheets,
         )
 
     def _parse_sheet(self, sheet: ExcelSheet) -> pd.DataFrame:
@@ -276,23 +470,12 @@ class BundesbankDataTransformer(Transformer):
         # Sheet name to as-of date.
         data["date"] = pd.to_datetime(sheet.name, format="%d.%m.%Y").date()
 
-        return data[
-            [
-                "date",
-                "isin",
-                "description",
-                "coupon",
-                "maturity_date",
-                "issue_volume",
-                "clean_price",
-                "yield",
-                "dirty_price",
-            ]
-        ]
+        return data[list(self.COLUMNS)]
 
 
 class BundesbankDataLoader(Loader):
     def load(self, transformed: BundesbankDataTransformer.Transformed) -> None:
+        self.metrics.rows_in += len(transformed.data)
         bonds_to_insert = []
         metrics_to_insert = []
         for _, row in transformed.data.iterrows():
@@ -308,16 +491,27 @@ class BundesbankDataLoader(Loader):
             if bond not in bonds_to_insert:
                 bonds_to_insert.append(bond)
 
-            metric = BondMetric(
-                date=row["date"],
-                clean_price=row["clean_price"],
-                dirty_price=row["dirty_price"],
-                _yield=row["yield"],
-                bond=bond,
+            metrics_to_insert.append(
+                BondMetric(
+                    date=row["date"],
+                    clean_price=row["clean_price"],
+                    dirty_price=row["dirty_price"],
+                    _yield=row["yield"],
+                    bond=bond,
+                )
             )
-            if metric.date > transformed.max_date_in_table:
-                metrics_to_insert.append(metric)
 
+        annotate_bond_metrics(metrics_to_insert)
+
+        # Commit the rows together with their manifest entries, so a crash never leaves a
+        # sheet marked loaded without its data (or vice versa).
+        with transaction.atomic():
+            self._upsert(bonds_to_insert, metrics_to_insert)
+            self._mark_loaded(transformed.sheets)
+
+        logger.info("Success.")
+
+    def _upsert(self, bonds_to_insert: list[Bond], metrics_to_insert: list[BondMetric]) -> None:
         logger.info(f"Upserting {len(bonds_to_insert)} bond rows...")
         Bond.objects.bulk_create(
             bonds_to_insert,
@@ -333,7 +527,41 @@ class BundesbankDataLoader(Loader):
             ],
         )
 
-        logger.info(f"Inserting {len(metrics_to_insert)} bond metric rows...")
-        BondMetric.objects.bulk_create(metrics_to_insert, ignore_conflicts=True)
+        # Only new or changed sheets reach the loader, so existing rows are overwritten.
+        logger.info(f"Upserting {len(metrics_to_insert)} bond metric rows...")
+        BondMetric.objects.bulk_create(
+            metrics_to_insert,
+            update_conflicts=True,
+            unique_fields=["date", "bond"],
+            update_fields=["clean_price", "dirty_price", "_yield", *ANALYTICS_FIELDS],
+        )
+        self.metrics.rows_out += len(metrics_to_insert)
+
+    def _mark_loaded(self, sheets: list[SheetRef]) -> None:
+        for sheet in sheets:
+            IngestManifest.objects.update_or_create(
+                source=SOURCE,
+                file_key=sheet.file_key,
+                sheet_name=sheet.name,
+                defaults={
+                    "content_hash": sheet.content_hash,
+                    "status": IngestManifest.Status.LOADED,
+                    "row_count": sheet.row_count,
+                },
+            )
 
-        logger.info("Success.")
+
+@register_pipeline(
+    SOURCE,
+    country="DE",
+    rate_limit=float(conf.get("ingest.bundesbank.rate_limit", 2.0)),
+)
+def build_pipeline(
+    date: dt.date | None = None,
+    backfill: bool = False,
+) -> tuple[BundesbankDataExtractor, BundesbankDataTransformer, BundesbankDataLoader]:
+    return (
+        BundesbankDataExtractor(date=date, backfill=backfill),
+        BundesbankDataTransformer(),
+        BundesbankDataLoader(),
+    )
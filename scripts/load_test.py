@@ -0,0 +1,80 @@
+"""Load test the yield_curves endpoints of a running server.
+
+Seed the database first, e.g. with `generate_synthetic_data`. The virtual
+users are created with a random password and deleted again afterwards.
+"""
+
+import json
+import secrets
+from dataclasses import dataclass
+
+from django.contrib.auth.models import User
+
+from scripts.get_bund_data import parse_arg_values
+from src.apps.yield_curves.models import BondMetric
+from src.utils.load_test import LoadTest, LoadTestConfig
+from src.utils.logger import logger
+from src.utils.metrics import write_atomic
+
+USERNAME_PREFIX = "loadtest_"
+
+
+@dataclass(frozen=True)
+class LoadTestArgs:
+    base_url: str = "http://localhost:8000"
+    users: int = 4
+    iterations: int = 20
+    country: str = "DE"
+    n_dates: int = 20  # Most recent dates with data to spread scatters over.
+    output: str | None = None  # Optional JSON report path.
+
+
+def run(
+    *args: tuple[str, ...],
+):
+    parsed = LoadTestArgs(**parse_arg_values(args))
+    # A fresh run id, so only users created here are deleted afterwards.
+    run_id = secrets.token_hex(4)
+    usernames = [f"{USERNAME_PREFIX}{run_id}_{i}" for i in range(int(parsed.users))]
+    password = secrets.token_urlsafe(32)
+    dates = list(
+        BondMetric.objects.filter(bond__isin__startswith=parsed.country)
+        .order_by("-date")
+        .values_list("date", flat=True)
+        .distinct()[: int(parsed.n_dates)]
+    )
+
+    try:
+        for username in usernames:
+            User.objects.create_user(username=username, password=password)
+        result = LoadTest(
+            LoadTestConfig(
+                base_url=parsed.base_url,
+                usernames=usernames,
+                password=password,
+                dates=dates,
+                country=parsed.country,
+                iterations=int(parsed.iterations),
+            )
+        ).run()
+    finally:
+        # Their analyses and scatters go with them.
+        User.objects.filter(username__in=usernames).delete()
+
+    logger.info(f"{len(usernames)} users ran for {result.duration_s:.1f}s")
+    for summary in result.summaries():
+        logger.info(
+            f"{summary['endpoint']}: {summary['requests']} requests, {summary['errors']} errors, "
+            f"{summary['throughput_rps']:.1f} req/s, p50 {summary['p50_ms']:.1f}ms, "
+            f"p95 {summary['p95_ms']:.1f}ms, p99 {summary['p99_ms']:.1f}ms, "
+            f"max {summary['max_queries']} queries"
+        )
+    if parsed.output:
+        write_atomic(parsed.output, json.dumps(result.summaries(), indent=2) + "\n")
+
+    violations = result.budget_violations()
+    for violation in violations:
+        logger.error(f"Query budget not met for {violation}")
+    if violations or result.errors:
+        return 1
+    return 0
@@ -0,0 +1,48 @@
+"""Run the registered ingest pipelines concurrently."""
+
+import datetime as dt
+from dataclasses import dataclass, field
+
+from django.db import connection
+
+import scripts.get_bund_data  # noqa: F401  Registers the Bundesbank pipeline.
+from scripts.get_bund_data import parse_arg_values
+from src.utils.configuration import conf
+from src.utils.logger import logger
+from src.utils.scheduler import registered_pipelines, run_pipelines
+
+
+@dataclass(frozen=True)
+class IngestArgs:
+    sources: str | None = None  # Comma separated pipeline names, default all.
+    date: str | None = None
+    backfill: bool = False
+    max_concurrency: int = field(default_factory=lambda: int(conf.get("ingest.max_concurrency", 4)))
+    metrics_dir: str | None = field(default_factory=lambda: conf.get("ingest.metrics_dir"))
+
+
+def run(
+    *args: tuple[str, ...],
+):
+    parsed = IngestArgs(**parse_arg_values(args))
+    names = parsed.sources.split(",") if parsed.sources else list(registered_pipelines())
+
+    try:
+        date = dt.date.fromisoformat(parsed.date) if parsed.date else None
+        results = run_pipelines(
+            names,
+            max_concurrency=parsed.max_concurrency,
+            options={"date": date, "backfill": parsed.backfill},
+            metrics_dir=parsed.metrics_dir,
+            on_thread_exit=connection.close,
+        )
+    except Exception:
+        logger.exception("Error in ingest scheduler.")
+        return -1
+
+    failed = [result.name for result in results if not result.success]
+    if failed:
+        logger.error(f"Failed pipelines: {', '.join(failed)}")
+        return -1
+
+    return 0
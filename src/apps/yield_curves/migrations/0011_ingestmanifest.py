@@ -0,0 +1,46 @@
+# Generated by Django 5.2.1 on 2026-10-19 18:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("yield_curves", "0010_remove_bondmetric_isin_alter_bondmetric_pk"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IngestManifest",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("source", models.CharField(max_length=32)),
+                ("file_key", models.CharField(max_length=255)),
+                ("sheet_name", models.CharField(max_length=255)),
+                ("content_hash", models.CharField(max_length=64)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("pending", "Pending"), ("loaded", "Loaded")],
+                        default="pending",
+                        max_length=16,
+                    ),
+                ),
+                ("row_count", models.IntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("source", "file_key", "sheet_name"),
+                        name="unique_ingest_manifest_sheet",
+                    )
+                ],
+            },
+        ),
+    ]
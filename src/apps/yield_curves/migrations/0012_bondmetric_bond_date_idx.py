@@ -0,0 +1,28 @@
+# Generated by Django 5.2.1 on 2026-10-19 18:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("yield_curves", "0011_ingestmanifest"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="bondmetric",
+            index=models.Index(
+                fields=["bond", "date"],
+                include=("clean_price", "_yield"),
+                name="bondmetric_bond_date_idx",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="bondmetric",
+            name="bond",
+            field=models.ForeignKey(
+                db_index=False, on_delete=django.db.models.deletion.CASCADE, to="yield_curves.bond"
+            ),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.1 on 2026-10-19 18:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("yield_curves", "0012_bondmetric_bond_date_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="bondmetric",
+            name="accrued_interest",
+            field=models.FloatField(null=True),
+        ),
+        migrations.AddField(
+            model_name="bondmetric",
+            name="convexity",
+            field=models.FloatField(null=True),
+        ),
+        migrations.AddField(
+            model_name="bondmetric",
+            name="dv01",
+            field=models.FloatField(null=True),
+        ),
+        migrations.AddField(
+            model_name="bondmetric",
+            name="modified_duration",
+            field=models.FloatField(null=True),
+        ),
+    ]
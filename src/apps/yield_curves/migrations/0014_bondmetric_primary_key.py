@@ -0,0 +1,26 @@
+from django.db import migrations
+
+# 0010 moved the primary key to (date, bond_id) in the model state only; the table was left
+# without one, so loads can upsert on (date, bond_id) only once duplicates are gone.
+DEDUPLICATE = """
+DELETE FROM yield_curves_bondmetric AS older
+USING yield_curves_bondmetric AS newer
+WHERE older.date = newer.date
+  AND older.bond_id = newer.bond_id
+  AND older.ctid < newer.ctid
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("yield_curves", "0013_bondmetric_analytics"),
+    ]
+
+    operations = [
+        migrations.RunSQL(DEDUPLICATE, migrations.RunSQL.noop),
+        migrations.RunSQL(
+            "ALTER TABLE yield_curves_bondmetric "
+            "ADD CONSTRAINT yield_curves_bondmetric_pkey PRIMARY KEY (date, bond_id)",
+            "ALTER TABLE yield_curves_bondmetric DROP CONSTRAINT yield_curves_bondmetric_pkey",
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.1 on 2026-10-19 19:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("yield_curves", "0014_bondmetric_primary_key"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="bondmetric",
+            name="bondmetric_bond_date_idx",
+        ),
+        migrations.AddConstraint(
+            model_name="bondmetric",
+            constraint=models.UniqueConstraint(
+                fields=("bond", "date"),
+                include=("clean_price", "_yield"),
+                name="bondmetric_bond_date_uniq",
+            ),
+        ),
+    ]
@@ -1,11 +1,16 @@
+from __future__ import annotations
+
 import datetime as dt
-from functools import cached_property
+from typing import TYPE_CHECKING
 
-import QuantLib as ql
 from django.contrib.auth.models import User
 from django.db import models
 
 from src.constants import DAYS_IN_YEAR
+from src.utils.ql import bond_day_count, calendar, quantlib
+
+if TYPE_CHECKING:
+    import QuantLib as ql
 
 
 class Bond(models.Model):
@@ -29,17 +34,13 @@ class Bond(models.Model):
         }
         return f"Bond({', '.join([f'{k}={v}' for k, v in items.items()])})"
 
-    @cached_property
+    @property
     def _ql_day_count(self) -> ql.DayCounter:
-        return ql.ActualActual(ql.ActualActual.Bond)
+        return bond_day_count()
 
-    @cached_property
+    @property
     def _ql_calendar(self) -> ql.Calendar:
-        match self.country.upper():
-            case "DE":
-                return ql.Germany(ql.Germany.Settlement)
-            case _:
-                raise ValueError(f"Unsupported country: {self.country}")
+        return calendar(self.country)
 
     def build_ql_bond(self, date: dt.date) -> ql.FixedRateBond | ql.ZeroCouponBond:
         if self.coupon > 0.0:
@@ -51,6 +52,7 @@ class Bond(models.Model):
         self,
         date: dt.date,
     ):
+        ql = quantlib()
         # Convert dates to QuantLib format
         ql_date = ql.Date(date.day, date.month, date.year)
         ql_maturity_date = ql.Date(
@@ -83,6 +85,7 @@ class Bond(models.Model):
         self,
         date: dt.date,
     ):
+        ql = quantlib()
         ql_maturity_date = ql.Date(
             self.maturity_date.day,
             self.maturity_date.month,
@@ -98,18 +101,45 @@ class Bond(models.Model):
 
 
 class BondMetric(models.Model):
-    bond = models.ForeignKey(Bond, on_delete=models.CASCADE)
+    # Lookups by bond use the (bond, date) index below rather than a separate one.
+    bond = models.ForeignKey(Bond, on_delete=models.CASCADE, db_index=False)
     date = models.DateField()
     clean_price = models.DecimalField(max_digits=16, decimal_places=4)
     dirty_price = models.DecimalField(max_digits=16, decimal_places=4)
     _yield = models.DecimalField(db_column="yield", max_digits=16, decimal_places=4)
+    # Per 100 nominal, computed from the quoted prices when rows are loaded; see
+    # `src.curve_engine.analytics`. Null for matured bonds and rows not yet backfilled.
+    accrued_interest = models.FloatField(null=True)
+    modified_duration = models.FloatField(null=True)
+    convexity = models.FloatField(null=True)
+    dv01 = models.FloatField(null=True)
 
     pk = models.CompositePrimaryKey("date", "bond_id")
 
+    class Meta:
+        constraints = [
+            # The primary key leads with date; per-bond histories need bond first. Covering the
+            # price and yield (on PostgreSQL) lets them be read from the index alone.
+            models.UniqueConstraint(
+                fields=["bond", "date"],
+                include=["clean_price", "_yield"],
+                name="bondmetric_bond_date_uniq",
+            ),
+        ]
+
     @property
     def ttm(self):
         return (self.bond.maturity_date - self.date).days / DAYS_IN_YEAR
 
+    @classmethod
+    def curve_universe(cls, country: str):
+        """Metrics of the bonds curves are fitted to: the conventional bonds of `country`."""
+        return cls.objects.filter(
+            bond__isin__startswith=country,
+            bond__is_green=False,
+            bond__is_indexed=False,
+        ).select_related("bond")
+
     def __str__(self):
         items = {
             "isin": self.bond.isin,
@@ -118,6 +148,7 @@ class BondMetric(models.Model):
         return f"BondMetric({', '.join([f'{k}={v}' for k, v in items.items()])})"
 
     def build_ql_bond_helper(self):
+        ql = quantlib()
         ql_bond = self.bond.build_ql_bond(self.date)
         quote = ql.QuoteHandle(ql.SimpleQuote(float(self.clean_price)))
         return ql.BondHelper(
@@ -145,14 +176,7 @@ class BondScatter(models.Model):
 
     def get_bond_data(self):
         """Get bond data for this scatter configuration."""
-        bond_metrics = BondMetric.objects.filter(
-            date=self.date,
-            bond__isin__startswith=self.country,
-            bond__is_green=False,
-            bond__is_indexed=False,
-        ).select_related("bond")
-
-        return bond_metrics
+        return BondMetric.curve_universe(self.country).filter(date=self.date)
 
 
 class YieldCurve(models.Model):
@@ -161,3 +185,34 @@ class YieldCurve(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+
+class IngestManifest(models.Model):
+    """One source sheet seen by an ingest pipeline, with its content hash and load status."""
+
+    class Status(models.TextChoices):
+        PENDING = "pending"
+        LOADED = "loaded"
+
+    source = models.CharField(max_length=32)  # e.g. "bundesbank"
+    file_key = models.CharField(max_length=255)  # e.g. "2025-06"
+    sheet_name = models.CharField(max_length=255)
+    content_hash = models.CharField(max_length=64)
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.PENDING)
+    row_count = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["source", "file_key", "sheet_name"],
+                name="unique_ingest_manifest_sheet",
+            ),
+        ]
+
+    def __str__(self):
+        return f"IngestManifest({self.source}, {self.file_key}, {self.sheet_name}, {self.status})"
+
+    def is_loaded(self, content_hash: str) -> bool:
+        return self.status == self.Status.LOADED and self.content_hash == content_hash
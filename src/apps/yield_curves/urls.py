@@ -25,5 +25,23 @@ urlpatterns = [
         views.get_zero_curve_data,
         name="get_zero_curve_data",
     ),
+    path(
+        "analysis/<int:analysis_id>/scatter/<int:scatter_id>/carry-roll-down/",
+        views.get_carry_roll_down_data,
+        name="get_carry_roll_down_data",
+    ),
+    path(
+        "analysis/<int:analysis_id>/scatter/<int:scatter_id>/difference/<int:other_id>/",
+        views.get_curve_difference_data,
+        name="get_curve_difference_data",
+    ),
     path("api/bond-date-range/", views.get_bond_date_range, name="get_bond_date_range"),
+    path("api/bond-history/", views.get_bond_history, name="get_bond_history"),
+    path("api/curve-history/", views.curve_history, name="curve_history"),
+    path("api/curve-factors/", views.curve_factors, name="curve_factors"),
+    path("api/rich-cheap/", views.rich_cheap, name="rich_cheap"),
+    path("api/spreads/", views.spread_history, name="spread_history"),
+    path("api/scenarios/", views.scenario_pnl, name="scenario_pnl"),
+    path("api/portfolio/", views.portfolio_valuation, name="portfolio_valuation"),
+    path("api/calibration-metrics/", views.calibration_metrics, name="calibration_metrics"),
 ]
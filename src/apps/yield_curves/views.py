@@ -1,18 +1,48 @@
+import asyncio
 import datetime as dt
+import functools
+import hmac
+import itertools
 import json
+import os
+import re
 
 import numpy as np
+from asgiref.sync import sync_to_async
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.db.models import Max, Min
-from django.http import JsonResponse
-from django.shortcuts import get_object_or_404, redirect, render
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.shortcuts import aget_object_or_404, get_object_or_404, redirect, render
 from django.urls import reverse
 from django.views.decorators.http import require_http_methods
 
-from src.apps.yield_curves.models import Analysis, BondMetric, BondScatter
+from src.apps.yield_curves.models import Analysis, Bond, BondMetric, BondScatter
 from src.constants import DAYS_IN_YEAR
-from src.curve_engine.curve_engine import YieldCurveCalibrator
+from src.curve_engine import svensson
+from src.curve_engine.carry import (
+    CARRY_TENORS,
+    HORIZON_MONTHS,
+    bond_carry_roll_down,
+    breakeven_bp,
+    horizon_years,
+    tenor_carry_roll_down,
+)
+from src.curve_engine.comparison import curve_difference
+from src.curve_engine.curve_store import aget_curve
+from src.curve_engine.downsampling import adaptive_indices, lttb_indices
+from src.curve_engine.executor import BondQuote
+from src.curve_engine.factors import get_curve_factors
+from src.curve_engine.history import TENORS, check_country, get_curve_history
+from src.curve_engine.limiter import Overloaded, get_limiter
+from src.curve_engine.portfolio import Holding, Portfolio
+from src.curve_engine.residuals import BondResiduals, svensson_residuals
+from src.curve_engine.scenarios import KEY_RATE_TENORS, Scenario, ScenarioEngine
+from src.curve_engine.screening import Quotes, get_screen
+from src.curve_engine.spreads import quote_spreads
+from src.utils.configuration import conf
+from src.utils.logger import logger
+from src.utils.profiling import timed
 
 
 @login_required
@@ -129,9 +159,45 @@ def delete_bond_scatter(request, analysis_id, scatter_id):
     return JsonResponse({"success": True})
 
 
+async def _fitted_residuals(bond_scatter, bond_metrics) -> BondResiduals | None:
+    """Residuals of each bond against the scatter's fitted curve, or None if it can't be fitted.
+
+    The scatter points are served regardless, so a busy calibration pool only drops the
+    residuals; other failures of the fit propagate.
+    """
+    if sum(metric.ttm > 0 for metric in bond_metrics) < 3:
+        return None
+    try:
+        curve = await aget_curve(
+            bond_scatter.country,
+            bond_scatter.date,
+            [BondQuote.from_bond_metric(metric) for metric in bond_metrics],
+        )
+    except Overloaded as e:
+        logger.warning(f"No residuals for scatter {bond_scatter.id}: {e}")
+        return None
+    if curve.errors or len(curve.parameters) != svensson.N_PARAMS:
+        return None
+    with timed("residuals"):
+        return svensson_residuals(bond_metrics, bond_scatter.date, curve.parameters)
+
+
+def _rounded(value: float, decimals: int) -> float | None:
+    return None if np.isnan(value) else round(value, decimals)
+
+
+def _rounded_values(values: np.ndarray, decimals: int) -> list[float | None]:
+    return [_rounded(value, decimals) for value in values.tolist()]
+
+
 @login_required
-def get_selected_scatters_data(request, analysis_id):
-    """Get bond data for selected scatters in an analysis."""
+async def get_selected_scatters_data(request, analysis_id):
+    """Get bond data for selected scatters in an analysis.
+
+    Each point also carries the bond's fitted clean price and yield on the scatter's
+    Svensson curve and its residual in bp (market minus fitted yield), when a curve
+    can be fitted.
+    """
     if request.method != "POST":
         return JsonResponse({"error": "POST request required"}, status=405)
 
@@ -142,20 +208,24 @@ def get_selected_scatters_data(request, analysis_id):
         if not scatter_ids:
             return JsonResponse([])
 
-        analysis = get_object_or_404(Analysis, id=analysis_id, user=request.user)
+        user = await request.auser()
+        analysis = await aget_object_or_404(Analysis, id=analysis_id, user=user)
         bond_scatters = analysis.bond_scatters.filter(id__in=scatter_ids)
 
         selected_data = []
-        for bond_scatter in bond_scatters:
-            bond_metrics = bond_scatter.get_bond_data()
+        async for bond_scatter in bond_scatters:
+            with timed("query"):
+                bond_metrics = [metric async for metric in bond_scatter.get_bond_data()]
 
-            scatter_data = []
-            for metric in bond_metrics:
-                if metric.ttm < 0:
-                    continue  # Exclude bonds with negative time to maturity
+            residuals = await _fitted_residuals(bond_scatter, bond_metrics)
 
-                scatter_data.append(
-                    {
+            with timed("serialize"):
+                scatter_data = []
+                for i, metric in enumerate(bond_metrics):
+                    if metric.ttm < 0:
+                        continue  # Exclude bonds with negative time to maturity
+
+                    point = {
                         "isin": metric.bond.isin,
                         "ttm_years": round(metric.ttm, 2),
                         "ttm_days": metric.ttm * DAYS_IN_YEAR,
@@ -164,7 +234,11 @@ def get_selected_scatters_data(request, analysis_id):
                         "coupon": float(metric.bond.coupon),
                         "description": metric.bond.description,
                     }
-                )
+                    if residuals is not None:
+                        point["fitted_clean_price"] = _rounded(residuals.fitted_clean_prices[i], 4)
+                        point["fitted_yield"] = _rounded(residuals.fitted_yields[i] * 100.0, 4)
+                        point["residual_bp"] = _rounded(residuals.residuals_bp[i], 2)
+                    scatter_data.append(point)
 
             selected_data.append(
                 {
@@ -179,7 +253,8 @@ def get_selected_scatters_data(request, analysis_id):
                 }
             )
 
-        return JsonResponse(selected_data, safe=False)
+        with timed("serialize"):
+            return JsonResponse(selected_data, safe=False)
 
     except json.JSONDecodeError:
         return JsonResponse({"error": "Invalid JSON"}, status=400)
@@ -187,69 +262,261 @@ def get_selected_scatters_data(request, analysis_id):
         return JsonResponse({"error": str(e)}, status=500)
 
 
+ZERO_CURVE_GRIDS = ("uniform", "adaptive", "lttb")
+ADAPTIVE_STEP = 0.01  # Years between candidate maturities for adaptive grids.
+
+
 @login_required
-def get_zero_curve_data(request, analysis_id, scatter_id):
-    """Generate zero curve data for a specific scatter."""
-    analysis = get_object_or_404(Analysis, id=analysis_id, user=request.user)
-    bond_scatter = get_object_or_404(BondScatter, id=scatter_id, analysis=analysis)
+async def get_zero_curve_data(request, analysis_id, scatter_id):
+    """Generate zero curve data for a specific scatter.
+
+    The curve is fitted in the calibration process pool, so that slow fits don't block
+    other requests served by this process, unless a worker on this host has already
+    fitted it to the same quotes and put it in the curve store.
+
+    By default the curve is returned on a 0.1 year grid. With `grid=adaptive` it is
+    returned at about `points` maturities, placed densest where the curve bends most;
+    with `grid=lttb` the 0.1 year grid is downsampled to `points` maturities.
+    """
+    grid = request.GET.get("grid", "uniform")
+    try:
+        points = int(request.GET.get("points", conf.get("zero_curve.points", 100)))
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    if grid not in ZERO_CURVE_GRIDS:
+        return JsonResponse(
+            {"error": f"grid must be one of {', '.join(ZERO_CURVE_GRIDS)}"}, status=400
+        )
+    if points < 3:
+        return JsonResponse({"error": "points must be at least 3"}, status=400)
+
+    user = await request.auser()
+    analysis = await aget_object_or_404(Analysis, id=analysis_id, user=user)
+    bond_scatter = await aget_object_or_404(BondScatter, id=scatter_id, analysis=analysis)
 
     try:
         # Get bond metrics for this scatter
-        bond_metrics = list(bond_scatter.get_bond_data())
+        with timed("query"):
+            bond_metrics = [metric async for metric in bond_scatter.get_bond_data()]
 
         if len(bond_metrics) < 3:
             return JsonResponse({"error": "Need at least 3 bonds to calibrate curve"}, status=400)
 
-        calibrator = YieldCurveCalibrator(bond_metrics, bond_scatter.date)
-        calibrator.calibrate()
-
         # Find max TTM
         max_ttm = max(metric.ttm for metric in bond_metrics)
 
-        all_ttms = np.arange(0.1, max_ttm + 0.1, 0.1)
-        zero_curve_data = []
-        errors = []
-        for ttm in all_ttms:
-            try:
-                zero_rate = calibrator.zero_rate(ttm) * 100.0  # Convert to percentage
-            except RuntimeError as e:
-                errors.append(f"Failed to calculate zero rate for TTM {ttm}: {e}")
-            else:
-                zero_curve_data.append(
-                    {"ttm_years": round(ttm, 1), "zero_rate": round(zero_rate, 4)}
-                )
+        n_ttms = len(np.arange(0.1, max_ttm + 0.1, 0.1))
+        curve = await aget_curve(
+            bond_scatter.country,
+            bond_scatter.date,
+            [BondQuote.from_bond_metric(metric) for metric in bond_metrics],
+        )
+        ttms, zero_rates = curve.ttms[:n_ttms], curve.zero_rates[:n_ttms]
+        with timed("downsample"):
+            if grid == "adaptive" and len(ttms):
+                # Svensson curves can be evaluated anywhere; sample finely, then pick points.
+                ttms = np.arange(1, round(ttms[-1] / ADAPTIVE_STEP) + 1) * ADAPTIVE_STEP
+                zero_rates = svensson.zero_rates(curve.parameters, ttms)
+                rows = adaptive_indices(ttms, zero_rates, points)
+                ttms, zero_rates = ttms[rows], zero_rates[rows]
+            elif grid == "lttb":
+                rows = lttb_indices(ttms, zero_rates, points)
+                ttms, zero_rates = ttms[rows], zero_rates[rows]
+        decimals = 1 if grid == "uniform" else 2
+        zero_curve_data = [
+            {"ttm_years": round(ttm, decimals), "zero_rate": round(zero_rate * 100.0, 4)}
+            for ttm, zero_rate in zip(ttms.tolist(), zero_rates.tolist(), strict=True)
+        ]
 
         if not zero_curve_data:
-            return JsonResponse({"error": f"Failed to generate zero curve:\n{errors}"}, status=500)
+            return JsonResponse(
+                {"error": f"Failed to generate zero curve:\n{curve.errors}"}, status=500
+            )
+
+        with timed("serialize"):
+            return JsonResponse(
+                {
+                    "success": True,
+                    "scatter": {
+                        "id": bond_scatter.id,
+                        "country": bond_scatter.country,
+                        "date": bond_scatter.date.isoformat(),
+                        "display_name": f"{bond_scatter.country} {bond_scatter.date.strftime('%b %d, %Y')} - Zero Curve",
+                    },
+                    "data": zero_curve_data,
+                    "count": len(zero_curve_data),
+                }
+            )
+
+    except Overloaded as e:
+        return JsonResponse(
+            {"error": str(e)}, status=e.status, headers={"Retry-After": str(e.retry_after_s)}
+        )
+    except Exception as e:
+        import traceback
+
+        error_msg = traceback.format_exc()
+        return JsonResponse(
+            {"error": f"Failed to generate zero curve: {str(e)}", "details": error_msg}, status=500
+        )
+
+
+@login_required
+@require_http_methods(["GET"])
+async def get_carry_roll_down_data(request, analysis_id, scatter_id):
+    """Carry and roll-down over several horizons of a scatter's bonds and of the curve's tenors.
+
+    `horizons` lists horizons in months, e.g. `3,6,12`. Returns, per bond and per
+    tenor, a row of carry, roll-down and total in bp with one column per horizon,
+    all computed in one pass from the scatter's fitted curve, and for each tenor
+    the rise in its rolled-down zero rate that would cancel them.
+    """
+    try:
+        months = [
+            int(value)
+            for value in request.GET.get("horizons", ",".join(map(str, HORIZON_MONTHS))).split(",")
+        ]
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    if not months or not all(1 <= month <= 120 for month in months):
+        return JsonResponse({"error": "horizons must be between 1 and 120 months"}, status=400)
+
+    user = await request.auser()
+    analysis = await aget_object_or_404(Analysis, id=analysis_id, user=user)
+    bond_scatter = await aget_object_or_404(BondScatter, id=scatter_id, analysis=analysis)
 
+    with timed("query"):
+        quoted = [metric async for metric in bond_scatter.get_bond_data()]
+    bond_metrics = [metric for metric in quoted if metric.ttm > 0]
+    if len(bond_metrics) < 3:
+        return JsonResponse({"error": "Need at least 3 bonds to calibrate curve"}, status=400)
+
+    try:
+        curve = await aget_curve(
+            bond_scatter.country,
+            bond_scatter.date,
+            [BondQuote.from_bond_metric(metric) for metric in quoted],
+        )
+    except Overloaded as e:
+        return JsonResponse(
+            {"error": str(e)}, status=e.status, headers={"Retry-After": str(e.retry_after_s)}
+        )
+    if curve.errors or len(curve.parameters) != svensson.N_PARAMS:
+        return JsonResponse({"error": f"Failed to fit curve: {curve.errors}"}, status=500)
+
+    with timed("carry"):
+        discount = functools.partial(svensson.discount_factors, np.asarray(curve.parameters))
+        horizons = horizon_years(months)
+        bonds = bond_carry_roll_down(bond_metrics, bond_scatter.date, discount, horizons)
+        tenors = tenor_carry_roll_down(discount, horizons)
+        breakevens = breakeven_bp(discount, horizons)
+
+    with timed("serialize"):
         return JsonResponse(
             {
-                "success": True,
                 "scatter": {
                     "id": bond_scatter.id,
                     "country": bond_scatter.country,
                     "date": bond_scatter.date.isoformat(),
-                    "display_name": f"{bond_scatter.country} {bond_scatter.date.strftime('%b %d, %Y')} - Zero Curve",
                 },
-                "data": zero_curve_data,
-                "count": len(zero_curve_data),
+                "horizon_months": months,
+                "bonds": {
+                    "isins": [metric.bond_id for metric in bond_metrics],
+                    "ttm_years": [round(metric.ttm, 2) for metric in bond_metrics],
+                    "carry_bp": np.round(bonds.carry_bp, 2).tolist(),
+                    "roll_down_bp": np.round(bonds.roll_down_bp, 2).tolist(),
+                    "total_bp": np.round(bonds.total_bp, 2).tolist(),
+                },
+                "tenors": {
+                    "tenor_years": list(CARRY_TENORS),
+                    "carry_bp": np.round(tenors.carry_bp, 2).tolist(),
+                    "roll_down_bp": np.round(tenors.roll_down_bp, 2).tolist(),
+                    "total_bp": np.round(tenors.total_bp, 2).tolist(),
+                    "breakeven_bp": [_rounded_values(row, 2) for row in breakevens],
+                },
             }
         )
 
-    except Exception as e:
-        import traceback
 
-        error_msg = traceback.format_exc()
+async def _scatter_curve(bond_scatter):
+    """The largest time to maturity among a scatter's bonds, and the curve fitted to them."""
+    with timed("query"):
+        bond_metrics = [metric async for metric in bond_scatter.get_bond_data()]
+    if len([metric for metric in bond_metrics if metric.ttm > 0]) < 3:
+        return None, None
+    curve = await aget_curve(
+        bond_scatter.country,
+        bond_scatter.date,
+        [BondQuote.from_bond_metric(metric) for metric in bond_metrics],
+    )
+    return max(metric.ttm for metric in bond_metrics), curve
+
+
+@login_required
+@require_http_methods(["GET"])
+async def get_curve_difference_data(request, analysis_id, scatter_id, other_id):
+    """The other scatter's curve minus this scatter's, on a common 0.1 year grid.
+
+    Returns zero and instantaneous forward rate spreads in bp and discount factor
+    differences, up to the shorter of the two scatters' longest maturities.
+    Scatters of the same country and date share one fit, and any curve already
+    in the curve store is reused.
+    """
+    user = await request.auser()
+    analysis = await aget_object_or_404(Analysis, id=analysis_id, user=user)
+    base = await aget_object_or_404(BondScatter, id=scatter_id, analysis=analysis)
+    other = await aget_object_or_404(BondScatter, id=other_id, analysis=analysis)
+
+    keys = [(base.country, base.date), (other.country, other.date)]
+    scatters = dict(zip(keys, (base, other), strict=True))
+    try:
+        fitted = await asyncio.gather(*(_scatter_curve(scatter) for scatter in scatters.values()))
+    except Overloaded as e:
         return JsonResponse(
-            {"error": f"Failed to generate zero curve: {str(e)}", "details": error_msg}, status=500
+            {"error": str(e)}, status=e.status, headers={"Retry-After": str(e.retry_after_s)}
+        )
+    curves = dict(zip(scatters, fitted, strict=True))
+    for key, (_, curve) in curves.items():
+        if curve is None:
+            return JsonResponse(
+                {"error": f"Need at least 3 bonds to calibrate the {key[0]} {key[1]} curve"},
+                status=400,
+            )
+        if curve.errors or len(curve.parameters) != svensson.N_PARAMS:
+            return JsonResponse({"error": f"Failed to fit curve: {curve.errors}"}, status=500)
+
+    (base_ttm, base_curve), (other_ttm, other_curve) = curves[keys[0]], curves[keys[1]]
+    with timed("grid"):
+        ttms = np.arange(1, round(min(base_ttm, other_ttm) * 10) + 1) / 10.0
+        difference = curve_difference(base_curve.parameters, other_curve.parameters, ttms)
+
+    with timed("serialize"):
+        return JsonResponse(
+            {
+                "base": {
+                    "id": base.id,
+                    "country": base.country,
+                    "date": base.date.isoformat(),
+                },
+                "other": {
+                    "id": other.id,
+                    "country": other.country,
+                    "date": other.date.isoformat(),
+                },
+                "ttm_years": np.round(difference.ttms, 1).tolist(),
+                "zero_spread_bp": np.round(difference.zero_spreads_bp, 2).tolist(),
+                "forward_spread_bp": np.round(difference.forward_spreads_bp, 2).tolist(),
+                "discount_spread": np.round(difference.discount_spreads, 6).tolist(),
+                "count": len(difference.ttms),
+            }
         )
 
 
 @login_required
-def get_bond_date_range(request):
+async def get_bond_date_range(request):
     """Get the available date range for bond data."""
     try:
-        date_range = BondMetric.objects.aggregate(min_date=Min("date"), max_date=Max("date"))
+        date_range = await BondMetric.objects.aaggregate(min_date=Min("date"), max_date=Max("date"))
 
         min_date = date_range["min_date"]
         max_date = date_range["max_date"]
@@ -267,3 +534,505 @@ def get_bond_date_range(request):
 
     except Exception as e:
         return JsonResponse({"error": str(e)}, status=500)
+
+
+@login_required
+@require_http_methods(["GET"])
+async def get_bond_history(request):
+    """Clean price, yield and residual life of one or more bonds over a date range.
+
+    Returns one set of columns per ISIN, read in a single query over the
+    (bond, date) index.
+    """
+    isins = list(dict.fromkeys(isin for isin in request.GET.get("isins", "").split(",") if isin))
+    if not isins:
+        return JsonResponse({"error": "No ISINs given"}, status=400)
+    max_isins = int(conf.get("bond_history.max_isins", 50))
+    if len(isins) > max_isins:
+        return JsonResponse({"error": f"At most {max_isins} ISINs per request"}, status=400)
+    try:
+        start = request.GET.get("start")
+        end = request.GET.get("end")
+        date_range = {
+            **({"date__gte": dt.date.fromisoformat(start)} if start else {}),
+            **({"date__lte": dt.date.fromisoformat(end)} if end else {}),
+        }
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+    with timed("query"):
+        maturities = {
+            isin: maturity_date
+            async for isin, maturity_date in Bond.objects.filter(isin__in=isins).values_list(
+                "isin", "maturity_date"
+            )
+        }
+        rows = [
+            row
+            async for row in BondMetric.objects.filter(bond_id__in=maturities, **date_range)
+            .order_by("bond_id", "date")
+            .values_list("bond_id", "date", "clean_price", "_yield")
+        ]
+
+    with timed("serialize"):
+        bonds = {}
+        for isin, metrics in itertools.groupby(rows, key=lambda row: row[0]):
+            _, dates, clean_prices, yields = zip(*metrics, strict=True)
+            maturity_date = maturities[isin]
+            bonds[isin] = {
+                "dates": [date.isoformat() for date in dates],
+                "clean_price": [float(price) for price in clean_prices],
+                "yield": [float(_yield) for _yield in yields],
+                "ttm_years": [
+                    round((maturity_date - date).days / DAYS_IN_YEAR, 4) for date in dates
+                ],
+            }
+        return JsonResponse(
+            {
+                "bonds": bonds,
+                "missing": [isin for isin in isins if isin not in maturities],
+                "count": len(rows),
+            }
+        )
+
+
+SPREAD_PATTERN = re.compile(r"^(\d+(?:\.\d+)?)s(\d+(?:\.\d+)?)s$")  # e.g. "2s10s"
+
+
+@login_required
+@require_http_methods(["GET"])
+def curve_history(request):
+    """Time series of zero rates at chosen tenors, and spreads, for a country and date range.
+
+    Rates are evaluated from the stored Svensson parameters for all dates and
+    tenors at once, then downsampled to at most `max_points` dates.
+    """
+    try:
+        country = check_country(request.GET.get("country", "DE").upper())
+        start = request.GET.get("start")
+        start = dt.date.fromisoformat(start) if start else None
+        end = request.GET.get("end")
+        end = dt.date.fromisoformat(end) if end else None
+        tenors = [float(tenor) for tenor in request.GET.get("tenors", "2,5,10,30").split(",")]
+        spreads = [
+            spread for spread in request.GET.get("spreads", "2s10s,5s30s").split(",") if spread
+        ]
+        spread_tenors = []
+        for spread in spreads:
+            match = SPREAD_PATTERN.match(spread)
+            if not match:
+                raise ValueError(f"Invalid spread {spread!r}, expected e.g. 2s10s")
+            spread_tenors.append((float(match[1]), float(match[2])))
+        max_points = int(request.GET.get("max_points", conf.get("history.max_points", 1000)))
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    if not tenors or not all(0 < tenor < np.inf for tenor in tenors):
+        return JsonResponse({"error": "Tenors must be positive and finite"}, status=400)
+    if max_points < 3:
+        return JsonResponse({"error": "max_points must be at least 3"}, status=400)
+
+    history = get_curve_history()
+    if history is None:
+        return JsonResponse({"error": "Curve history is not available"}, status=404)
+
+    # Evaluate the spread legs along with the requested tenors.
+    all_tenors = list(dict.fromkeys(tenors + [t for pair in spread_tenors for t in pair]))
+    column = {tenor: i for i, tenor in enumerate(all_tenors)}
+    with timed("grid"):
+        rates = history.zero_rates(country, all_tenors, start, end)
+    total = len(rates.dates)
+    if not total:
+        return JsonResponse({"error": f"No {country} curve history in range"}, status=404)
+
+    values = np.column_stack(
+        [rates.values[:, column[tenor]] * 100.0 for tenor in tenors]
+        + [
+            (rates.values[:, column[long]] - rates.values[:, column[short]]) * 1e4
+            for short, long in spread_tenors
+        ]
+    )
+    with timed("downsample"):
+        rows = lttb_indices(rates.dates.astype("int64"), values, max_points)
+    dates, values = rates.dates[rows], values[rows]
+
+    with timed("serialize"):
+        series = {
+            f"{tenor:g}y": np.round(values[:, i], 4).tolist() for i, tenor in enumerate(tenors)
+        }
+        for i, spread in enumerate(spreads, start=len(tenors)):
+            series[spread] = np.round(values[:, i], 2).tolist()
+        return JsonResponse(
+            {
+                "country": country,
+                "dates": np.datetime_as_string(dates).tolist(),
+                "series": series,  # Zero rates in percent, spreads in basis points.
+                "count": len(dates),
+                "total": total,
+                "downsampled": len(dates) < total,
+            }
+        )
+
+
+@login_required
+@require_http_methods(["GET"])
+def curve_factors(request):
+    """Level, slope and curvature of a country's daily zero-rate changes, with their scores.
+
+    Loadings are the leading principal components of the changes at the history's
+    standard tenors over all stored dates, kept up to date incrementally. Scores
+    are the changes from `start` to `end` projected onto them.
+    """
+    try:
+        country = check_country(request.GET.get("country", "DE").upper())
+        start = request.GET.get("start")
+        start = dt.date.fromisoformat(start) if start else None
+        end = request.GET.get("end")
+        end = dt.date.fromisoformat(end) if end else None
+        n_factors = int(request.GET.get("n_factors", 3))
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    if not 1 <= n_factors <= len(TENORS):
+        return JsonResponse({"error": f"n_factors must be between 1 and {len(TENORS)}"}, status=400)
+
+    with timed("update"):
+        pca = get_curve_factors(country)
+    if pca is None:
+        return JsonResponse({"error": "Curve history is not available"}, status=404)
+    factors = pca.factors(n_factors)
+    if factors is None:
+        return JsonResponse({"error": f"Not enough {country} curve history"}, status=404)
+    with timed("scores"):
+        scores = pca.scores(factors, start, end)
+
+    with timed("serialize"):
+        return JsonResponse(
+            {
+                "country": country,
+                "tenors": list(factors.tenors),
+                "factors": factors.names,
+                "loadings": np.round(factors.loadings, 6).tolist(),  # One row per factor.
+                "std_bp": np.round(np.sqrt(factors.variances), 4).tolist(),
+                "explained": np.round(factors.explained, 6).tolist(),
+                "n_obs": factors.n_obs,
+                "dates": np.datetime_as_string(scores.dates).tolist(),
+                "scores": np.round(scores.values, 4).tolist(),  # One row per date, in bp.
+                "count": len(scores.dates),
+            }
+        )
+
+
+@login_required
+@require_http_methods(["GET"])
+def rich_cheap(request):
+    """Each bond's residual to the curve on a date, as a z-score against its own history.
+
+    Residuals are market minus fitted yield, so positive z-scores are bonds trading
+    cheaper to the curve than usual over the trailing `window` dates. Bonds are
+    sorted from cheapest to richest, with those lacking `min_obs` residuals last.
+    """
+    try:
+        country = check_country(request.GET.get("country", "DE").upper())
+        date = request.GET.get("date")
+        date = dt.date.fromisoformat(date) if date else None
+        window = int(request.GET.get("window", conf.get("screening.window", 250)))
+        min_obs = int(request.GET.get("min_obs", conf.get("screening.min_obs", 20)))
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    if window < 2:
+        return JsonResponse({"error": "window must be at least 2"}, status=400)
+
+    with timed("screen"):
+        screen = get_screen(country)
+    if screen is None:
+        return JsonResponse({"error": "Curve history is not available"}, status=404)
+    zscores = screen.zscores(date, window, min_obs)
+    if zscores is None:
+        return JsonResponse({"error": f"No {country} curve history in range"}, status=404)
+
+    with timed("serialize"):
+        order = np.argsort(-np.nan_to_num(zscores.zscores, nan=-np.inf), kind="stable")
+        bonds = [
+            {
+                "isin": str(zscores.isins[i]),
+                "residual_bp": _rounded(zscores.residuals_bp[i], 2),
+                "mean_bp": _rounded(zscores.means_bp[i], 2),
+                "std_bp": _rounded(zscores.stds_bp[i], 2),
+                "zscore": _rounded(zscores.zscores[i], 2),
+                "n_obs": int(zscores.n_obs[i]),
+            }
+            for i in order.tolist()
+        ]
+        return JsonResponse(
+            {
+                "country": country,
+                "date": str(zscores.date),
+                "window": window,
+                "bonds": bonds,
+                "count": len(bonds),
+            }
+        )
+
+
+@login_required
+@require_http_methods(["POST"])
+async def scenario_pnl(request):
+    """Reprice a country's bonds on a date under zero curve scenarios, off its fitted curve.
+
+    The body names the `country`, `date` and `scenarios`, e.g.
+    `{"type": "parallel", "bp": 25}`, `{"type": "twist", "short_bp": -10, "long_bp": 10}`,
+    `{"type": "butterfly", "wings_bp": 10, "belly_bp": -10}` or
+    `{"type": "key_rate", "tenor": 10, "bp": 1}`. Returns the P&L per 100 nominal of
+    each bond under each scenario, and each bond's key-rate DV01s.
+    """
+    try:
+        data = json.loads(request.body)
+        country = check_country(str(data.get("country", "DE")).upper())
+        date = dt.date.fromisoformat(data["date"])
+        scenarios = [Scenario.from_spec(spec) for spec in data.get("scenarios", [])]
+    except json.JSONDecodeError:
+        return JsonResponse({"error": "Invalid JSON"}, status=400)
+    except KeyError:
+        return JsonResponse({"error": "date is required"}, status=400)
+    except (AttributeError, TypeError, ValueError) as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    max_scenarios = int(conf.get("scenarios.max_scenarios", 500))
+    if len(scenarios) > max_scenarios:
+        return JsonResponse({"error": f"At most {max_scenarios} scenarios"}, status=400)
+
+    with timed("query"):
+        # The same quotes as a scatter of this country and date, so they share a stored curve.
+        quoted = [
+            metric
+            async for metric in BondMetric.curve_universe(country)
+            .filter(date=date)
+            .order_by("bond__maturity_date", "bond_id")
+        ]
+    bond_metrics = [metric for metric in quoted if metric.ttm > 0]
+    if len(bond_metrics) < 3:
+        return JsonResponse({"error": f"Need at least 3 {country} bonds on {date}"}, status=404)
+
+    try:
+        curve = await aget_curve(
+            country, date, [BondQuote.from_bond_metric(metric) for metric in quoted]
+        )
+    except Overloaded as e:
+        return JsonResponse(
+            {"error": str(e)}, status=e.status, headers={"Retry-After": str(e.retry_after_s)}
+        )
+    if curve.errors or len(curve.parameters) != svensson.N_PARAMS:
+        return JsonResponse({"error": f"Failed to fit curve: {curve.errors}"}, status=500)
+
+    with timed("scenarios"):
+        engine = ScenarioEngine.from_svensson(
+            [float(metric.bond.coupon) for metric in bond_metrics],
+            [metric.bond.maturity_date for metric in bond_metrics],
+            date,
+            curve.parameters,
+        )
+        pnl = engine.pnl(scenarios) if scenarios else np.empty((len(bond_metrics), 0))
+        key_rate_dv01s = engine.key_rate_dv01s()
+
+    with timed("serialize"):
+        return JsonResponse(
+            {
+                "country": country,
+                "date": date.isoformat(),
+                "isins": [metric.bond_id for metric in bond_metrics],
+                "fitted_clean_prices": np.round(
+                    engine.base_prices - engine.cash_flows.accrued, 4
+                ).tolist(),
+                "scenarios": [scenario.name for scenario in scenarios],
+                "pnl": np.round(pnl, 4).tolist(),  # One row per bond, one column per scenario.
+                "key_rate_tenors": list(KEY_RATE_TENORS),
+                "key_rate_dv01": np.round(key_rate_dv01s, 6).tolist(),
+            }
+        )
+
+
+SPREAD_CHUNK_DATES = 250  # Dates whose quotes spread_history prices in one batch.
+
+
+@login_required
+@require_http_methods(["GET"])
+def spread_history(request):
+    """Z-spreads and asset-swap spreads of bonds to the stored curve of each date in a range.
+
+    With `start` equal to `end` these are the spreads of a whole scatter; over a range,
+    of every bond on every date, solved in batches of `SPREAD_CHUNK_DATES` dates. `isins`,
+    comma separated, limits the bonds. Spreads are in basis points, positive for bonds
+    cheap to the curve. Ranges are capped at `spreads.max_days` days and
+    `spreads.max_quotes` quotes.
+    """
+    try:
+        country = check_country(request.GET.get("country", "DE").upper())
+        start = dt.date.fromisoformat(request.GET["start"])
+        end = dt.date.fromisoformat(request.GET["end"])
+    except KeyError:
+        return JsonResponse({"error": "start and end are required"}, status=400)
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    max_days = int(conf.get("spreads.max_days", 366))
+    if not 0 <= (end - start).days <= max_days:
+        return JsonResponse(
+            {"error": f"end must be on or up to {max_days} days after start"}, status=400
+        )
+    isins = request.GET.get("isins")
+    isins = [isin.strip().upper() for isin in isins.split(",") if isin.strip()] if isins else None
+
+    history = get_curve_history()
+    if history is None:
+        return JsonResponse({"error": "Curve history is not available"}, status=404)
+    with timed("query"):
+        curves = history.parameters(country, start, end)
+        if not len(curves.dates):
+            return JsonResponse({"error": f"No {country} curve history in range"}, status=404)
+        n_quotes = Quotes.count(country, start, end, isins)
+    max_quotes = int(conf.get("spreads.max_quotes", 100_000))
+    if n_quotes > max_quotes:
+        return JsonResponse(
+            {"error": f"{n_quotes} quotes in range, at most {max_quotes}"}, status=400
+        )
+
+    dates, quote_isins, zspreads, asset_swap_spreads = [], [], [], []
+    for lo in range(0, len(curves.dates), SPREAD_CHUNK_DATES):
+        chunk = np.asarray(curves.dates[lo : lo + SPREAD_CHUNK_DATES])
+        with timed("query"):
+            quotes = Quotes.load(country, chunk[0].item(), chunk[-1].item(), isins)
+        with timed("spreads"):
+            spreads = quote_spreads(
+                chunk, np.asarray(curves.values[lo : lo + SPREAD_CHUNK_DATES]), quotes
+            )
+        with timed("serialize"):
+            dates += np.datetime_as_string(quotes.dates).tolist()
+            quote_isins += quotes.isins.tolist()
+            zspreads += _rounded_values(spreads.zspreads_bp, 2)
+            asset_swap_spreads += _rounded_values(spreads.asset_swap_spreads_bp, 2)
+
+    with timed("serialize"):
+        return JsonResponse(
+            {
+                "country": country,
+                "dates": dates,
+                "isins": quote_isins,
+                "z_spread_bp": zspreads,
+                "asset_swap_spread_bp": asset_swap_spreads,
+                "count": len(dates),
+            }
+        )
+
+
+@login_required
+@require_http_methods(["POST"])
+async def portfolio_valuation(request):
+    """Value and risk of a portfolio on every curve history date in a range, streamed as NDJSON.
+
+    The body holds `holdings`, a list of `{"isin": ..., "notional": ...}`, and optionally
+    `country`, `start` and `end`. The first line lists the priced ISINs and notionals and
+    the ISINs that could not be priced. Each further line is one date, with portfolio totals
+    and per-holding values in the order of the first line's ISINs. Values are dirty, in the
+    currency of the notionals: model values off the stored curve, and market values from
+    quoted prices, null for holdings without a quote on the date.
+
+    At most `portfolio.max_dates` dates and `portfolio.max_total_rows` `(date, holding)`
+    pairs are valued per request. Lines are streamed as each chunk of dates is priced when
+    served over ASGI; a WSGI server gets the whole response at once.
+    """
+    try:
+        data = json.loads(request.body)
+        country = check_country(str(data.get("country", "DE")).upper())
+        start = data.get("start")
+        start = dt.date.fromisoformat(start) if start else None
+        end = data.get("end")
+        end = dt.date.fromisoformat(end) if end else None
+        holdings = [
+            Holding(str(holding["isin"]).upper(), float(holding["notional"]))
+            for holding in data["holdings"]
+        ]
+    except json.JSONDecodeError:
+        return JsonResponse({"error": "Invalid JSON"}, status=400)
+    except KeyError as e:
+        return JsonResponse({"error": f"Missing {e.args[0]}"}, status=400)
+    except (AttributeError, TypeError, ValueError) as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    max_holdings = int(conf.get("portfolio.max_holdings", 5000))
+    if not 0 < len(holdings) <= max_holdings:
+        return JsonResponse({"error": f"Between 1 and {max_holdings} holdings"}, status=400)
+
+    history = get_curve_history()
+    if history is None:
+        return JsonResponse({"error": "Curve history is not available"}, status=404)
+    n_dates = len(history.parameters(country, start, end).dates)
+    max_dates = int(conf.get("portfolio.max_dates", 2600))
+    if n_dates > max_dates:
+        return JsonResponse(
+            {"error": f"{n_dates} curve dates in range, at most {max_dates}"}, status=400
+        )
+    max_total_rows = int(conf.get("portfolio.max_total_rows", 1_000_000))
+    if n_dates * len(holdings) > max_total_rows:
+        return JsonResponse(
+            {"error": f"At most {max_total_rows} (date, holding) pairs per request"}, status=400
+        )
+    with timed("query"):
+        portfolio, missing = await sync_to_async(Portfolio.load)(country, holdings)
+
+    async def lines():
+        yield (
+            json.dumps(
+                {
+                    "country": country,
+                    "isins": portfolio.isins,
+                    "notionals": portfolio.notionals.tolist(),
+                    "missing": missing,
+                }
+            )
+            + "\n"
+        )
+        valuations = portfolio.valuations(
+            history, start, end, max_rows=int(conf.get("portfolio.max_rows", 20000))
+        )
+        # Each chunk queries its quotes, so it is priced off the event loop.
+        while (valuation := await sync_to_async(next)(valuations, None)) is not None:
+            for i, date in enumerate(valuation.dates):
+                model_values = valuation.model_values[i]
+                market_values = valuation.market_values[i]
+                yield (
+                    json.dumps(
+                        {
+                            "date": str(date),
+                            "model_value": round(float(np.nansum(model_values)), 2),
+                            "market_value": round(float(np.nansum(market_values)), 2),
+                            "unquoted": int(
+                                np.sum(~np.isnan(model_values) & np.isnan(market_values))
+                            ),
+                            "dv01": round(float(np.nansum(valuation.dv01s[i])), 2),
+                            "holdings": {
+                                "model_value": _rounded_values(model_values, 2),
+                                "market_value": _rounded_values(market_values, 2),
+                                "dv01": _rounded_values(valuation.dv01s[i], 2),
+                            },
+                        }
+                    )
+                    + "\n"
+                )
+
+    return StreamingHttpResponse(lines(), content_type="application/x-ndjson")
+
+
+def calibration_metrics(request):
+    """Calibration admission metrics for this process, for Prometheus to scrape.
+
+    Open to staff users, and to scrapers sending `calibration.metrics_token` as a
+    bearer token when one is set.
+    """
+    token = conf.get("calibration.metrics_token")
+    if not request.user.is_staff and not (
+        token
+        and hmac.compare_digest(
+            request.headers.get("Authorization", "").encode(), f"Bearer {token}".encode()
+        )
+    ):
+        return JsonResponse({"error": "Forbidden"}, status=403)
+    return HttpResponse(
+        get_limiter().metrics({"pid": str(os.getpid())}),
+        content_type="text/plain; version=0.0.4",
+    )
@@ -0,0 +1,47 @@
+"""Gunicorn settings.
+
+Run with `gunicorn -c src/config/gunicorn_conf.py src.config.asgi`. With
+`gunicorn.preload` (the default) the app is imported once in the master and
+shared copy-on-write by the workers; with `gunicorn.warm_up` the master also
+imports QuantLib and builds its calendars and day counters before forking,
+so the first calibration in each worker doesn't pay for them. Each worker then
+starts its calibration process pool before serving requests.
+
+Workers are uvicorn's, so the async views run natively and each worker
+serves many requests at once; set `gunicorn.worker_class` to `sync` and
+serve `src.config.wsgi` to go back to one request per worker.
+"""
+
+from src.utils.configuration import conf
+
+
+def _flag(key: str, default: bool) -> bool:
+    # Environment overrides arrive as strings.
+    value = conf.get(key, default)
+    return value if isinstance(value, bool) else str(value).lower() in ("1", "true", "yes")
+
+
+preload_app = _flag("gunicorn.preload", True)
+workers = int(conf.get("gunicorn.workers", 1))
+timeout = int(conf.get("gunicorn.timeout", 30))
+worker_class = conf.get("gunicorn.worker_class", "uvicorn_worker.UvicornWorker")
+
+
+def when_ready(server):
+    if not _flag("gunicorn.warm_up", True):
+        return
+
+    from src.utils.ql import warm_up
+
+    warm_up()
+    server.log.info("Warmed up QuantLib calendars and day counters")
+
+
+def post_worker_init(worker):
+    if not _flag("gunicorn.warm_up", True):
+        return
+
+    from src.curve_engine.executor import warm_up_executor
+
+    warm_up_executor()
+    worker.log.info("Started calibration worker processes")
@@ -0,0 +1,161 @@
+"""Project middleware."""
+
+import cProfile
+import datetime as dt
+import random
+import re
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.db import connections
+from django.db.backends.signals import connection_created
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from src.utils.configuration import conf
+from src.utils.logger import logger
+from src.utils.profiling import RequestProfile, profiling, record_query
+
+
+def install_query_recorder(connection, **kwargs) -> None:
+    # Insert first, so that a temporary `execute_wrapper` entered before the connection
+    # opened still pops its own wrapper on exit.
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, record_query)
+
+
+connection_created.connect(install_query_recorder, dispatch_uid="install_query_recorder")
+
+
+@dataclass
+class _ProfiledRequest:
+    profile: RequestProfile
+    profiler: cProfile.Profile | None
+    total_s: float = 0.0
+
+
+class ProfilingMiddleware:
+    """Report per-request phase timings and SQL usage in a `Server-Timing` header.
+
+    Off unless `profiling.enabled` is set, since the header exposes the app's
+    internals to clients. Phases come from `timed` blocks in the views and the curve engine. When
+    `profiling.cprofile_threshold_ms` is set, a `profiling.cprofile_sample_rate`
+    share of requests also run under cProfile, and those slower than the
+    threshold have their stats dumped to `profiling.cprofile_dir`. For async
+    views the dump also covers whatever else ran on the event loop meanwhile.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        self.enabled = conf.get("profiling.enabled", False)
+        threshold_ms = conf.get("profiling.cprofile_threshold_ms")
+        self.cprofile_threshold_s = None if threshold_ms is None else float(threshold_ms) / 1e3
+        self.cprofile_sample_rate = float(conf.get("profiling.cprofile_sample_rate", 1.0))
+        self.cprofile_dir = Path(conf.get("profiling.cprofile_dir", "profiles"))
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+
+        # Connections opened before this middleware was loaded missed the signal.
+        for connection in connections.all(initialized_only=True):
+            install_query_recorder(connection)
+        with self._profiled() as profiled:
+            response = self.get_response(request)
+        return self._finish(request, response, profiled)
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+
+        with self._profiled() as profiled:
+            response = await self.get_response(request)
+        return self._finish(request, response, profiled)
+
+    @contextmanager
+    def _profiled(self) -> Iterator[_ProfiledRequest]:
+        profiled = _ProfiledRequest(RequestProfile(), self._sample_profiler())
+        start = time.perf_counter()
+        with profiling(profiled.profile):
+            if profiled.profiler is not None:
+                try:
+                    profiled.profiler.enable()
+                except ValueError:  # Another profiler is active in this thread.
+                    profiled.profiler = None
+            try:
+                yield profiled
+            finally:
+                if profiled.profiler is not None:
+                    profiled.profiler.disable()
+                profiled.total_s = time.perf_counter() - start
+
+    def _finish(self, request, response, profiled: _ProfiledRequest):
+        response["Server-Timing"] = profiled.profile.server_timing(profiled.total_s)
+        if profiled.profiler is not None and profiled.total_s >= self.cprofile_threshold_s:
+            self._dump(profiled.profiler, request, profiled.total_s)
+        return response
+
+    def _sample_profiler(self) -> cProfile.Profile | None:
+        if self.cprofile_threshold_s is None or random.random() >= self.cprofile_sample_rate:
+            return None
+        return cProfile.Profile()
+
+    def _dump(self, profiler: cProfile.Profile, request, total_s: float) -> None:
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", request.path).strip("_") or "root"
+        path = self.cprofile_dir / (
+            f"{dt.datetime.now():%Y%m%dT%H%M%S%f}_{request.method}_{slug}_{total_s * 1e3:.0f}ms.prof"
+        )
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            profiler.dump_stats(path)
+        except OSError:
+            logger.exception(f"Failed to write profile to {path}")
+        else:
+            logger.info(f"Request {request.method} {request.path} took {total_s:.3f}s: {path}")
+
+
+class StaticFilesMiddleware(WhiteNoiseMiddleware):
+    """WhiteNoise, able to pass requests on to async views.
+
+    WhiteNoise's middleware is sync only, so under ASGI Django would run every
+    request below it through the single thread-sensitive executor, one at a
+    time. Looking a file up is a dict access (or a stat with autorefresh in
+    development), so it is done inline.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, settings=None):
+        if settings is None:
+            super().__init__(get_response)
+        else:
+            super().__init__(get_response, settings)
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = self.find_file(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return self.serve(static_file, request)
+        return await self.get_response(request)
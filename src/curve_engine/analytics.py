@@ -0,0 +1,113 @@
+"""Risk analytics of many bonds at once, from their quoted prices.
+
+Each bond's yield is solved from its quoted dirty price on the cash flows of
+`build_cash_flows`, annually compounded as in `CashFlows.yields`, and accrued
+interest is the quoted dirty less clean price. The flows' semi-annual accrual
+is only used for bonds quoted clean alone. The risk measures follow from the
+same discounted flows in closed form:
+modified duration `-(dP/dy) / P`, convexity `(d2P/dy2) / P`, and DV01, the
+fall in dirty price per 100 nominal for a one basis point rise in yield.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from src.curve_engine.cashflows import build_cash_flows
+
+if TYPE_CHECKING:
+    from src.apps.yield_curves.models import BondMetric
+
+# BondMetric fields set by `annotate_bond_metrics`.
+ANALYTICS_FIELDS = ["accrued_interest", "modified_duration", "convexity", "dv01"]
+
+
+@dataclass(frozen=True)
+class BondAnalytics:
+    """One entry per bond, per 100 nominal; NaN for bonds that have matured."""
+
+    accrued_interest: np.ndarray
+    yields: np.ndarray  # Annually compounded, in decimals.
+    modified_durations: np.ndarray  # Years.
+    convexities: np.ndarray  # Years squared.
+    dv01s: np.ndarray
+
+
+def bond_analytics(
+    coupons: Sequence[float] | np.ndarray,
+    maturity_dates: Sequence[dt.date] | np.ndarray,
+    valuation_dates: dt.date | Sequence[dt.date] | np.ndarray,
+    clean_prices: Sequence[float] | np.ndarray,
+    dirty_prices: Sequence[float] | np.ndarray | None = None,
+) -> BondAnalytics:
+    """Analytics of bonds paying `coupons` (in percent), each valued on its own date or one date.
+
+    Without quoted `dirty_prices`, accrued interest comes from the cash flows' schedule.
+    """
+    coupons = np.asarray(coupons, dtype=float)
+    maturities = np.asarray(maturity_dates, dtype="datetime64[D]")
+    valuations = np.broadcast_to(
+        np.asarray(valuation_dates, dtype="datetime64[D]"), maturities.shape
+    )
+    clean_prices = np.asarray(clean_prices, dtype=float)
+    live = maturities > valuations
+    accrued, yields, durations, convexities, dv01s = (
+        np.full(len(coupons), np.nan) for _ in range(5)
+    )
+    if not live.any():
+        return BondAnalytics(accrued, yields, durations, convexities, dv01s)
+
+    cash_flows = build_cash_flows(coupons[live], maturities[live], valuations[live])
+    if dirty_prices is None:
+        accrued[live] = cash_flows.accrued
+        dirty_prices = clean_prices[live] + cash_flows.accrued
+    else:
+        dirty_prices = np.asarray(dirty_prices, dtype=float)[live]
+        accrued[live] = dirty_prices - clean_prices[live]
+    live_yields = cash_flows.yields(dirty_prices)
+    discounted = cash_flows.amounts * (1.0 + live_yields)[:, None] ** -cash_flows.times
+    price = discounted.sum(axis=1)
+    times = cash_flows.times
+    modified = (discounted * times).sum(axis=1) / price / (1.0 + live_yields)
+    convexity = (discounted * times * (times + 1.0)).sum(axis=1) / price / (1.0 + live_yields) ** 2
+
+    yields[live] = live_yields
+    durations[live] = modified
+    convexities[live] = convexity
+    dv01s[live] = modified * dirty_prices * 1e-4
+    return BondAnalytics(accrued, yields, durations, convexities, dv01s)
+
+
+def annotate_bond_metrics(
+    bond_metrics: list[BondMetric], analytics: BondAnalytics | None = None
+) -> None:
+    """Set the `ANALYTICS_FIELDS` of `bond_metrics` in place.
+
+    `analytics` of the same bonds may be passed in when already computed,
+    otherwise they are computed from each metric's bond in one vectorized pass.
+    """
+    if not bond_metrics:
+        return
+    if analytics is None:
+        analytics = bond_analytics(
+            [float(metric.bond.coupon) for metric in bond_metrics],
+            [metric.bond.maturity_date for metric in bond_metrics],
+            np.array([metric.date for metric in bond_metrics], dtype="datetime64[D]"),
+            [float(metric.clean_price) for metric in bond_metrics],
+            [float(metric.dirty_price) for metric in bond_metrics],
+        )
+    columns = zip(
+        analytics.accrued_interest.tolist(),
+        analytics.modified_durations.tolist(),
+        analytics.convexities.tolist(),
+        analytics.dv01s.tolist(),
+        strict=True,
+    )
+    for metric, values in zip(bond_metrics, columns, strict=True):
+        for field, value in zip(ANALYTICS_FIELDS, values, strict=True):
+            setattr(metric, field, None if np.isnan(value) else value)
@@ -0,0 +1,186 @@
+"""Calibration benchmarks.
+
+Times `YieldCurveCalibrator` on synthetic universes of increasing size for
+each fitting method, and compares the results against a stored baseline so
+that slowdowns (e.g. from a QuantLib upgrade) fail loudly. Runs offline.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import gc
+import json
+import platform
+import statistics
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import numpy as np
+
+from src.apps.yield_curves.models import Bond, BondMetric
+from src.curve_engine.curve_engine import FITTING_METHODS, YieldCurveCalibrator
+from src.utils.ql import quantlib
+from src.utils.synthetic import SyntheticMarket, SyntheticMarketConfig
+
+UNIVERSE_SIZES = (20, 50, 100, 200, 500)
+PHASES = ("helpers", "calibrate", "grid")
+VALUATION_DATE = dt.date(2024, 6, 3)
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    method: str
+    n_bonds: int
+    phase: str
+    median_s: float
+    min_s: float
+    repeats: int
+
+    @property
+    def key(self) -> str:
+        return f"{self.method}/{self.n_bonds}/{self.phase}"
+
+
+@dataclass(frozen=True)
+class Regression:
+    key: str
+    baseline_s: float
+    current_s: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current_s / self.baseline_s
+
+
+def synthetic_bond_metrics(n_bonds: int, seed: int = 0) -> list[BondMetric]:
+    """Unsaved bond metrics for one date of a synthetic market of about `n_bonds` bonds."""
+    market = SyntheticMarket(
+        SyntheticMarketConfig(
+            start_date=VALUATION_DATE,
+            end_date=VALUATION_DATE,
+            n_bonds=n_bonds,
+            seed=seed,
+        )
+    )
+    day = next(market.iter_days())
+    return [
+        BondMetric(
+            date=row.date,
+            clean_price=row.clean_price,
+            dirty_price=row.dirty_price,
+            _yield=0.0,
+            bond=Bond(
+                isin=row.isin,
+                description=row.description,
+                coupon=row.coupon,
+                maturity_date=row.maturity_date,
+            ),
+        )
+        for row in day.itertuples()
+    ]
+
+
+def _time(func: Callable[[], object], repeats: int) -> list[float]:
+    """Timings of `repeats` calls after an untimed warm-up, with garbage collection paused."""
+    func()
+    timings = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return timings
+
+
+def benchmark_case(method: str, n_bonds: int, repeats: int) -> list[BenchmarkResult]:
+    bond_metrics = synthetic_bond_metrics(n_bonds)
+    calibrator = YieldCurveCalibrator(bond_metrics, VALUATION_DATE, fitting_method=method)
+
+    def evaluate_grid():
+        ttms = np.arange(0.1, calibrator.curve.maxTime(), 0.1)
+        return [calibrator.zero_rate(ttm) for ttm in ttms]
+
+    timings = {
+        "helpers": _time(
+            lambda: [metric.build_ql_bond_helper() for metric in bond_metrics], repeats
+        ),
+        "calibrate": _time(calibrator.calibrate, repeats),
+        "grid": _time(evaluate_grid, repeats),
+    }
+    return [
+        BenchmarkResult(
+            method=method,
+            n_bonds=n_bonds,
+            phase=phase,
+            median_s=statistics.median(timings[phase]),
+            min_s=min(timings[phase]),
+            repeats=repeats,
+        )
+        for phase in PHASES
+    ]
+
+
+def run_benchmarks(
+    methods: list[str] | None = None,
+    sizes: tuple[int, ...] = UNIVERSE_SIZES,
+    repeats: int = 3,
+) -> list[BenchmarkResult]:
+    results = []
+    for method in methods or list(FITTING_METHODS):
+        for n_bonds in sizes:
+            results.extend(benchmark_case(method, n_bonds, repeats))
+    return results
+
+
+def environment() -> dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "quantlib": quantlib().__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+    }
+
+
+def save_baseline(results: list[BenchmarkResult], path: str | Path) -> None:
+    data = {
+        "environment": environment(),
+        "results": {result.key: asdict(result) for result in results},
+    }
+    Path(path).write_text(json.dumps(data, indent=2) + "\n")
+
+
+def baseline_environment(path: str | Path) -> dict[str, str]:
+    return json.loads(Path(path).read_text())["environment"]
+
+
+def load_baseline(path: str | Path) -> dict[str, float]:
+    data = json.loads(Path(path).read_text())
+    return {key: result["median_s"] for key, result in data["results"].items()}
+
+
+def find_regressions(
+    results: list[BenchmarkResult],
+    baseline: dict[str, float],
+    threshold: float,
+    min_duration_s: float = 1e-3,
+) -> list[Regression]:
+    """Results slower than their baseline by more than `threshold` (0.25 = 25%).
+
+    Phases faster than `min_duration_s` in both runs are ignored, as their
+    timings are dominated by noise.
+    """
+    regressions = []
+    for result in results:
+        baseline_s = baseline.get(result.key)
+        if baseline_s is None or max(baseline_s, result.median_s) < min_duration_s:
+            continue
+        if result.median_s > baseline_s * (1.0 + threshold):
+            regressions.append(Regression(result.key, baseline_s, result.median_s))
+    return regressions
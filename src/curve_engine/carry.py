@@ -0,0 +1,131 @@
+"""Carry and roll-down of many bonds, and of the curve's tenors, over several horizons at once.
+
+Each is the return over a horizon if the curve does not move, in basis points
+of today's dirty price and net of funding at the curve's zero rate to the
+horizon. Carry is what the bond earns at its own yield less that funding;
+roll-down is the rest, from its remaining flows being discounted on the same
+curve at shorter maturities, with the bond's z-spread held fixed. Flows paid
+before the horizon are reinvested at the bond's yield. The aged flows of every
+bond at every horizon form one `(n_bonds, n_horizons, n_flows)` array,
+discounted in a single vectorized call instead of a forward rate per pair.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.apps.yield_curves.models import BondMetric
+from src.curve_engine.cashflows import CashFlows, build_cash_flows
+from src.curve_engine.spreads import zspreads
+
+HORIZON_MONTHS = (3, 6, 12)
+
+# Maturities, in years, of the zero-coupon bonds standing in for the curve's tenors.
+CARRY_TENORS = (1.0, 2.0, 3.0, 5.0, 7.0, 10.0, 15.0, 20.0, 30.0)
+
+
+@dataclass(frozen=True)
+class CarryRollDown:
+    """Returns shaped `(n_bonds, n_horizons)`, in bp; NaN for bonds that have matured."""
+
+    horizons: np.ndarray  # Years.
+    carry_bp: np.ndarray
+    roll_down_bp: np.ndarray
+
+    @property
+    def total_bp(self) -> np.ndarray:
+        return self.carry_bp + self.roll_down_bp
+
+
+def horizon_years(months: Sequence[int]) -> np.ndarray:
+    return np.asarray(months, dtype=float) / 12.0
+
+
+def carry_roll_down(
+    cash_flows: CashFlows,
+    discount: Callable[[np.ndarray], np.ndarray],
+    dirty_prices: np.ndarray,
+    horizons: Sequence[float] | np.ndarray,
+) -> CarryRollDown:
+    """Carry and roll-down of bonds at `dirty_prices` on `discount`, a vectorized discount function."""
+    horizons = np.asarray(horizons, dtype=float)
+    dirty_prices = np.asarray(dirty_prices, dtype=float)
+    spreads = zspreads(cash_flows, discount(cash_flows.times), dirty_prices)
+    growth = (1.0 + cash_flows.yields(dirty_prices))[:, None]
+
+    # Time left to each flow at each horizon, (n_bonds, n_horizons, n_flows).
+    aged = cash_flows.times[:, None, :] - horizons[None, :, None]
+    remaining = np.maximum(aged, 0.0)
+    rolled = discount(remaining) * np.exp(-spreads[:, None, None] * remaining)
+    reinvested = growth[..., None] ** -aged
+    horizon_values = (cash_flows.amounts[:, None, :] * np.where(aged > 0, rolled, reinvested)).sum(
+        axis=-1
+    )
+
+    at_own_yield = dirty_prices[:, None] * growth**horizons
+    funded = dirty_prices[:, None] / discount(horizons)
+    return CarryRollDown(
+        horizons=horizons,
+        carry_bp=(at_own_yield - funded) / dirty_prices[:, None] * 1e4,
+        roll_down_bp=(horizon_values - at_own_yield) / dirty_prices[:, None] * 1e4,
+    )
+
+
+def bond_carry_roll_down(
+    bond_metrics: list[BondMetric],
+    valuation_date: dt.date,
+    discount: Callable[[np.ndarray], np.ndarray],
+    horizons: Sequence[float] | np.ndarray,
+) -> CarryRollDown:
+    """Carry and roll-down of every bond in `bond_metrics` at its quoted price."""
+    horizons = np.asarray(horizons, dtype=float)
+    live = np.array([metric.ttm > 0 for metric in bond_metrics], dtype=bool)
+    live_metrics = [metric for metric, is_live in zip(bond_metrics, live, strict=True) if is_live]
+    carry, roll_down = (np.full((len(bond_metrics), len(horizons)), np.nan) for _ in range(2))
+    if live_metrics:
+        cash_flows = build_cash_flows(
+            [float(metric.bond.coupon) for metric in live_metrics],
+            [metric.bond.maturity_date for metric in live_metrics],
+            valuation_date,
+        )
+        clean_prices = np.array([float(metric.clean_price) for metric in live_metrics])
+        result = carry_roll_down(cash_flows, discount, clean_prices + cash_flows.accrued, horizons)
+        carry[live], roll_down[live] = result.carry_bp, result.roll_down_bp
+    return CarryRollDown(horizons=horizons, carry_bp=carry, roll_down_bp=roll_down)
+
+
+def tenor_carry_roll_down(
+    discount: Callable[[np.ndarray], np.ndarray],
+    horizons: Sequence[float] | np.ndarray,
+    tenors: Sequence[float] = CARRY_TENORS,
+) -> CarryRollDown:
+    """Carry and roll-down of zero-coupon bonds priced on the curve, one per tenor."""
+    times = np.asarray(tenors, dtype=float)[:, None]
+    cash_flows = CashFlows(
+        times=times, amounts=np.full_like(times, 100.0), accrued=np.zeros(len(times))
+    )
+    return carry_roll_down(cash_flows, discount, cash_flows.dirty_prices(discount(times)), horizons)
+
+
+def breakeven_bp(
+    discount: Callable[[np.ndarray], np.ndarray],
+    horizons: Sequence[float] | np.ndarray,
+    tenors: Sequence[float] = CARRY_TENORS,
+) -> np.ndarray:
+    """Rise in each tenor's rolled-down zero rate over each horizon that cancels its carry and roll.
+
+    The forward rate from the horizon to the tenor less today's zero rate at the
+    tenor minus the horizon, `(n_tenors, n_horizons)`; NaN where the tenor is
+    not beyond the horizon.
+    """
+    tenors = np.asarray(tenors, dtype=float)[:, None]
+    horizons = np.asarray(horizons, dtype=float)[None, :]
+    remaining = tenors - horizons
+    with np.errstate(divide="ignore", invalid="ignore"):
+        forwards = np.log(discount(horizons) / discount(tenors)) / remaining
+        rolled_zeros = -np.log(discount(np.maximum(remaining, 0.0))) / remaining
+    return np.where(remaining > 0, (forwards - rolled_zeros) * 1e4, np.nan)
@@ -0,0 +1,122 @@
+"""Vectorized bond cash flows.
+
+Builds padded `(n_bonds, n_flows)` matrices of payment times and amounts for
+a universe of fixed-coupon bonds on one valuation date, or on one date each,
+so that pricing, yields and risk for every bond reduce to array operations.
+
+Conventions follow `Bond.build_ql_bond`: coupons are paid semi-annually on
+dates rolled backwards from maturity, amounts are per 100 nominal, and times
+are in years of `DAYS_IN_YEAR` days as in `BondMetric.ttm`.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.constants import DAYS_IN_YEAR
+
+FREQUENCY = 2
+
+
+@dataclass(frozen=True)
+class CashFlows:
+    times: np.ndarray  # (n_bonds, n_flows), years from the valuation date, 0 where padded.
+    amounts: np.ndarray  # (n_bonds, n_flows), per 100 nominal, 0 where padded.
+    accrued: np.ndarray  # (n_bonds,), accrued interest per 100 nominal.
+
+    @property
+    def n_bonds(self) -> int:
+        return self.times.shape[0]
+
+    def dirty_prices(self, discount: np.ndarray) -> np.ndarray:
+        """Sum of discounted flows, given discount factors shaped like `times`."""
+        return (self.amounts * discount).sum(axis=-1)
+
+    def clean_prices(self, discount: np.ndarray) -> np.ndarray:
+        return self.dirty_prices(discount) - self.accrued
+
+    def yields(
+        self,
+        dirty_prices: np.ndarray,
+        guess: float = 0.03,
+        tol: float = 1e-12,
+        max_iter: int = 50,
+    ) -> np.ndarray:
+        """Annually compounded yields to maturity (decimals) solving all bonds at once.
+
+        Runs Newton's method on every bond in parallel until all have converged.
+        """
+        dirty_prices = np.asarray(dirty_prices, dtype=float)
+        y = np.full(self.n_bonds, guess)
+        for _ in range(max_iter):
+            growth = (1.0 + y)[:, None] ** -self.times
+            price = (self.amounts * growth).sum(axis=1)
+            slope = -(self.amounts * self.times * growth).sum(axis=1) / (1.0 + y)
+            step = (price - dirty_prices) / slope
+            y = y - step
+            if np.all(np.abs(step) < tol):
+                break
+        return y
+
+
+def _add_months(months: np.ndarray, day: np.ndarray) -> np.ndarray:
+    """Dates from month indexes (months since 1970-01), with day clipped to month end."""
+    month_start = months.astype("datetime64[M]")
+    month_length = ((month_start + 1).astype("datetime64[D]") - month_start).astype(int)
+    return month_start.astype("datetime64[D]") + np.minimum(day, month_length) - 1
+
+
+def build_cash_flows(
+    coupons: Sequence[float] | np.ndarray,
+    maturity_dates: Sequence[dt.date] | np.ndarray,
+    valuation_date: dt.date | np.ndarray,
+    frequency: int = FREQUENCY,
+) -> CashFlows:
+    """Cash-flow matrices for bonds paying `coupons` (in percent) until `maturity_dates`.
+
+    `valuation_date` is one date for all bonds, or an array with one per bond,
+    so quotes of many dates can be priced in one pass. Only flows strictly
+    after the valuation date are included; bonds maturing on or before it get
+    an empty row.
+    """
+    coupons = np.asarray(coupons, dtype=float)
+    maturities = np.asarray(maturity_dates, dtype="datetime64[D]")
+    valuation = np.broadcast_to(np.asarray(valuation_date, dtype="datetime64[D]"), maturities.shape)
+    step = 12 // frequency
+
+    maturity_months = maturities.astype("datetime64[M]")
+    maturity_day = (maturities - maturity_months.astype("datetime64[D]")).astype(int) + 1
+    remaining_months = (maturity_months - valuation.astype("datetime64[M]")).astype(int)
+    n_flows = max(int(remaining_months.max(initial=0)) // step + 2, 1)
+
+    # Coupon dates rolled back from maturity: column k is maturity minus k periods.
+    periods = np.arange(n_flows + 1)
+    months = maturity_months.astype(int)[:, None] - step * periods[None, :]
+    dates = _add_months(months, maturity_day[:, None])
+    is_future = dates > valuation[:, None]
+
+    # The latest coupon date on or before valuation starts the current accrual period.
+    n_future = is_future.sum(axis=1)
+    rows = np.arange(len(coupons))
+    previous = dates[rows, np.minimum(n_future, n_flows)]
+    following = dates[rows, np.maximum(n_future - 1, 0)]
+    period_days = (following - previous).astype(float)
+    accrued_days = (valuation - previous).astype(float)
+    accrued = np.where(
+        n_future > 0,
+        coupons / frequency * accrued_days / np.where(period_days > 0, period_days, 1.0),
+        0.0,
+    )
+
+    is_future = is_future[:, :n_flows]
+    times = np.where(
+        is_future, (dates[:, :n_flows] - valuation[:, None]).astype(float) / DAYS_IN_YEAR, 0.0
+    )
+    amounts = np.where(is_future, coupons[:, None] / frequency, 0.0)
+    amounts[:, 0] += np.where(is_future[:, 0], 100.0, 0.0)
+
+    return CashFlows(times=times, amounts=amounts, accrued=accrued)
@@ -0,0 +1,40 @@
+"""Differences between two fitted Svensson curves on a common grid of maturities.
+
+Both parameter vectors are stacked and evaluated together, so zero rates,
+instantaneous forwards and discount factors of the pair each take one
+vectorized call.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.curve_engine import svensson
+
+
+@dataclass(frozen=True)
+class CurveDifference:
+    """The other curve minus the base curve at each of `ttms`."""
+
+    ttms: np.ndarray  # Years.
+    zero_spreads_bp: np.ndarray
+    forward_spreads_bp: np.ndarray
+    discount_spreads: np.ndarray  # Difference in discount factors.
+
+
+def curve_difference(
+    base_params: np.ndarray, other_params: np.ndarray, ttms: np.ndarray
+) -> CurveDifference:
+    ttms = np.asarray(ttms, dtype=float)
+    params = np.stack([np.asarray(base_params, dtype=float), np.asarray(other_params, dtype=float)])
+    zero_rates = svensson.zero_rates(params[:, None, :], ttms)
+    forward_rates = svensson.forward_rates(params[:, None, :], ttms)
+    discount_factors = np.exp(-zero_rates * ttms)
+    return CurveDifference(
+        ttms=ttms,
+        zero_spreads_bp=(zero_rates[1] - zero_rates[0]) * 1e4,
+        forward_spreads_bp=(forward_rates[1] - forward_rates[0]) * 1e4,
+        discount_spreads=discount_factors[1] - discount_factors[0],
+    )
@@ -7,11 +7,29 @@ from bond market data using QuantLib's numerical methods.
 from __future__ import annotations
 
 import datetime as dt
+import functools
 from datetime import date
+from typing import TYPE_CHECKING
 
-import QuantLib as ql
+import numpy as np
 
 from src.apps.yield_curves.models import BondMetric
+from src.curve_engine import svensson
+from src.curve_engine.carry import CarryRollDown, bond_carry_roll_down
+from src.curve_engine.residuals import BondResiduals, bond_residuals, svensson_residuals
+from src.curve_engine.spreads import BondSpreads, bond_spreads, svensson_spreads
+from src.utils.profiling import timed
+from src.utils.ql import quantlib
+
+if TYPE_CHECKING:
+    import QuantLib as ql
+
+# QuantLib fitting method class names, looked up on first calibration.
+FITTING_METHODS = {
+    "svensson": "SvenssonFitting",
+    "nelson_siegel": "NelsonSiegelFitting",
+    "exponential_splines": "ExponentialSplinesFitting",
+}
 
 
 class YieldCurveCalibrator:
@@ -20,51 +38,107 @@ class YieldCurveCalibrator:
     This class provides a high-level interface for calibrating yield curves
     from bond market data using QuantLib's numerical methods.
 
-    Current implementation is to fit a Nelson-Siegel curve.
+    Fits a Nelson-Siegel-Svensson curve by default; see `FITTING_METHODS` for
+    the alternatives.
     """
 
     def __init__(
         self,
         bond_metrics: list[BondMetric],
         valuation_date: dt.date | None = None,
+        fitting_method: str = "svensson",
     ):
+        if fitting_method not in FITTING_METHODS:
+            raise ValueError(f"Unsupported fitting method: {fitting_method}")
         self.bond_metrics: list[BondMetric] = bond_metrics
         self.valuation_date = valuation_date or date.today()
+        self.fitting_method = fitting_method
 
         self.curve: ql.YieldTermStructure | None = None
 
-        ql_date = ql.Date(
-            self.valuation_date.day, self.valuation_date.month, self.valuation_date.year
-        )
-        ql.Settings.instance().evaluationDate = ql_date
-
     def calibrate(self) -> YieldCurveCalibrator:
-        helpers = [
-            bond_metric.build_ql_bond_helper()
-            for bond_metric in self.bond_metrics
-            if bond_metric.ttm > 0
-        ]
-        if not self.bond_metrics:
-            raise ValueError("No bonds added for calibration")
+        ql = quantlib()
         ql_valuation_date = ql.Date(
             self.valuation_date.day, self.valuation_date.month, self.valuation_date.year
         )
+        ql.Settings.instance().evaluationDate = ql_valuation_date
+        with timed("helpers"):
+            helpers = [
+                bond_metric.build_ql_bond_helper()
+                for bond_metric in self.bond_metrics
+                if bond_metric.ttm > 0
+            ]
+        if not self.bond_metrics:
+            raise ValueError("No bonds added for calibration")
         day_count = next(bond_metric.bond._ql_day_count for bond_metric in self.bond_metrics)
-        self.curve = ql.FittedBondDiscountCurve(
-            ql_valuation_date,
-            helpers,
-            day_count,
-            ql.SvenssonFitting(),
-        )
+        with timed("fit"):
+            self.curve = ql.FittedBondDiscountCurve(
+                ql_valuation_date,
+                helpers,
+                day_count,
+                getattr(ql, FITTING_METHODS[self.fitting_method])(),
+            )
+            # QuantLib fits lazily on first use; fit now so calibration cost is paid here.
+            self.curve.fitResults()
+        return self
+
+    @property
+    def parameters(self) -> list[float]:
+        """Fitted parameters, e.g. `(beta0, beta1, beta2, beta3, kappa1, kappa2)` for Svensson."""
+        if not self.curve:
+            raise ValueError("Curve not calibrated yet")
+        return list(self.curve.fitResults().solution())
+
+    @property
+    def max_ttm(self) -> float:
+        """Longest time to maturity, in years, the curve can be evaluated at."""
+        if not self.curve:
+            raise ValueError("Curve not calibrated yet")
+        return self.curve.maxTime()
+
+    def residuals(self) -> BondResiduals:
+        """Fitted clean prices and yields, and yield residuals, of every input bond in one pass."""
+        if not self.curve:
+            raise ValueError("Curve not calibrated yet")
+        if self.fitting_method == "svensson":
+            return svensson_residuals(
+                self.bond_metrics, self.valuation_date, np.array(self.parameters)
+            )
+        return bond_residuals(self.bond_metrics, self.valuation_date, self._discount())
+
+    def spreads(self) -> BondSpreads:
+        """Z-spreads and asset-swap spreads of every input bond to the curve, in one pass."""
+        if not self.curve:
+            raise ValueError("Curve not calibrated yet")
+        if self.fitting_method == "svensson":
+            return svensson_spreads(
+                self.bond_metrics, self.valuation_date, np.array(self.parameters)
+            )
+        return bond_spreads(self.bond_metrics, self.valuation_date, self._discount())
+
+    def carry_roll_down(self, horizons: list[float] | np.ndarray) -> CarryRollDown:
+        """Carry and roll-down of every input bond over each of `horizons` (years), in one pass."""
+        if not self.curve:
+            raise ValueError("Curve not calibrated yet")
+        if self.fitting_method == "svensson":
+            discount = functools.partial(svensson.discount_factors, np.array(self.parameters))
+        else:
+            discount = self._discount()
+        return bond_carry_roll_down(self.bond_metrics, self.valuation_date, discount, horizons)
+
+    def _discount(self):
+        # Other methods have no closed form here, so discount through QuantLib point by point.
+        return np.vectorize(lambda t: self.curve.discount(float(t), True), otypes=[float])
 
     @property
     def engine(self):
+        ql = quantlib()
         return ql.DiscountingBondEngine(ql.YieldTermStructureHandle(self.curve))
 
     def zero_rate(self, ttm: float) -> float:
         if not self.curve:
             raise ValueError("Curve not calibrated yet")
-        return self.curve.zeroRate(ttm, ql.Continuous).rate()
+        return self.curve.zeroRate(ttm, quantlib().Continuous).rate()
 
     def forward_rate(
         self,
@@ -73,7 +147,7 @@ class YieldCurveCalibrator:
     ) -> float:
         if not self.curve:
             raise ValueError("Curve not calibrated yet")
-        return self.curve.forwardRate(forward_start, ttm, ql.Compounded).rate()
+        return self.curve.forwardRate(forward_start, ttm, quantlib().Compounded).rate()
 
     def discount_factor(self, ttm: float) -> float:
         if not self.curve:
@@ -0,0 +1,276 @@
+"""Calibrated curves shared by all processes on a host through a memory-mapped file.
+
+An in-process cache would be duplicated in every gunicorn worker and each
+worker would fit the same curve itself. Instead the worker that calibrates a
+curve appends it to an append-only file of fixed-size records, and every
+worker maps that file read-only: lookups return NumPy views into the page
+cache rather than copies.
+
+Each record holds the fitted parameters and zero rates and discount factors
+on `GRID_TTMS`, keyed by country, date, fitting method and a fingerprint of
+the quotes the curve was fitted to, so re-ingested prices miss the store
+rather than serve a stale curve. The file starts with a small header holding
+the number of committed records; writers append a record and then bump the
+count under an exclusive lock, so readers never see a partial record.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import fcntl
+import hashlib
+import os
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+from asgiref.sync import sync_to_async
+
+from src.curve_engine.executor import BondQuote, ZeroCurve, afit_zero_curve
+from src.curve_engine.history import get_curve_history
+from src.curve_engine.limiter import get_limiter
+from src.utils.configuration import conf
+from src.utils.logger import logger
+from src.utils.profiling import timed
+
+GRID_STEP = 0.1
+GRID_SIZE = 600  # Out to 60 years, past the longest gilts.
+GRID_TTMS = np.arange(1, GRID_SIZE + 1) * GRID_STEP
+MAX_PARAMS = 16
+
+_MAGIC = b"YCSTORE1"
+_HEADER_SIZE = 64  # Magic, then the committed record count as a little-endian uint64.
+
+RECORD_DTYPE = np.dtype(
+    [
+        ("country", "S2"),
+        ("date", "<i4"),  # Proleptic Gregorian ordinal.
+        ("fitting_method", "S24"),
+        ("fingerprint", "S16"),
+        ("n_params", "<i4"),
+        ("n_points", "<i4"),
+        ("params", "<f8", (MAX_PARAMS,)),
+        ("zero_rates", "<f8", (GRID_SIZE,)),
+        ("discount_factors", "<f8", (GRID_SIZE,)),
+    ]
+)
+
+_store: CurveStore | None = None
+_store_pid: int | None = None
+_store_lock = threading.Lock()
+
+
+def quotes_fingerprint(quotes: list[BondQuote]) -> bytes:
+    """Digest of the bonds and prices a curve is fitted to, independent of their order."""
+    digest = hashlib.blake2b(digest_size=16)
+    for quote in sorted(quotes, key=lambda quote: quote.isin):
+        digest.update(f"{quote.isin}:{quote.clean_price!r};".encode())
+    return digest.digest()
+
+
+@dataclass(frozen=True)
+class StoredCurve:
+    """A calibrated curve evaluated on `GRID_TTMS[:n_points]`.
+
+    Arrays read from the store are read-only views into the mapped file.
+    """
+
+    parameters: np.ndarray
+    zero_rates: np.ndarray  # Continuously compounded, in decimals.
+    discount_factors: np.ndarray
+    errors: list[str] = field(default_factory=list)  # Not persisted.
+
+    @property
+    def ttms(self) -> np.ndarray:
+        return GRID_TTMS[: len(self.zero_rates)]
+
+    @classmethod
+    def from_zero_curve(cls, zero_curve: ZeroCurve) -> StoredCurve:
+        """Lay a fitted curve out on the grid, up to its first missing point."""
+        n_points = len(zero_curve.ttms)
+        for i, ttm in enumerate(zero_curve.ttms):
+            if ttm != GRID_TTMS[i]:
+                n_points = i
+                break
+        return cls(
+            parameters=np.array(zero_curve.parameters),
+            zero_rates=np.array(zero_curve.zero_rates[:n_points]),
+            discount_factors=np.array(zero_curve.discount_factors[:n_points]),
+            errors=zero_curve.errors,
+        )
+
+
+class CurveStore:
+    """Append-only, memory-mapped store of calibrated curves.
+
+    Safe to share between processes; within a process, one instance is shared
+    by all threads.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        self._lock = threading.Lock()
+        self._records: np.memmap | None = None
+        self._index: dict[tuple[bytes, int, bytes, bytes], int] = {}
+        with self._exclusive():
+            if os.fstat(self._fd).st_size < _HEADER_SIZE:
+                os.pwrite(self._fd, _MAGIC.ljust(_HEADER_SIZE, b"\0"), 0)
+            elif os.pread(self._fd, len(_MAGIC), 0) != _MAGIC:
+                raise ValueError(f"{self.path} is not a curve store")
+
+    def __len__(self) -> int:
+        return self._committed()
+
+    def close(self) -> None:
+        with self._lock:
+            self._records = None
+            self._index.clear()
+            os.close(self._fd)
+
+    def get(
+        self,
+        country: str,
+        valuation_date: dt.date,
+        fingerprint: bytes,
+        fitting_method: str = "svensson",
+    ) -> StoredCurve | None:
+        with self._lock:
+            self._refresh()
+            row = self._index.get(self._key(country, valuation_date, fitting_method, fingerprint))
+            if row is None:
+                return None
+            record = self._records[row]
+            n_params, n_points = int(record["n_params"]), int(record["n_points"])
+            return StoredCurve(
+                parameters=self._records["params"][row, :n_params],
+                zero_rates=self._records["zero_rates"][row, :n_points],
+                discount_factors=self._records["discount_factors"][row, :n_points],
+            )
+
+    def append(
+        self,
+        country: str,
+        valuation_date: dt.date,
+        fingerprint: bytes,
+        curve: StoredCurve,
+        fitting_method: str = "svensson",
+    ) -> None:
+        if len(curve.parameters) > MAX_PARAMS:
+            raise ValueError(f"Cannot store more than {MAX_PARAMS} curve parameters")
+        record = np.zeros((), dtype=RECORD_DTYPE)
+        record["country"] = country.encode()
+        record["date"] = valuation_date.toordinal()
+        record["fitting_method"] = fitting_method.encode()
+        record["fingerprint"] = fingerprint
+        record["n_params"] = len(curve.parameters)
+        record["n_points"] = len(curve.zero_rates)
+        record["params"][: len(curve.parameters)] = curve.parameters
+        record["zero_rates"][:] = np.nan
+        record["zero_rates"][: len(curve.zero_rates)] = curve.zero_rates
+        record["discount_factors"][:] = np.nan
+        record["discount_factors"][: len(curve.discount_factors)] = curve.discount_factors
+
+        with self._exclusive():
+            count = self._committed()
+            os.pwrite(self._fd, record.tobytes(), _HEADER_SIZE + count * RECORD_DTYPE.itemsize)
+            os.pwrite(self._fd, (count + 1).to_bytes(8, "little"), len(_MAGIC))
+
+    def _committed(self) -> int:
+        return int.from_bytes(os.pread(self._fd, 8, len(_MAGIC)), "little")
+
+    def _refresh(self) -> None:
+        """Map records appended since the last lookup, by any process."""
+        count = self._committed()
+        mapped = 0 if self._records is None else len(self._records)
+        if count == mapped:
+            return
+        # Views handed out earlier keep the previous mapping alive.
+        self._records = np.memmap(
+            self.path, dtype=RECORD_DTYPE, mode="r", offset=_HEADER_SIZE, shape=(count,)
+        )
+        keys = self._records[["country", "date", "fitting_method", "fingerprint"]][mapped:]
+        for row, key in enumerate(keys.tolist(), start=mapped):
+            # Later records supersede earlier ones for the same key.
+            self._index[key] = row
+
+    @staticmethod
+    def _key(
+        country: str, valuation_date: dt.date, fitting_method: str, fingerprint: bytes
+    ) -> tuple[bytes, int, bytes, bytes]:
+        # NumPy strips trailing NULs when reading fixed-width bytes back.
+        return (
+            country.encode(),
+            valuation_date.toordinal(),
+            fitting_method.encode(),
+            fingerprint.rstrip(b"\0"),
+        )
+
+    @contextmanager
+    def _exclusive(self) -> Iterator[None]:
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+
+def get_curve_store() -> CurveStore | None:
+    """The process wide store at `curve_store.path`, or None if `curve_store.enabled` is off."""
+    global _store, _store_pid
+    if not conf.get("curve_store.enabled", True):
+        return None
+    with _store_lock:
+        # File locks belong to the open file, so a forked worker must open its own.
+        if _store is None or _store_pid != os.getpid():
+            _store = CurveStore(conf.get("curve_store.path", "data/curves.bin"))
+            _store_pid = os.getpid()
+        return _store
+
+
+async def aget_curve(
+    country: str,
+    valuation_date: dt.date,
+    quotes: list[BondQuote],
+    fitting_method: str = "svensson",
+) -> StoredCurve:
+    """The curve fitted to `quotes`, from the store if any worker has already fitted it.
+
+    Otherwise fit it in the calibration pool, subject to admission control,
+    and append it to the store for the other workers and, for Svensson fits
+    after the last date of the curve history, to the history.
+    """
+    store = get_curve_store()
+    fingerprint = quotes_fingerprint(quotes)
+    if store is not None:
+        with timed("store"):
+            curve = store.get(country, valuation_date, fingerprint, fitting_method)
+        if curve is not None:
+            return curve
+
+    async with get_limiter().slot():
+        zero_curve = await afit_zero_curve(
+            quotes, valuation_date, GRID_TTMS.tolist(), fitting_method
+        )
+    curve = StoredCurve.from_zero_curve(zero_curve)
+    if store is not None and len(curve.zero_rates) and not curve.errors:
+        with timed("store"):
+            store.append(country, valuation_date, fingerprint, curve, fitting_method)
+        logger.info(f"Stored {fitting_method} curve for {country} {valuation_date}")
+
+    history = get_curve_history()
+    if history is not None and fitting_method == "svensson" and len(curve.zero_rates):
+        with timed("history"):
+            appended = await sync_to_async(history.append)(
+                country, valuation_date, zero_curve.parameters, zero_curve.max_ttm, latest_only=True
+            )
+        if not appended:
+            # Filling in the past is left to backfill_curve_history.
+            logger.info(
+                f"Not adding {country} {valuation_date} before the end of the curve history"
+            )
+    return curve
@@ -0,0 +1,78 @@
+"""Downsampling of series for charts.
+
+Largest-Triangle-Three-Buckets keeps the points that shape a line chart, such
+as spikes and turning points, rather than every n-th point. For smooth curves
+`adaptive_indices` instead spaces points by curvature.
+"""
+
+import numpy as np
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Indices of the `n_out` points of `(x, y)` that Largest-Triangle-Three-Buckets keeps.
+
+    `x` must be increasing. `y` may have shape `(n,)` or `(n, n_series)`. With
+    several series each is scaled to its own range and a point scores the sum
+    of its triangle areas, so all series share the chosen x values.
+    """
+    x = np.asarray(x, dtype=float)
+    n = len(x)
+    if n_out >= n:
+        return np.arange(n)
+    if n_out < 3:
+        raise ValueError("Downsampling needs at least 3 output points")
+
+    y = np.asarray(y, dtype=float).reshape(n, -1)
+    low = y.min(axis=0)
+    span = np.ptp(y, axis=0)
+    y = (y - low) / np.where(span > 0, span, 1.0)
+
+    # First and last points are always kept; the rest are split into n_out - 2 buckets.
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    sizes = np.diff(edges)
+    # Average point of each bucket, then the last point standing in for the bucket after the last.
+    mean_x = np.append(np.add.reduceat(x[1 : n - 1], edges[:-1] - 1) / sizes, x[-1])
+    mean_y = np.vstack([np.add.reduceat(y[1 : n - 1], edges[:-1] - 1) / sizes[:, None], y[-1]])
+
+    indices = np.empty(n_out, dtype=int)
+    indices[0], indices[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Twice the area of the triangle from the last kept point through each candidate
+        # to the average of the next bucket.
+        areas = np.abs(
+            (x[a] - mean_x[i + 1]) * (y[lo:hi] - y[a])
+            - (x[a] - x[lo:hi, None]) * (mean_y[i + 1] - y[a])
+        ).sum(axis=1)
+        a = lo + int(np.argmax(areas))
+        indices[i + 1] = a
+    return indices
+
+
+def adaptive_indices(x: np.ndarray, y: np.ndarray, n_out: int, floor: float = 0.1) -> np.ndarray:
+    """Indices of about `n_out` points of a smooth `(x, y)`, densest where it bends most.
+
+    Points are spaced evenly in the cumulative square root of absolute
+    curvature, plus `floor` times its mean so straight segments keep some
+    points. Points that would coincide on the input grid are merged, so fewer
+    than `n_out` may come back; `x` should be much denser than `n_out`.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n_out >= n:
+        return np.arange(n)
+    if n_out < 2:
+        raise ValueError("Adaptive sampling needs at least 2 output points")
+
+    curvature = np.abs(np.gradient(np.gradient(y, x), x))
+    # Curvature smaller than rounding errors in y could produce is noise.
+    noise = 64 * np.finfo(float).eps * np.abs(y).max() / np.diff(x).min() ** 2
+    density = np.sqrt(np.where(curvature > noise, curvature, 0.0))
+    density = density + floor * density.mean() if density.any() else np.ones(n)
+    # Cumulative density at each point, integrated over the spacing of x.
+    cumulative = np.concatenate([[0.0], np.cumsum((density[1:] + density[:-1]) * np.diff(x) / 2)])
+    targets = np.linspace(0.0, cumulative[-1], n_out)
+    indices = np.clip(np.searchsorted(cumulative, targets), 0, n - 1)
+    return np.unique(indices)
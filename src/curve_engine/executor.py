@@ -0,0 +1,201 @@
+"""Process pool for curve calibration.
+
+Fitting is CPU bound and holds the GIL, so async views send it to a bounded
+pool of worker processes and keep the event loop free for cheap requests.
+Workers receive plain bond quotes rather than model instances and rebuild
+unsaved models on their side.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import datetime as dt
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+
+from src.utils.configuration import conf
+from src.utils.profiling import RequestProfile, current_profile, profiling, timed
+
+_executor: ProcessPoolExecutor | None = None
+_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class BondQuote:
+    isin: str
+    description: str
+    coupon: float
+    maturity_date: dt.date
+    clean_price: float
+
+    @classmethod
+    def from_bond_metric(cls, bond_metric) -> BondQuote:
+        return cls(
+            isin=bond_metric.bond.isin,
+            description=bond_metric.bond.description,
+            coupon=float(bond_metric.bond.coupon),
+            maturity_date=bond_metric.bond.maturity_date,
+            clean_price=float(bond_metric.clean_price),
+        )
+
+
+@dataclass(frozen=True)
+class ZeroCurve:
+    ttms: list[float]
+    zero_rates: list[float]  # Continuously compounded, in decimals.
+    discount_factors: list[float] = field(default_factory=list)
+    parameters: list[float] = field(default_factory=list)
+    max_ttm: float | None = None  # Longest maturity the curve was fitted to, in years.
+    errors: list[str] = field(default_factory=list)
+    phases: dict[str, float] = field(default_factory=dict)  # Worker side timings, seconds.
+
+
+def _init_worker() -> None:
+    import django
+
+    django.setup()
+
+
+def max_workers() -> int:
+    return int(conf.get("calibration.max_workers", min(4, os.cpu_count() or 1)))
+
+
+def _ping(_: int) -> int:
+    return os.getpid()
+
+
+def get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=max_workers(),
+                mp_context=multiprocessing.get_context(
+                    conf.get("calibration.start_method", "spawn")
+                ),
+                initializer=_init_worker,
+            )
+        return _executor
+
+
+def warm_up_executor() -> None:
+    """Start the worker processes now rather than on the first calibrations.
+
+    Starting a worker blocks the submitting thread until the child has read its
+    start-up data, which would otherwise stall the event loop of the first requests.
+    """
+    executor = get_executor()
+    list(executor.map(_ping, range(max_workers())))
+
+
+def _discard_executor(executor: ProcessPoolExecutor) -> None:
+    global _executor
+    with _lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+@atexit.register
+def shutdown_executor() -> None:
+    global _executor
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+def fit_zero_curve(
+    quotes: list[BondQuote],
+    valuation_date: dt.date,
+    ttms: list[float],
+    fitting_method: str = "svensson",
+) -> ZeroCurve:
+    """Calibrate a curve to `quotes` and evaluate it at those `ttms` it extends to.
+
+    Runs in a worker process, so takes and returns only picklable data.
+    """
+    from src.apps.yield_curves.models import Bond, BondMetric
+    from src.curve_engine.curve_engine import YieldCurveCalibrator
+
+    bond_metrics = [
+        BondMetric(
+            date=valuation_date,
+            clean_price=quote.clean_price,
+            dirty_price=quote.clean_price,
+            _yield=0.0,
+            bond=Bond(
+                isin=quote.isin,
+                description=quote.description,
+                coupon=quote.coupon,
+                maturity_date=quote.maturity_date,
+            ),
+        )
+        for quote in quotes
+    ]
+
+    profile = RequestProfile()
+    result_ttms, zero_rates, discount_factors, errors = [], [], [], []
+    with profiling(profile):
+        calibrator = YieldCurveCalibrator(
+            bond_metrics, valuation_date, fitting_method=fitting_method
+        ).calibrate()
+        with timed("grid"):
+            max_ttm = calibrator.max_ttm
+            for ttm in ttms:
+                if ttm > max_ttm:
+                    continue
+                try:
+                    zero_rate = calibrator.zero_rate(ttm)
+                    discount_factor = calibrator.discount_factor(ttm)
+                except RuntimeError as e:
+                    errors.append(f"Failed to calculate zero rate for TTM {ttm}: {e}")
+                else:
+                    result_ttms.append(ttm)
+                    zero_rates.append(zero_rate)
+                    discount_factors.append(discount_factor)
+
+    return ZeroCurve(
+        ttms=result_ttms,
+        zero_rates=zero_rates,
+        discount_factors=discount_factors,
+        parameters=calibrator.parameters,
+        max_ttm=max_ttm,
+        errors=errors,
+        phases=profile.phases,
+    )
+
+
+async def afit_zero_curve(
+    quotes: list[BondQuote],
+    valuation_date: dt.date,
+    ttms: list[float],
+    fitting_method: str = "svensson",
+) -> ZeroCurve:
+    """Run `fit_zero_curve` in the pool, adding its phase timings to the current profile.
+
+    The `executor` phase spans the whole round trip, including time spent
+    waiting for a free worker.
+    """
+    loop = asyncio.get_running_loop()
+    executor = get_executor()
+    try:
+        with timed("executor"):
+            zero_curve = await loop.run_in_executor(
+                executor, fit_zero_curve, quotes, valuation_date, ttms, fitting_method
+            )
+    except BrokenProcessPool:
+        # A worker died (e.g. killed for memory); start a fresh pool for later requests.
+        _discard_executor(executor)
+        raise
+
+    profile = current_profile()
+    if profile is not None:
+        for phase, duration_s in zero_curve.phases.items():
+            profile.add(phase, duration_s)
+    return zero_curve
@@ -0,0 +1,244 @@
+"""Principal components of daily zero-rate changes over the curve history, kept incrementally.
+
+Only the count, mean and co-moment matrix of the changes at `TENORS` are kept,
+so a new date costs one `O(n_tenors^2)` update however long the history is,
+and loadings come from the eigenvectors of the small covariance matrix
+whenever they are asked for. Batches of dates are merged with the pairwise
+update of Chan et al., which one date at a time is Welford's. The state is
+saved per country after each update, so a restarted process carries on from
+the last date seen rather than from the start of the history. Changes over a
+gap of more than one business day in the history are not daily and are left out.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from src.curve_engine.history import (
+    DATE_DTYPE,
+    TENORS,
+    CurveHistory,
+    TimeSeries,
+    check_country,
+    get_curve_history,
+)
+from src.utils.configuration import conf
+from src.utils.logger import logger
+
+FACTOR_NAMES = ("level", "slope", "curvature")
+MAX_GAP_BUSINESS_DAYS = 1
+
+_factors: dict[str, CurveFactors] = {}
+_factors_lock = threading.Lock()
+
+
+def _sign_references(n_tenors: int) -> np.ndarray:
+    """Shapes each named factor's loadings are signed to agree with, one row per factor."""
+    position = np.linspace(-1.0, 1.0, n_tenors)
+    return np.stack([np.ones(n_tenors), position, 1.0 - 2.0 * np.abs(position)])
+
+
+def _daily_changes(rates: TimeSeries) -> TimeSeries:
+    """Changes in bp between consecutive dates of `rates` at most one business day apart."""
+    daily = np.busday_count(rates.dates[:-1], rates.dates[1:]) <= MAX_GAP_BUSINESS_DAYS
+    return TimeSeries(
+        dates=rates.dates[1:][daily], values=np.diff(rates.values, axis=0)[daily] * 1e4
+    )
+
+
+@dataclass(frozen=True)
+class Factors:
+    """The leading principal components of daily zero-rate changes, in bp, at `tenors`."""
+
+    tenors: tuple[float, ...]
+    names: list[str]
+    loadings: np.ndarray  # (n_factors, n_tenors), unit rows.
+    variances: np.ndarray  # (n_factors,), bp squared per day.
+    explained: np.ndarray  # (n_factors,), share of the total variance.
+    means_bp: np.ndarray  # (n_tenors,)
+    n_obs: int
+
+
+class CurveFactors:
+    """Running PCA of `country`'s daily zero-rate changes, saved under `root` if given."""
+
+    def __init__(self, country: str, history: CurveHistory, root: str | Path | None = None):
+        self.country = check_country(country)
+        self.history = history
+        self.path = None if root is None else Path(root) / country / "factors.npz"
+        self._lock = threading.Lock()
+        self._reset()
+        if self.path is not None:
+            self._load()
+
+    def _reset(self) -> None:
+        self.n_obs = 0
+        self.means_bp = np.zeros(len(TENORS))
+        self._comoments = np.zeros((len(TENORS), len(TENORS)))
+        self.n_rows = 0  # History rows seen, one more than the changes once any are.
+        self.last_date = np.datetime64("NaT", "D")
+        self._generation = -1
+
+    def update(self) -> int:
+        """Add the changes of the dates appended to the curve history since the last update.
+
+        Returns how many were added. If dates already seen were refitted or
+        filled in, the components are rebuilt from the whole history.
+        """
+        with self._lock:
+            # Read the generation first: a rewrite in between only costs another rebuild.
+            generation = self.history.generation(self.country)
+            if self.path is not None:
+                self._load()
+            dates = self.history.dates(self.country)
+            seen = (
+                generation == self._generation
+                and self.n_rows <= len(dates)
+                and (not self.n_rows or dates[self.n_rows - 1] == self.last_date)
+            )
+            if not seen:
+                if self.n_rows:
+                    logger.info(f"Curve history of {self.country} changed, rebuilding its factors")
+                self._reset()
+            self._generation = generation
+            if len(dates) <= self.n_rows:
+                return 0
+
+            # The last date already seen is needed for the change to the first new one.
+            start = dates[max(self.n_rows - 1, 0)].item()
+            rates = self.history.zero_rates(self.country, list(TENORS), start)
+            changes = _daily_changes(rates).values
+            self._merge(changes)
+            self.n_rows += len(rates.dates) - (1 if self.n_rows else 0)
+            self.last_date = rates.dates[-1]
+            if self.path is not None:
+                self._save()
+            return len(changes)
+
+    def _merge(self, changes: np.ndarray) -> None:
+        n_new = len(changes)
+        if not n_new:
+            return
+        means = changes.mean(axis=0)
+        deviations = changes - means
+        n_obs = self.n_obs + n_new
+        delta = means - self.means_bp
+        self._comoments += deviations.T @ deviations + np.outer(delta, delta) * (
+            self.n_obs * n_new / n_obs
+        )
+        self.means_bp = self.means_bp + delta * (n_new / n_obs)
+        self.n_obs = n_obs
+
+    @property
+    def covariance(self) -> np.ndarray:
+        """Sample covariance of the daily changes, bp squared."""
+        return self._comoments / max(self.n_obs - 1, 1)
+
+    def factors(self, n_factors: int = len(FACTOR_NAMES)) -> Factors | None:
+        """The `n_factors` leading components, or None with fewer than two changes."""
+        with self._lock:
+            if self.n_obs < 2:
+                return None
+            variances, vectors = np.linalg.eigh(self.covariance)
+            order = np.argsort(variances)[::-1][:n_factors]
+            variances = np.maximum(variances[order], 0.0)
+            loadings = vectors[:, order].T
+            # Eigenvectors have no sign of their own; match level, slope and curvature shapes.
+            references = _sign_references(len(TENORS))[: len(loadings)]
+            signs = np.where((loadings[: len(references)] * references).sum(axis=1) < 0, -1.0, 1.0)
+            loadings[: len(signs)] *= signs[:, None]
+            total = np.trace(self.covariance)
+            return Factors(
+                tenors=TENORS,
+                names=[
+                    FACTOR_NAMES[i] if i < len(FACTOR_NAMES) else f"pc{i + 1}"
+                    for i in range(len(loadings))
+                ],
+                loadings=loadings,
+                variances=variances,
+                explained=variances / total if total > 0 else np.zeros(len(variances)),
+                means_bp=self.means_bp.copy(),
+                n_obs=self.n_obs,
+            )
+
+    def scores(
+        self, factors: Factors, start: dt.date | None = None, end: dt.date | None = None
+    ) -> TimeSeries:
+        """Scores of the daily changes from `start` to `end` on `factors`, `(n_dates, n_factors)`.
+
+        Each date's change is from the previous date in the history, so the first
+        date of the history, and any date more than a business day after the one
+        before it, has none.
+        """
+        dates = self.history.dates(self.country)
+        first = 0 if start is None else int(np.searchsorted(dates, np.datetime64(start, "D")))
+        if first >= len(dates):
+            return TimeSeries(
+                dates=np.empty(0, dtype=DATE_DTYPE), values=np.empty((0, len(factors.names)))
+            )
+        rates = self.history.zero_rates(
+            self.country, list(factors.tenors), dates[max(first - 1, 0)].item(), end
+        )
+        changes = _daily_changes(rates)
+        return TimeSeries(
+            dates=changes.dates, values=(changes.values - factors.means_bp) @ factors.loadings.T
+        )
+
+    def _load(self) -> None:
+        """Take the saved state if another process has got further than this one."""
+        try:
+            with np.load(self.path) as state:
+                n_rows = int(state["n_rows"])
+                generation = int(state["generation"])
+                if (generation, n_rows) <= (self._generation, self.n_rows):
+                    return
+                self.n_obs = int(state["n_obs"])
+                self.means_bp = state["means_bp"]
+                self._comoments = state["comoments"]
+                self.n_rows = n_rows
+                self.last_date = state["last_date"].astype(DATE_DTYPE)[()]
+                self._generation = generation
+        except FileNotFoundError:
+            return
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                n_obs=self.n_obs,
+                means_bp=self.means_bp,
+                comoments=self._comoments,
+                n_rows=self.n_rows,
+                last_date=self.last_date,
+                generation=self._generation,
+            )
+        os.replace(tmp_path, self.path)
+
+
+def get_curve_factors(country: str) -> CurveFactors | None:
+    """This process's factors of `country`, up to date with the curve history.
+
+    State is saved under `factors.path`, by default beside the country's curve
+    history. None if the curve history is disabled. Raises ValueError if `country`
+    is not a two-letter code.
+    """
+    check_country(country)
+    history = get_curve_history()
+    if history is None:
+        return None
+    with _factors_lock:
+        factors = _factors.get(country)
+        if factors is None or factors.history is not history:
+            factors = _factors[country] = CurveFactors(
+                country, history, conf.get("factors.path", history.root)
+            )
+    factors.update()
+    return factors
@@ -0,0 +1,313 @@
+"""Columnar history of fitted Svensson curves, for time-series queries without refitting.
+
+Each country has a directory holding one raw little-endian column file per
+field, all in date order: `dates`, the Svensson `params`, `max_ttm` and the
+zero rate at each tenor in `TENORS`. Readers map the columns read-only, so
+"the 10y rate over five years" costs two binary searches on the dates and a
+slice of one contiguous column.
+
+Rows for dates after the last one are appended to every column, with the
+dates column written last; readers size all columns by the dates column, so
+they never see a partial row. Inserting or replacing earlier dates rewrites
+the columns into a new generation directory and then points `HEAD` at it
+atomically. Readers still holding maps of the old generation are unaffected.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import fcntl
+import os
+import re
+import shutil
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from src.curve_engine import svensson
+from src.utils.configuration import conf
+
+# Standard tenors, in years, whose zero rates are stored alongside the parameters.
+TENORS = (0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 7.0, 10.0, 15.0, 20.0, 30.0)
+
+DATE_DTYPE = np.dtype("<M8[D]")
+
+# Countries name directories under the history root, so only ISO codes are taken.
+COUNTRY_PATTERN = re.compile(r"[A-Z]{2}")
+
+_history: CurveHistory | None = None
+_history_lock = threading.Lock()
+
+
+def tenor_column(tenor: float) -> str:
+    return f"zero_{tenor:g}y"
+
+
+# Column name -> (dtype, shape of one row). Dates are kept separately and written last.
+COLUMNS: dict[str, tuple[str, tuple[int, ...]]] = {
+    "params": ("<f8", (svensson.N_PARAMS,)),
+    "max_ttm": ("<f8", ()),
+    **{tenor_column(tenor): ("<f8", ()) for tenor in TENORS},
+}
+
+
+@dataclass(frozen=True)
+class TimeSeries:
+    dates: np.ndarray  # datetime64[D]
+    values: np.ndarray  # One row per date.
+
+
+@dataclass(frozen=True)
+class _Mapped:
+    generation: int
+    dates: np.ndarray
+    columns: dict[str, np.ndarray]
+
+
+def check_country(country: str) -> str:
+    """`country` if it is a two-letter country code, else ValueError."""
+    if not isinstance(country, str) or not COUNTRY_PATTERN.fullmatch(country):
+        raise ValueError(f"Invalid country: {country!r}")
+    return country
+
+
+def _as_dates(dates) -> np.ndarray:
+    return np.asarray(dates, dtype=DATE_DTYPE)
+
+
+class CurveHistory:
+    """Per-country columns of fitted curves under `root`, shared by all processes on a host."""
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._mapped: dict[str, _Mapped] = {}
+
+    def dates(self, country: str) -> np.ndarray:
+        return self._map(country).dates
+
+    def generation(self, country: str) -> int:
+        """Bumped whenever rows of `country` are inserted or replaced rather than appended."""
+        return self._generation(country)
+
+    def series(
+        self,
+        country: str,
+        tenor: float,
+        start: dt.date | None = None,
+        end: dt.date | None = None,
+    ) -> TimeSeries:
+        """Zero rates at `tenor` (continuously compounded, in decimals) from `start` to `end`.
+
+        Standard tenors are a view of their column; other tenors are evaluated
+        from the stored parameters.
+        """
+        mapped = self._map(country)
+        rows = self._rows(mapped.dates, start, end)
+        column = tenor_column(tenor)
+        if column in mapped.columns:
+            values = mapped.columns[column][rows]
+        else:
+            values = svensson.zero_rates(mapped.columns["params"][rows], tenor)
+        return TimeSeries(dates=mapped.dates[rows], values=values)
+
+    def zero_rates(
+        self,
+        country: str,
+        tenors: list[float],
+        start: dt.date | None = None,
+        end: dt.date | None = None,
+    ) -> TimeSeries:
+        """Zero rates at each of `tenors`, shape `(n_dates, len(tenors))`, in one evaluation."""
+        mapped = self._map(country)
+        rows = self._rows(mapped.dates, start, end)
+        values = svensson.zero_rates(
+            mapped.columns["params"][rows][:, None, :], np.asarray(tenors, dtype=float)[None, :]
+        )
+        return TimeSeries(dates=mapped.dates[rows], values=values)
+
+    def parameters(
+        self, country: str, start: dt.date | None = None, end: dt.date | None = None
+    ) -> TimeSeries:
+        """Svensson parameters, shape `(n_dates, 6)`, from `start` to `end`."""
+        mapped = self._map(country)
+        rows = self._rows(mapped.dates, start, end)
+        return TimeSeries(dates=mapped.dates[rows], values=mapped.columns["params"][rows])
+
+    def append(
+        self,
+        country: str,
+        valuation_date: dt.date,
+        params: list[float],
+        max_ttm: float,
+        latest_only: bool = False,
+    ) -> bool:
+        return self.extend(country, [valuation_date], [params], [max_ttm], latest_only)
+
+    def extend(self, country: str, dates, params, max_ttms, latest_only: bool = False) -> bool:
+        """Add or replace the curves fitted on `dates`, and return whether they were stored.
+
+        With `latest_only`, curves are only added after the last stored date: any
+        other date would rewrite the columns and invalidate every reader's views.
+        """
+        new = {"params": np.asarray(params, dtype=float).reshape(-1, svensson.N_PARAMS)}
+        new["max_ttm"] = np.asarray(max_ttms, dtype=float)
+        for tenor in TENORS:
+            new[tenor_column(tenor)] = svensson.zero_rates(new["params"], tenor)
+        new_dates = _as_dates(dates)
+        if not len(new_dates):
+            return True
+
+        with self._exclusive(country):
+            generation = self._generation(country)
+            directory = self._directory(country, generation)
+            try:
+                existing_dates = np.fromfile(directory / "dates", dtype=DATE_DTYPE)
+            except FileNotFoundError:
+                existing_dates = np.empty(0, dtype=DATE_DTYPE)
+            in_order = np.all(np.diff(new_dates) > np.timedelta64(0, "D"))
+            if in_order and (not len(existing_dates) or new_dates[0] > existing_dates[-1]):
+                self._append_rows(directory, new_dates, new, len(existing_dates))
+            elif latest_only:
+                return False
+            else:
+                self._rewrite(country, generation, existing_dates, new_dates, new)
+        return True
+
+    def _append_rows(
+        self, directory: Path, dates: np.ndarray, new: dict[str, np.ndarray], n_rows: int
+    ) -> None:
+        directory.mkdir(parents=True, exist_ok=True)
+        for name, (dtype, shape) in COLUMNS.items():
+            row_bytes = np.dtype(dtype).itemsize * int(np.prod(shape))
+            with open(directory / name, "ab") as f:
+                # Drop any rows left by an append that died before committing its dates.
+                f.truncate(n_rows * row_bytes)
+                f.write(np.ascontiguousarray(new[name], dtype=dtype).tobytes())
+        with open(directory / "dates", "ab") as f:
+            f.truncate(n_rows * DATE_DTYPE.itemsize)
+            f.write(dates.tobytes())
+
+    def _rewrite(
+        self,
+        country: str,
+        generation: int,
+        existing_dates: np.ndarray,
+        new_dates: np.ndarray,
+        new: dict[str, np.ndarray],
+    ) -> None:
+        directory = self._directory(country, generation)
+        n_rows = len(existing_dates)
+        existing = {}
+        for name, (dtype, shape) in COLUMNS.items():
+            if n_rows:
+                count = n_rows * int(np.prod(shape))
+                column = np.fromfile(directory / name, dtype=dtype, count=count)
+                existing[name] = column.reshape((n_rows, *shape))
+            else:
+                existing[name] = np.empty((0, *shape), dtype=dtype)
+
+        # Stable sort with the new rows last, then keep the last row for each date.
+        dates = np.concatenate([existing_dates, new_dates])
+        order = np.argsort(dates, kind="stable")
+        keep = np.append(dates[order][1:] != dates[order][:-1], True)
+        rows = order[keep]
+        merged = {name: np.concatenate([existing[name], new[name]])[rows] for name in COLUMNS}
+        if len(rows) == n_rows and all(
+            np.array_equal(merged[name], existing[name]) for name in COLUMNS
+        ):
+            return
+
+        new_directory = self._directory(country, generation + 1)
+        shutil.rmtree(new_directory, ignore_errors=True)
+        self._append_rows(new_directory, dates[rows], merged, 0)
+        head = self._country_root(country) / "HEAD"
+        tmp_head = head.with_name("HEAD.tmp")
+        tmp_head.write_text(str(generation + 1))
+        os.replace(tmp_head, head)
+        shutil.rmtree(directory, ignore_errors=True)
+
+    def _country_root(self, country: str) -> Path:
+        return self.root / check_country(country)
+
+    def _generation(self, country: str) -> int:
+        try:
+            return int((self._country_root(country) / "HEAD").read_text())
+        except FileNotFoundError:
+            return 0
+
+    def _directory(self, country: str, generation: int) -> Path:
+        return self._country_root(country) / str(generation)
+
+    def _map(self, country: str) -> _Mapped:
+        """Map the rows committed since the last query, by any process."""
+        while True:
+            generation = self._generation(country)
+            try:
+                return self._map_generation(country, generation)
+            except FileNotFoundError:
+                # Either nothing is stored yet, or a rewrite replaced the generation we read.
+                if self._generation(country) == generation:
+                    return self._map_generation(country, generation, empty=True)
+
+    def _map_generation(self, country: str, generation: int, empty: bool = False) -> _Mapped:
+        dates_path = self._directory(country, generation) / "dates"
+        n_rows = 0 if empty else dates_path.stat().st_size // DATE_DTYPE.itemsize
+        with self._lock:
+            mapped = self._mapped.get(country)
+            if mapped and mapped.generation == generation and len(mapped.dates) == n_rows:
+                return mapped
+            if n_rows:
+                dates = np.memmap(dates_path, dtype=DATE_DTYPE, mode="r", shape=(n_rows,))
+                columns = {
+                    name: np.memmap(
+                        dates_path.with_name(name), dtype=dtype, mode="r", shape=(n_rows, *shape)
+                    )
+                    for name, (dtype, shape) in COLUMNS.items()
+                }
+            else:
+                dates = np.empty(0, dtype=DATE_DTYPE)
+                columns = {
+                    name: np.empty((0, *shape), dtype=dtype)
+                    for name, (dtype, shape) in COLUMNS.items()
+                }
+            mapped = _Mapped(generation=generation, dates=dates, columns=columns)
+            self._mapped[country] = mapped
+            return mapped
+
+    @staticmethod
+    def _rows(dates: np.ndarray, start: dt.date | None, end: dt.date | None) -> slice:
+        lo = 0 if start is None else int(np.searchsorted(dates, np.datetime64(start, "D")))
+        hi = (
+            len(dates)
+            if end is None
+            else int(np.searchsorted(dates, np.datetime64(end, "D"), side="right"))
+        )
+        return slice(lo, hi)
+
+    @contextmanager
+    def _exclusive(self, country: str) -> Iterator[None]:
+        directory = self._country_root(country)
+        directory.mkdir(parents=True, exist_ok=True)
+        fd = os.open(directory / "LOCK", os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)
+
+
+def get_curve_history() -> CurveHistory | None:
+    """The history at `history.path`, or None if `history.enabled` is off."""
+    global _history
+    if not conf.get("history.enabled", True):
+        return None
+    with _history_lock:
+        if _history is None:
+            _history = CurveHistory(conf.get("history.path", "data/history"))
+        return _history
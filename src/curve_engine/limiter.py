@@ -0,0 +1,251 @@
+"""Admission control for calibration requests.
+
+Each process admits at most `calibration.max_concurrent` fits at once and
+queues up to `calibration.max_queue` more, each for at most
+`calibration.max_wait_s`. Beyond that requests are rejected straight away
+with 429 (queue full) or 503 (timed out waiting), so a burst of zero curve
+requests fails fast instead of tying up every worker. Setting
+`calibration.global_max_concurrent` also caps fits across all processes and
+hosts, with leases held in Redis at `calibration.redis_url`.
+
+The per-process limit and queue only see concurrent requests under the ASGI
+(uvicorn) workers the app is deployed with; a sync worker serves one request
+at a time, so there only the global limit applies.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import threading
+import time
+import uuid
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Protocol
+
+from src.curve_engine.executor import max_workers
+from src.utils.configuration import conf
+from src.utils.metrics import format_prometheus
+
+_limiter: CalibrationLimiter | None = None
+_limiter_lock = threading.Lock()
+
+
+class Overloaded(Exception):
+    """Raised when a calibration request is rejected rather than admitted."""
+
+    def __init__(self, status: int, retry_after_s: int, reason: str):
+        super().__init__(f"Calibration {reason.replace('_', ' ')}, retry in {retry_after_s}s")
+        self.status = status
+        self.retry_after_s = retry_after_s
+        self.reason = reason
+
+
+class GlobalSlots(Protocol):
+    """Concurrency slots shared between processes."""
+
+    def try_acquire(self, token: str) -> bool: ...
+
+    def release(self, token: str) -> None: ...
+
+
+class RedisSlots:
+    """Global slots held as leases in a Redis sorted set, scored by acquisition time.
+
+    Leases expire after `lease_s`, so slots held by a process that died are
+    freed rather than lost.
+    """
+
+    _ACQUIRE = """
+    redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', tonumber(ARGV[1]) - tonumber(ARGV[3]))
+    if redis.call('ZCARD', KEYS[1]) < tonumber(ARGV[2]) then
+        redis.call('ZADD', KEYS[1], ARGV[1], ARGV[4])
+        return 1
+    end
+    return 0
+    """
+
+    def __init__(self, url: str, limit: int, key: str = "calibration:slots", lease_s: int = 120):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.limit = limit
+        self.key = key
+        self.lease_s = lease_s
+        self._acquire = self.client.register_script(self._ACQUIRE)
+
+    def try_acquire(self, token: str) -> bool:
+        return bool(
+            self._acquire(keys=[self.key], args=[time.time(), self.limit, self.lease_s, token])
+        )
+
+    def release(self, token: str) -> None:
+        self.client.zrem(self.key, token)
+
+
+@dataclass(eq=False)
+class _Waiter:
+    loop: asyncio.AbstractEventLoop
+    future: asyncio.Future
+    granted: bool = False
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+@dataclass
+class CalibrationLimiter:
+    """Bounds concurrent fits in this process, with a bounded FIFO wait queue.
+
+    Thread safe: under WSGI each request runs its async view in its own event
+    loop, so waiters are woken through their own loop.
+    """
+
+    max_concurrent: int
+    max_queue: int
+    max_wait_s: float
+    global_slots: GlobalSlots | None = None
+    global_poll_s: float = 0.05
+    active: int = 0
+    admitted: int = 0
+    rejected: dict[str, int] = field(
+        default_factory=lambda: {"queue_full": 0, "timeout": 0, "global": 0}
+    )
+    mean_fit_s: float = 1.0  # Exponentially weighted, for Retry-After.
+    _waiters: deque[_Waiter] = field(default_factory=deque, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    def retry_after_s(self) -> int:
+        """Rough time until a new request could start: the queue ahead of it drained."""
+        slots = max(self.max_concurrent, 1)
+        return max(1, math.ceil(self.mean_fit_s * (len(self._waiters) + 1) / slots))
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold a calibration slot for the duration of the block, or raise `Overloaded`."""
+        deadline = time.monotonic() + self.max_wait_s
+        await self._acquire_local()
+        token = None
+        try:
+            if self.global_slots is not None:
+                token = await self._acquire_global(deadline)
+            start = time.perf_counter()
+            yield
+            with self._lock:
+                self.mean_fit_s = 0.8 * self.mean_fit_s + 0.2 * (time.perf_counter() - start)
+        finally:
+            if token is not None:
+                await asyncio.to_thread(self.global_slots.release, token)
+            self._release_local()
+
+    async def _acquire_local(self) -> None:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self.active < self.max_concurrent and not self._waiters:
+                self.active += 1
+                self.admitted += 1
+                return
+            if len(self._waiters) >= self.max_queue:
+                self.rejected["queue_full"] += 1
+                raise Overloaded(429, self.retry_after_s(), "queue_full")
+            waiter = _Waiter(loop, loop.create_future())
+            self._waiters.append(waiter)
+
+        try:
+            await asyncio.wait_for(waiter.future, self.max_wait_s)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            with self._lock:
+                if not waiter.granted:
+                    self._waiters.remove(waiter)
+                    if isinstance(e, asyncio.TimeoutError):
+                        self.rejected["timeout"] += 1
+                        raise Overloaded(503, self.retry_after_s(), "timeout") from None
+                    raise
+            # A slot was handed over just as we gave up waiting.
+            if isinstance(e, asyncio.CancelledError):
+                self._release_local()
+                raise
+        with self._lock:
+            self.admitted += 1
+
+    async def _acquire_global(self, deadline: float) -> str:
+        token = uuid.uuid4().hex
+        while not await asyncio.to_thread(self.global_slots.try_acquire, token):
+            if time.monotonic() >= deadline:
+                with self._lock:
+                    self.rejected["global"] += 1
+                raise Overloaded(503, self.retry_after_s(), "global")
+            await asyncio.sleep(self.global_poll_s)
+        return token
+
+    def _release_local(self) -> None:
+        with self._lock:
+            if self._waiters:
+                # Hand the slot straight to the next waiter, so `active` is unchanged.
+                waiter = self._waiters.popleft()
+                waiter.granted = True
+                waiter.loop.call_soon_threadsafe(_resolve, waiter.future)
+            else:
+                self.active -= 1
+
+    def metrics(self, labels: dict[str, str] | None = None) -> str:
+        """Current state in the Prometheus text exposition format."""
+        labels = labels or {}
+        with self._lock:
+            active, waiting, admitted = self.active, len(self._waiters), self.admitted
+            rejected = dict(self.rejected)
+        return "".join(
+            [
+                format_prometheus(
+                    "calibration_active", "Calibrations running.", [(labels, active)]
+                ),
+                format_prometheus(
+                    "calibration_queue_depth",
+                    "Calibration requests waiting for a slot.",
+                    [(labels, waiting)],
+                ),
+                format_prometheus(
+                    "calibration_admitted_total",
+                    "Calibration requests admitted.",
+                    [(labels, admitted)],
+                    metric_type="counter",
+                ),
+                format_prometheus(
+                    "calibration_rejected_total",
+                    "Calibration requests rejected, by reason.",
+                    [({**labels, "reason": reason}, n) for reason, n in rejected.items()],
+                    metric_type="counter",
+                ),
+            ]
+        )
+
+
+def get_limiter() -> CalibrationLimiter:
+    """The process wide limiter, configured from `calibration.*` on first use."""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            global_limit = conf.get("calibration.global_max_concurrent", None)
+            _limiter = CalibrationLimiter(
+                max_concurrent=int(conf.get("calibration.max_concurrent", max_workers())),
+                max_queue=int(conf.get("calibration.max_queue", 8)),
+                max_wait_s=float(conf.get("calibration.max_wait_s", 10)),
+                global_slots=(
+                    RedisSlots(
+                        conf.get("calibration.redis_url", "redis://localhost:6379/0"),
+                        int(global_limit),
+                    )
+                    if global_limit
+                    else None
+                ),
+            )
+        return _limiter
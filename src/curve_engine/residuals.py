@@ -0,0 +1,68 @@
+"""Fitted prices and yields of a bond universe against a fitted curve, all bonds at once.
+
+Market and fitted yields are both solved from the same cash flows, so the
+residual reflects the curve fit rather than differences in yield conventions.
+A positive residual means the bond yields more than the curve implies, i.e.
+it is cheap.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.apps.yield_curves.models import BondMetric
+from src.curve_engine import svensson
+from src.curve_engine.cashflows import build_cash_flows
+
+
+@dataclass(frozen=True)
+class BondResiduals:
+    """One entry per input bond metric; NaN for bonds that have matured."""
+
+    fitted_clean_prices: np.ndarray
+    fitted_yields: np.ndarray  # Annually compounded, in decimals.
+    market_yields: np.ndarray  # Annually compounded, in decimals.
+
+    @property
+    def residuals_bp(self) -> np.ndarray:
+        return (self.market_yields - self.fitted_yields) * 1e4
+
+
+def bond_residuals(
+    bond_metrics: list[BondMetric],
+    valuation_date: dt.date,
+    discount: Callable[[np.ndarray], np.ndarray],
+) -> BondResiduals:
+    """Price every bond in `bond_metrics` off `discount`, a vectorized discount function of time."""
+    n_bonds = len(bond_metrics)
+    live = np.array([metric.ttm > 0 for metric in bond_metrics], dtype=bool)
+    live_metrics = [metric for metric, is_live in zip(bond_metrics, live, strict=True) if is_live]
+    fitted_clean_prices, fitted_yields, market_yields = (np.full(n_bonds, np.nan) for _ in range(3))
+    if not live_metrics:
+        return BondResiduals(fitted_clean_prices, fitted_yields, market_yields)
+
+    cash_flows = build_cash_flows(
+        [float(metric.bond.coupon) for metric in live_metrics],
+        [metric.bond.maturity_date for metric in live_metrics],
+        valuation_date,
+    )
+    fitted_dirty = cash_flows.dirty_prices(discount(cash_flows.times))
+    market_dirty = (
+        np.array([float(metric.clean_price) for metric in live_metrics]) + cash_flows.accrued
+    )
+    fitted_clean_prices[live] = fitted_dirty - cash_flows.accrued
+    fitted_yields[live] = cash_flows.yields(fitted_dirty)
+    market_yields[live] = cash_flows.yields(market_dirty)
+    return BondResiduals(fitted_clean_prices, fitted_yields, market_yields)
+
+
+def svensson_residuals(
+    bond_metrics: list[BondMetric], valuation_date: dt.date, params: np.ndarray
+) -> BondResiduals:
+    return bond_residuals(
+        bond_metrics, valuation_date, lambda times: svensson.discount_factors(params, times)
+    )
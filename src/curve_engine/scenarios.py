@@ -0,0 +1,145 @@
+"""Scenario repricing and key-rate DV01 of a bond universe off one fitted curve.
+
+A scenario shifts the continuously compounded zero curve by amounts given at
+`KEY_RATE_TENORS`, linear in between and flat beyond the first and last. The
+shift at every cash-flow time is therefore a fixed weighting of the key-rate
+shifts, so the universe's cash-flow matrix is weighted once and all scenarios
+are repriced with one matrix product and one batched exponential, rather than
+a pricing engine per bond per scenario.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.curve_engine import svensson
+from src.curve_engine.cashflows import CashFlows, build_cash_flows
+
+# Tenors, in years, at which scenario shifts are given and key-rate DV01s reported.
+KEY_RATE_TENORS = (0.5, 1.0, 2.0, 3.0, 5.0, 7.0, 10.0, 15.0, 20.0, 30.0)
+
+SCENARIO_TYPES = ("parallel", "twist", "butterfly", "key_rate")
+
+
+def _through(points: list[tuple[float, float]]) -> tuple[float, ...]:
+    """Shifts at the key tenors of the line through `(tenor, bp)` points."""
+    tenors, bps = zip(*points, strict=True)
+    return tuple(np.interp(KEY_RATE_TENORS, tenors, bps).tolist())
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    shifts_bp: tuple[float, ...]  # Zero rate shift at each of `KEY_RATE_TENORS`.
+
+    @classmethod
+    def parallel(cls, bp: float) -> Scenario:
+        return cls(f"parallel {bp:+g}bp", (float(bp),) * len(KEY_RATE_TENORS))
+
+    @classmethod
+    def twist(cls, short_bp: float, long_bp: float) -> Scenario:
+        """Shift `short_bp` at the shortest key tenor, `long_bp` at the longest, linear between."""
+        points = [(KEY_RATE_TENORS[0], short_bp), (KEY_RATE_TENORS[-1], long_bp)]
+        return cls(f"twist {short_bp:+g}/{long_bp:+g}bp", _through(points))
+
+    @classmethod
+    def butterfly(cls, wings_bp: float, belly_bp: float, belly: float = 7.0) -> Scenario:
+        """Shift `belly_bp` at the `belly` tenor and `wings_bp` at both ends, linear between."""
+        if not KEY_RATE_TENORS[0] < belly < KEY_RATE_TENORS[-1]:
+            raise ValueError(f"Butterfly belly must be inside the key tenors, got {belly:g}y")
+        points = [
+            (KEY_RATE_TENORS[0], wings_bp),
+            (belly, belly_bp),
+            (KEY_RATE_TENORS[-1], wings_bp),
+        ]
+        return cls(f"butterfly {wings_bp:+g}/{belly_bp:+g}bp at {belly:g}y", _through(points))
+
+    @classmethod
+    def key_rate(cls, tenor: float, bp: float) -> Scenario:
+        if tenor not in KEY_RATE_TENORS:
+            raise ValueError(f"Key rate tenor must be one of {KEY_RATE_TENORS}, got {tenor:g}")
+        shifts = tuple(float(bp) if t == tenor else 0.0 for t in KEY_RATE_TENORS)
+        return cls(f"{tenor:g}y {bp:+g}bp", shifts)
+
+    @classmethod
+    def from_spec(cls, spec: dict) -> Scenario:
+        """Build a scenario from e.g. `{"type": "twist", "short_bp": -10, "long_bp": 10}`."""
+        kind = spec.get("type")
+        try:
+            if kind == "parallel":
+                return cls.parallel(float(spec["bp"]))
+            if kind == "twist":
+                return cls.twist(float(spec["short_bp"]), float(spec["long_bp"]))
+            if kind == "butterfly":
+                return cls.butterfly(
+                    float(spec["wings_bp"]), float(spec["belly_bp"]), float(spec.get("belly", 7.0))
+                )
+            if kind == "key_rate":
+                return cls.key_rate(float(spec["tenor"]), float(spec["bp"]))
+        except KeyError as e:
+            raise ValueError(f"{kind} scenario needs {e.args[0]!r}") from e
+        except TypeError as e:
+            raise ValueError(f"Invalid {kind} scenario: {e}") from e
+        raise ValueError(f"Scenario type must be one of {', '.join(SCENARIO_TYPES)}")
+
+
+class ScenarioEngine:
+    """Dirty prices per 100 nominal of a bond universe under zero curve shifts.
+
+    `discount` holds the base curve's discount factors at `cash_flows.times`.
+    """
+
+    def __init__(self, cash_flows: CashFlows, discount: np.ndarray, chunk_size: int = 64):
+        self.cash_flows = cash_flows
+        self.chunk_size = chunk_size  # Scenarios evaluated at a time, to bound memory.
+        self._present_values = cash_flows.amounts * discount
+        self.base_prices = self._present_values.sum(axis=1)
+        # Weight of each key tenor's shift in the shift at each flow, (n_bonds, n_flows, n_keys).
+        identity = np.eye(len(KEY_RATE_TENORS))
+        self._weights = np.stack(
+            [np.interp(cash_flows.times, KEY_RATE_TENORS, row) for row in identity], axis=-1
+        )
+
+    @classmethod
+    def from_svensson(
+        cls,
+        coupons: Sequence[float] | np.ndarray,
+        maturity_dates: Sequence[dt.date] | np.ndarray,
+        valuation_date: dt.date,
+        params: np.ndarray,
+    ) -> ScenarioEngine:
+        cash_flows = build_cash_flows(coupons, maturity_dates, valuation_date)
+        return cls(cash_flows, svensson.discount_factors(params, cash_flows.times))
+
+    def prices(self, shifts_bp: np.ndarray) -> np.ndarray:
+        """Dirty prices, `(n_bonds, n_scenarios)`, under rows of shifts at the key tenors."""
+        shifts = np.asarray(shifts_bp, dtype=float).reshape(-1, len(KEY_RATE_TENORS)) * 1e-4
+        prices = np.empty((self.cash_flows.n_bonds, len(shifts)))
+        for start in range(0, len(shifts), self.chunk_size):
+            chunk = shifts[start : start + self.chunk_size]
+            # Shift of each flow's zero rate under each scenario, (n_bonds, n_flows, n_chunk).
+            flow_shifts = self._weights @ chunk.T
+            factors = np.exp(-flow_shifts * self.cash_flows.times[..., None])
+            prices[:, start : start + len(chunk)] = np.einsum(
+                "bf,bfs->bs", self._present_values, factors
+            )
+        return prices
+
+    def pnl(self, scenarios: list[Scenario]) -> np.ndarray:
+        """Change in price per 100 nominal, `(n_bonds, n_scenarios)`."""
+        shifts = np.array([scenario.shifts_bp for scenario in scenarios], dtype=float)
+        return self.prices(shifts) - self.base_prices[:, None]
+
+    def key_rate_dv01s(self) -> np.ndarray:
+        """Fall in price per 100 nominal for a 1bp rise at each key tenor, `(n_bonds, n_keys)`.
+
+        Central differences of 1bp bumps; across tenors they sum to the parallel DV01.
+        """
+        identity = np.eye(len(KEY_RATE_TENORS))
+        prices = self.prices(np.vstack([identity, -identity]))
+        up, down = np.split(prices, 2, axis=1)
+        return (down - up) / 2.0
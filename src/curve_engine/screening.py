@@ -0,0 +1,245 @@
+"""Rich/cheap screening of bonds against their own history of residuals to the curve.
+
+Residuals of every bond on every date of the curve history are priced in one
+pass: each `(date, bond)` quote becomes a row of a single cash-flow matrix,
+discounted with that date's stored Svensson parameters, so no curve is refitted
+and no QuantLib object is built. A bond's z-score is its latest residual
+measured against the mean and standard deviation of its trailing residuals.
+
+Screens live in each process and are brought up to date when queried, pricing
+only the dates added to the curve history since the previous query.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.apps.yield_curves.models import BondMetric
+from src.curve_engine import svensson
+from src.curve_engine.cashflows import CashFlows, build_cash_flows
+from src.curve_engine.history import DATE_DTYPE, CurveHistory, check_country, get_curve_history
+from src.utils.logger import logger
+
+_screens: dict[str, RichCheapScreen] = {}
+_screens_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class Quotes:
+    """Clean prices of many bonds on many dates, one entry per `(date, bond)`."""
+
+    dates: np.ndarray  # datetime64[D]
+    isins: np.ndarray
+    clean_prices: np.ndarray
+    coupons: np.ndarray  # In percent.
+    maturity_dates: np.ndarray  # datetime64[D]
+
+    @classmethod
+    def load(
+        cls, country: str, start: dt.date, end: dt.date, isins: list[str] | None = None
+    ) -> Quotes:
+        """Quotes of the bonds curves are fitted to, or of `isins` among them, in one query."""
+        rows = list(
+            cls._bond_metrics(country, start, end, isins)
+            .order_by("date", "bond_id")
+            .values_list("date", "bond_id", "clean_price", "bond__coupon", "bond__maturity_date")
+        )
+        if not rows:
+            return cls.empty()
+        dates, isins, clean_prices, coupons, maturity_dates = zip(*rows, strict=True)
+        return cls(
+            dates=np.array(dates, dtype=DATE_DTYPE),
+            isins=np.array(isins),
+            clean_prices=np.array(clean_prices, dtype=float),
+            coupons=np.array(coupons, dtype=float),
+            maturity_dates=np.array(maturity_dates, dtype=DATE_DTYPE),
+        )
+
+    @classmethod
+    def count(
+        cls, country: str, start: dt.date, end: dt.date, isins: list[str] | None = None
+    ) -> int:
+        """How many quotes `load` would return, without fetching them."""
+        return cls._bond_metrics(country, start, end, isins).count()
+
+    @staticmethod
+    def _bond_metrics(country: str, start: dt.date, end: dt.date, isins: list[str] | None):
+        bond_metrics = BondMetric.curve_universe(country).filter(date__range=(start, end))
+        if isins is not None:
+            bond_metrics = bond_metrics.filter(bond_id__in=isins)
+        return bond_metrics
+
+    @classmethod
+    def empty(cls) -> Quotes:
+        return cls(
+            dates=np.empty(0, dtype=DATE_DTYPE),
+            isins=np.empty(0, dtype=str),
+            clean_prices=np.empty(0),
+            coupons=np.empty(0),
+            maturity_dates=np.empty(0, dtype=DATE_DTYPE),
+        )
+
+
+def quote_cash_flows(
+    curve_dates: np.ndarray, params: np.ndarray, quotes: Quotes
+) -> tuple[np.ndarray, CashFlows, np.ndarray]:
+    """Cash flows of the quotes with a curve on their date, and the curve's discount factors.
+
+    Returns the mask of those quotes, which excludes bonds that have matured, then their
+    cash flows and discount factors at the flow times, one row per quote in the mask.
+    """
+    rows = np.searchsorted(curve_dates, quotes.dates)
+    valid = rows < len(curve_dates)
+    valid[valid] = curve_dates[rows[valid]] == quotes.dates[valid]
+    valid &= quotes.maturity_dates > quotes.dates
+    cash_flows = build_cash_flows(
+        quotes.coupons[valid], quotes.maturity_dates[valid], quotes.dates[valid]
+    )
+    discount = svensson.discount_factors(params[rows[valid]][:, None, :], cash_flows.times)
+    return valid, cash_flows, discount
+
+
+def quote_residuals_bp(curve_dates: np.ndarray, params: np.ndarray, quotes: Quotes) -> np.ndarray:
+    """Market minus fitted yield, in bp, of each quote against the curve of its date.
+
+    NaN for quotes with no curve on their date and for bonds that have matured.
+    """
+    residuals = np.full(len(quotes.dates), np.nan)
+    valid, cash_flows, discount = quote_cash_flows(curve_dates, params, quotes)
+    if not valid.any():
+        return residuals
+    fitted_yields = cash_flows.yields(cash_flows.dirty_prices(discount))
+    market_yields = cash_flows.yields(quotes.clean_prices[valid] + cash_flows.accrued)
+    residuals[valid] = (market_yields - fitted_yields) * 1e4
+    return residuals
+
+
+@dataclass(frozen=True)
+class ZScores:
+    """Screen of the bonds quoted on `date`, one entry per bond."""
+
+    date: np.datetime64
+    isins: np.ndarray
+    residuals_bp: np.ndarray  # On `date`.
+    means_bp: np.ndarray  # Over the trailing window.
+    stds_bp: np.ndarray
+    zscores: np.ndarray  # NaN where the window holds too few residuals.
+    n_obs: np.ndarray
+
+
+class RichCheapScreen:
+    """Residuals of every bond of `country` on every date of the curve history.
+
+    Residuals are a `(n_dates, n_isins)` matrix, NaN where a bond was not quoted.
+    """
+
+    def __init__(self, country: str, history: CurveHistory, chunk_size: int = 250):
+        self.country = country
+        self.history = history
+        self.chunk_size = chunk_size
+        self.dates = np.empty(0, dtype=DATE_DTYPE)
+        self.isins: list[str] = []
+        self.residuals_bp = np.empty((0, 0), dtype=np.float32)
+        self._columns: dict[str, int] = {}
+        self._generation = -1
+        self._lock = threading.Lock()
+
+    def update(self) -> int:
+        """Price the dates added to the curve history since the last update; returns how many.
+
+        If dates already screened were refitted or filled in, the screen is rebuilt.
+        """
+        with self._lock:
+            # Read the generation first: a rewrite in between only costs another rebuild.
+            generation = self.history.generation(self.country)
+            curves = self.history.parameters(self.country)
+            n_dates = len(self.dates)
+            if generation != self._generation and n_dates:
+                logger.info(f"Curve history of {self.country} changed, rebuilding its screen")
+                self.dates = np.empty(0, dtype=DATE_DTYPE)
+                self.isins, self._columns = [], {}
+                self.residuals_bp = np.empty((0, 0), dtype=np.float32)
+                n_dates = 0
+            self._generation = generation
+
+            new_dates = curves.dates[n_dates:]
+            for start in range(0, len(new_dates), self.chunk_size):
+                chunk = new_dates[start : start + self.chunk_size]
+                params = np.asarray(curves.values[n_dates + start :][: len(chunk)])
+                self._extend(chunk, params)
+            return len(new_dates)
+
+    def _extend(self, dates: np.ndarray, params: np.ndarray) -> None:
+        quotes = Quotes.load(self.country, dates[0].item(), dates[-1].item())
+        residuals = quote_residuals_bp(dates, params, quotes)
+
+        for isin in dict.fromkeys(quotes.isins.tolist()):
+            if isin not in self._columns:
+                self._columns[isin] = len(self.isins)
+                self.isins.append(isin)
+        block = np.full((len(dates), len(self.isins)), np.nan, dtype=np.float32)
+        if len(quotes.dates):
+            columns = np.array([self._columns[isin] for isin in quotes.isins.tolist()])
+            block[np.searchsorted(dates, quotes.dates), columns] = residuals
+        existing = np.full((len(self.dates), len(self.isins)), np.nan, dtype=np.float32)
+        existing[:, : self.residuals_bp.shape[1]] = self.residuals_bp
+        self.residuals_bp = np.vstack([existing, block])
+        self.dates = np.concatenate([self.dates, dates])
+
+    def zscores(
+        self, date: dt.date | None = None, window: int = 250, min_obs: int = 20
+    ) -> ZScores | None:
+        """Z-scores of the bonds quoted on the last screened date on or before `date`.
+
+        Each bond's latest residual is compared with its residuals over the
+        `window` screened dates up to and including it. None if no date qualifies.
+        """
+        with self._lock:
+            end = len(self.dates)
+            if date is not None:
+                end = int(np.searchsorted(self.dates, np.datetime64(date, "D"), side="right"))
+            if not end:
+                return None
+            block = self.residuals_bp[max(end - window, 0) : end].astype(float)
+            latest = block[-1]
+            quoted = ~np.isnan(latest)
+            block, latest = block[:, quoted], latest[quoted]
+            n_obs = (~np.isnan(block)).sum(axis=0)
+            means = np.nanmean(block, axis=0)
+            stds = np.full(len(latest), np.nan)
+            enough = n_obs >= max(min_obs, 2)
+            stds[enough] = np.nanstd(block[:, enough], axis=0, ddof=1)
+            zscores = np.full(len(latest), np.nan)
+            scaled = enough & (stds > 0)
+            zscores[scaled] = (latest[scaled] - means[scaled]) / stds[scaled]
+            return ZScores(
+                date=self.dates[end - 1],
+                isins=np.array(self.isins)[quoted],
+                residuals_bp=latest,
+                means_bp=means,
+                stds_bp=stds,
+                zscores=zscores,
+                n_obs=n_obs,
+            )
+
+
+def get_screen(country: str) -> RichCheapScreen | None:
+    """This process's screen of `country`, up to date with the curve history.
+
+    None if the curve history is disabled. Raises ValueError if `country` is not a
+    two-letter code, so that screens are only cached for real countries.
+    """
+    check_country(country)
+    history = get_curve_history()
+    if history is None:
+        return None
+    with _screens_lock:
+        screen = _screens.get(country)
+        if screen is None or screen.history is not history:
+            screen = _screens[country] = RichCheapScreen(country, history)
+    screen.update()
+    return screen
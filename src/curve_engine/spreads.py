@@ -0,0 +1,115 @@
+"""Z-spreads and asset-swap spreads of many bonds to a fitted curve, all bonds at once.
+
+The z-spread is the parallel shift of the curve's continuously compounded zero
+rates that discounts a bond's cash flows to its market dirty price, solved by
+Newton's method on every bond in parallel. The par-par asset-swap spread is the
+curve's dirty price minus the market's, per unit of the annuity of the bond's
+remaining coupon periods discounted on the curve. Both are positive for bonds
+cheaper than the curve.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.apps.yield_curves.models import BondMetric
+from src.curve_engine import svensson
+from src.curve_engine.cashflows import FREQUENCY, CashFlows, build_cash_flows
+from src.curve_engine.screening import Quotes, quote_cash_flows
+
+
+@dataclass(frozen=True)
+class BondSpreads:
+    """One entry per bond, in basis points; NaN for bonds that have matured."""
+
+    zspreads_bp: np.ndarray
+    asset_swap_spreads_bp: np.ndarray
+
+
+def zspreads(
+    cash_flows: CashFlows,
+    discount: np.ndarray,
+    dirty_prices: np.ndarray,
+    tol: float = 1e-12,
+    max_iter: int = 50,
+) -> np.ndarray:
+    """Z-spreads (decimals) repricing `discount`ed flows to `dirty_prices`, all bonds at once."""
+    present_values = cash_flows.amounts * discount
+    dirty_prices = np.asarray(dirty_prices, dtype=float)
+    s = np.zeros(cash_flows.n_bonds)
+    for _ in range(max_iter):
+        shifted = present_values * np.exp(-s[:, None] * cash_flows.times)
+        price = shifted.sum(axis=1)
+        slope = -(shifted * cash_flows.times).sum(axis=1)
+        step = (price - dirty_prices) / slope
+        s = s - step
+        if np.all(np.abs(step) < tol):
+            break
+    return s
+
+
+def asset_swap_spreads(
+    cash_flows: CashFlows,
+    discount: np.ndarray,
+    dirty_prices: np.ndarray,
+    frequency: int = FREQUENCY,
+) -> np.ndarray:
+    """Par-par asset-swap spreads (decimals) of bonds at `dirty_prices` to the `discount` curve."""
+    # Every future payment date, coupon paying or not, ends one floating period.
+    annuity = np.where(cash_flows.times > 0, discount, 0.0).sum(axis=1) / frequency
+    curve_prices = cash_flows.dirty_prices(discount)
+    return (curve_prices - np.asarray(dirty_prices, dtype=float)) / 100.0 / annuity
+
+
+def bond_spreads(
+    bond_metrics: list[BondMetric],
+    valuation_date: dt.date,
+    discount: Callable[[np.ndarray], np.ndarray],
+) -> BondSpreads:
+    """Spreads of every bond in `bond_metrics` to `discount`, a vectorized discount function."""
+    live = np.array([metric.ttm > 0 for metric in bond_metrics], dtype=bool)
+    live_metrics = [metric for metric, is_live in zip(bond_metrics, live, strict=True) if is_live]
+    z, asw = (np.full(len(bond_metrics), np.nan) for _ in range(2))
+    if live_metrics:
+        cash_flows = build_cash_flows(
+            [float(metric.bond.coupon) for metric in live_metrics],
+            [metric.bond.maturity_date for metric in live_metrics],
+            valuation_date,
+        )
+        clean_prices = np.array([float(metric.clean_price) for metric in live_metrics])
+        z[live], asw[live] = _spreads(cash_flows, discount(cash_flows.times), clean_prices)
+    return BondSpreads(zspreads_bp=z * 1e4, asset_swap_spreads_bp=asw * 1e4)
+
+
+def svensson_spreads(
+    bond_metrics: list[BondMetric], valuation_date: dt.date, params: np.ndarray
+) -> BondSpreads:
+    return bond_spreads(
+        bond_metrics, valuation_date, lambda times: svensson.discount_factors(params, times)
+    )
+
+
+def quote_spreads(curve_dates: np.ndarray, params: np.ndarray, quotes: Quotes) -> BondSpreads:
+    """Spreads of each quote to the stored curve of its date, for any number of dates at once.
+
+    NaN for quotes with no curve on their date and for bonds that have matured.
+    """
+    z, asw = (np.full(len(quotes.dates), np.nan) for _ in range(2))
+    valid, cash_flows, discount = quote_cash_flows(curve_dates, params, quotes)
+    if valid.any():
+        z[valid], asw[valid] = _spreads(cash_flows, discount, quotes.clean_prices[valid])
+    return BondSpreads(zspreads_bp=z * 1e4, asset_swap_spreads_bp=asw * 1e4)
+
+
+def _spreads(
+    cash_flows: CashFlows, discount: np.ndarray, clean_prices: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    dirty_prices = clean_prices + cash_flows.accrued
+    return (
+        zspreads(cash_flows, discount, dirty_prices),
+        asset_swap_spreads(cash_flows, discount, dirty_prices),
+    )
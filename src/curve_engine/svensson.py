@@ -0,0 +1,54 @@
+"""Vectorized Nelson-Siegel-Svensson curve evaluation.
+
+Parameters follow QuantLib's `SvenssonFitting` solution vector,
+`(beta0, beta1, beta2, beta3, kappa1, kappa2)` with `kappa = 1 / tau`, so a
+fitted `FittedBondDiscountCurve` can be evaluated on whole grids in NumPy
+without QuantLib calls.
+
+A single parameter vector of shape `(6,)` broadcasts against any array of
+times. For several curves at once pass parameters of shape `(..., 6)` and
+times broadcastable against `params[..., 0]`, e.g. `params[:, None, :]`
+against times of shape `(n_curves, n_times)`.
+"""
+
+import numpy as np
+
+N_PARAMS = 6
+
+# QuantLib adds QL_EPSILON to kappa and t to avoid dividing by zero at t = 0.
+_EPS = np.finfo(float).eps
+
+
+def _unpack(params: np.ndarray) -> tuple[np.ndarray, ...]:
+    params = np.asarray(params, dtype=float)
+    if params.shape[-1] != N_PARAMS:
+        raise ValueError(f"Expected {N_PARAMS} Svensson parameters, got {params.shape[-1]}")
+    return tuple(params[..., i] for i in range(N_PARAMS))
+
+
+def zero_rates(params: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """Continuously compounded zero rates at times `t` (in years)."""
+    b0, b1, b2, b3, k1, k2 = _unpack(params)
+    t = np.asarray(t, dtype=float)
+    exp1 = np.exp(-k1 * t)
+    exp2 = np.exp(-k2 * t)
+    return (
+        b0
+        + (b1 + b2) * (1.0 - exp1) / ((k1 + _EPS) * (t + _EPS))
+        - b2 * exp1
+        + b3 * ((1.0 - exp2) / ((k2 + _EPS) * (t + _EPS)) - exp2)
+    )
+
+
+def discount_factors(params: np.ndarray, t: np.ndarray) -> np.ndarray:
+    t = np.asarray(t, dtype=float)
+    return np.exp(-zero_rates(params, t) * t)
+
+
+def forward_rates(params: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """Continuously compounded instantaneous forward rates at times `t` (in years)."""
+    b0, b1, b2, b3, k1, k2 = _unpack(params)
+    t = np.asarray(t, dtype=float)
+    exp1 = np.exp(-k1 * t)
+    exp2 = np.exp(-k2 * t)
+    return b0 + b1 * exp1 + b2 * k1 * t * exp1 + b3 * k2 * t * exp2
@@ -62,7 +62,7 @@ export class ChartManager {
   async loadZeroCurveData(scatterId) {
     try {
       const response = await fetch(
-        `/yield-curves/analysis/${window.ANALYSIS_ID}/scatter/${scatterId}/zero-curve/`,
+        `/yield-curves/analysis/${window.ANALYSIS_ID}/scatter/${scatterId}/zero-curve/?grid=adaptive&points=80`,
         {
           method: "GET",
           headers: {
@@ -112,6 +112,8 @@ export class ChartManager {
         coupon: bond.coupon,
         maturityDate: bond.maturity_date,
         description: bond.description,
+        fittedYield: bond.fitted_yield,
+        residualBp: bond.residual_bp,
       }));
 
       datasets.push({
@@ -197,14 +199,23 @@ export class ChartManager {
                 const point = context.raw;
                 if (point.isin) {
                   // Bond scatter point
-                  return [
+                  const lines = [
                     `Dataset: ${context.dataset.label}`,
                     `TTM: ${point.x} years`,
                     `Yield: ${point.y}%`,
+                  ];
+                  if (point.residualBp != null) {
+                    lines.push(
+                      `Fitted Yield: ${point.fittedYield}%`,
+                      `Residual: ${point.residualBp} bp`,
+                    );
+                  }
+                  lines.push(
                     `Coupon: ${point.coupon}%`,
                     `Maturity: ${point.maturityDate}`,
                     `Description: ${point.description.substring(0, 50)}...`,
-                  ];
+                  );
+                  return lines;
                 } else {
                   // Zero curve point
                   return [
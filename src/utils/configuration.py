@@ -8,12 +8,18 @@ import yaml
 
 
 class Configuration:
+    """YAML configuration with `CONFIG__` environment overrides, read on first access."""
+
     ENV_VAR_PREFIX = "CONFIG__"
 
     def __init__(self):
         self._config = None
         self._config_path = None
-        self._load_config()
+
+    def _ensure_loaded(self) -> dict[str, Any]:
+        if self._config is None:
+            self._load_config()
+        return self._config
 
     def _find_config_path(self) -> Path:
         config_path_env = os.getenv("CONFIG_PATH")
@@ -57,7 +63,7 @@ class Configuration:
 
     def get(self, key: str, default: Any = None) -> Any:
         keys = key.split(".")
-        current = self._config
+        current = self._ensure_loaded()
 
         try:
             for k in keys:
@@ -1,41 +1,260 @@
 """Data utils."""
 
+import contextlib
+import queue
+import threading
+import time
 from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
 from pydantic import BaseModel
 
 from src.utils.logger import logger
+from src.utils.metrics import PipelineMetrics, StageMetrics
+
+
+class Instrumented:
+    """Gives a pipeline stage a `metrics` record.
+
+    The pipeline runners time every call to the stage. Subclasses add what only
+    they can know, e.g. `self.metrics.rows_out += len(data)` or
+    `self.metrics.bytes_downloaded += len(response.content)`.
+    """
+
+    stage_name: str = "stage"
 
+    @property
+    def metrics(self) -> StageMetrics:
+        # Created lazily so subclasses need not call super().__init__().
+        if "_metrics" not in self.__dict__:
+            self._metrics = StageMetrics(stage=self.stage_name)
+        return self._metrics
+
+
+class Extractor(Instrumented, ABC):
+    stage_name = "extract"
+    # Set by the scheduler to a RateLimiter when the source has a request rate limit.
+    rate_limiter = None
 
-class Extractor(ABC):
     class Extracted(BaseModel): ...
 
     @abstractmethod
     def extract(self) -> Extracted: ...
 
+    def throttle(self) -> None:
+        """Call before each request to the source to respect its rate limit."""
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+
+
+class StreamingExtractor(Extractor):
+    """Extractor which can also yield its output in independent batches.
+
+    Each batch is a complete `Extracted` instance (e.g. one sheet or one month
+    of data), so transformers and loaders can process it unchanged.
+    """
+
+    @abstractmethod
+    def extract_batches(self) -> Iterator[Extractor.Extracted]: ...
+
+
+class Transformer(Instrumented, ABC):
+    stage_name = "transform"
 
-class Transformer(ABC):
     class Transformed(BaseModel): ...
 
     @abstractmethod
     def transform(self, extracted: Extractor.Extracted) -> Transformed: ...
 
 
-class Loader(ABC):
+class Loader(Instrumented, ABC):
+    stage_name = "load"
+
     @abstractmethod
     def load(self, transformed: Transformer.Transformed) -> None: ...
 
 
+def _report(
+    name: str,
+    stages: list[Instrumented],
+    start: float,
+    metrics_path: str | Path | None,
+) -> PipelineMetrics:
+    metrics = PipelineMetrics(
+        pipeline=name,
+        stages=[stage.metrics for stage in stages],
+        wall_time_s=time.perf_counter() - start,
+    )
+    metrics.log()
+    if metrics_path is not None:
+        metrics.write(metrics_path)
+    return metrics
+
+
 def run_pipeline(
     extractor: Extractor,
     transformer: Transformer,
     loader: Loader,
-):
+    name: str = "pipeline",
+    metrics_path: str | Path | None = None,
+) -> PipelineMetrics:
+    start = time.perf_counter()
     logger.info("Starting data pipeline")
     logger.info("Extracting data...")
-    extracted = extractor.extract()
+    with extractor.metrics.measure():
+        extracted = extractor.extract()
 
     logger.info("Transforming data...")
-    transformed = transformer.transform(extracted)
+    with transformer.metrics.measure():
+        transformed = transformer.transform(extracted)
 
     logger.info("Loading data...")
-    loader.load(transformed)
+    with loader.metrics.measure():
+        loader.load(transformed)
+
+    return _report(name, [extractor, transformer, loader], start, metrics_path)
+
+
+_END_OF_STREAM = object()
+
+
+class _Stage(threading.Thread):
+    """Worker thread feeding the results of `func` over its input into a bounded queue."""
+
+    def __init__(
+        self,
+        name: str,
+        items: Callable[[], Iterable[Any]],
+        func: Callable[[Any], Any],
+        output: queue.Queue,
+        stop: threading.Event,
+        metrics: StageMetrics,
+        measure_items: bool = False,
+    ):
+        super().__init__(name=name, daemon=True)
+        self.items = items
+        self.func = func
+        self.output = output
+        self.stop = stop
+        self.metrics = metrics
+        # Whether producing the input (rather than applying `func`) is the stage's work.
+        self.measure_items = measure_items
+        self.error: BaseException | None = None
+
+    def run(self) -> None:
+        try:
+            items = iter(self.items())
+            while not self.stop.is_set():
+                with self._measure(self.measure_items):
+                    item = next(items, _END_OF_STREAM)
+                if item is _END_OF_STREAM:
+                    return
+                with self._measure(not self.measure_items):
+                    result = self.func(item)
+                self._put(result)
+        except BaseException as e:
+            self.error = e
+            self.stop.set()
+        finally:
+            self._put(_END_OF_STREAM)
+
+    def _measure(self, enabled: bool):
+        return self.metrics.measure() if enabled else contextlib.nullcontext()
+
+    def _put(self, item: Any) -> None:
+        # Block while the downstream stage is busy, but give up once the pipeline is stopping.
+        while True:
+            try:
+                self.output.put(item, timeout=0.1)
+            except queue.Full:
+                if self.stop.is_set():
+                    return
+            else:
+                return
+
+
+def _drain(source: queue.Queue, stop: threading.Event) -> Iterator[Any]:
+    while True:
+        try:
+            item = source.get(timeout=0.1)
+        except queue.Empty:
+            if stop.is_set():
+                return
+            continue
+        if item is _END_OF_STREAM or stop.is_set():
+            return
+        yield item
+
+
+def run_streaming_pipeline(
+    extractor: StreamingExtractor,
+    transformer: Transformer,
+    loader: Loader,
+    max_queue_size: int = 2,
+    name: str = "pipeline",
+    metrics_path: str | Path | None = None,
+) -> PipelineMetrics:
+    """Run the pipeline batch by batch with the three stages overlapping.
+
+    Extraction and transformation run in worker threads connected by bounded
+    queues, so at most `max_queue_size` batches are held between any two stages
+    and memory does not grow with the number of batches. Loading runs in the
+    calling thread and commits each batch as soon as it is transformed.
+
+    Returns the per-stage metrics; the load stage's `calls` is the number of
+    batches loaded. The first error raised by any stage stops the pipeline and
+    is re-raised here.
+    """
+    if max_queue_size < 1:
+        raise ValueError("max_queue_size must be at least 1")
+
+    start = time.perf_counter()
+    logger.info("Starting streaming data pipeline")
+    stop = threading.Event()
+    extracted: queue.Queue = queue.Queue(maxsize=max_queue_size)
+    transformed: queue.Queue = queue.Queue(maxsize=max_queue_size)
+
+    stages = [
+        _Stage(
+            "extract",
+            extractor.extract_batches,
+            lambda batch: batch,
+            extracted,
+            stop,
+            extractor.metrics,
+            measure_items=True,
+        ),
+        _Stage(
+            "transform",
+            lambda: _drain(extracted, stop),
+            transformer.transform,
+            transformed,
+            stop,
+            transformer.metrics,
+        ),
+    ]
+    for stage in stages:
+        stage.start()
+
+    n_batches = 0
+    try:
+        for batch in _drain(transformed, stop):
+            with loader.metrics.measure():
+                loader.load(batch)
+            n_batches += 1
+            logger.info(f"Loaded batch {n_batches}")
+    except BaseException:
+        stop.set()
+        raise
+    finally:
+        for stage in stages:
+            stage.join()
+
+    for stage in stages:
+        if stage.error is not None:
+            raise stage.error
+
+    logger.info(f"Streaming pipeline finished after {n_batches} batches")
+    return _report(name, [extractor, transformer, loader], start, metrics_path)
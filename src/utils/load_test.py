@@ -0,0 +1,234 @@
+"""HTTP load testing utils.
+
+Virtual users log in to a running server, create an analysis with a base
+scatter, and then repeatedly add a scatter, fetch scatter data for it and the
+base scatter, fetch its zero curve and the date range, and delete it again.
+Latencies are recorded per endpoint, along with the SQL query count that
+`ProfilingMiddleware` reports in the `Server-Timing` header.
+"""
+
+import datetime as dt
+import re
+import threading
+import time
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+import numpy as np
+import requests
+from django.urls import resolve, reverse
+
+# Maximum SQL queries per request, including session and user lookups. Scatter
+# data is measured with two scatters selected.
+QUERY_BUDGETS = {
+    "scatter_add": 5,
+    "scatter_data": 6,
+    "zero_curve": 5,
+    "date_range": 3,
+    "scatter_delete": 6,
+}
+
+_SQL_COUNT = re.compile(r'(?:^|,\s*)sql;[^,]*desc="(\d+) queries"')
+
+
+def parse_sql_count(server_timing: str | None) -> int | None:
+    if not server_timing:
+        return None
+    match = _SQL_COUNT.search(server_timing)
+    return int(match.group(1)) if match else None
+
+
+@dataclass(frozen=True)
+class LoadTestConfig:
+    base_url: str
+    usernames: Sequence[str]
+    password: str
+    dates: Sequence[dt.date]  # Dates with bond data, at least two.
+    country: str = "DE"
+    iterations: int = 20  # Per user.
+    timeout_s: float = 60.0
+
+
+@dataclass
+class EndpointStats:
+    endpoint: str
+    latencies_s: list[float] = field(default_factory=list)
+    errors: int = 0
+    max_queries: int | None = None
+    unmeasured: int = 0  # Responses without a query count in `Server-Timing`.
+
+    def record(self, latency_s: float, ok: bool, queries: int | None) -> None:
+        self.latencies_s.append(latency_s)
+        if not ok:
+            self.errors += 1
+        if queries is None:
+            self.unmeasured += 1
+        else:
+            self.max_queries = max(queries, self.max_queries or 0)
+
+    def summary(self, duration_s: float) -> dict:
+        p50, p95, p99 = (
+            np.percentile(self.latencies_s, [50, 95, 99]) if self.latencies_s else (np.nan,) * 3
+        )
+        return {
+            "endpoint": self.endpoint,
+            "requests": len(self.latencies_s),
+            "errors": self.errors,
+            "throughput_rps": len(self.latencies_s) / duration_s if duration_s else 0.0,
+            "p50_ms": float(p50) * 1e3,
+            "p95_ms": float(p95) * 1e3,
+            "p99_ms": float(p99) * 1e3,
+            "max_queries": self.max_queries,
+        }
+
+
+@dataclass
+class LoadTestResult:
+    duration_s: float
+    endpoints: dict[str, EndpointStats]
+
+    def summaries(self) -> list[dict]:
+        return [stats.summary(self.duration_s) for stats in self.endpoints.values()]
+
+    @property
+    def errors(self) -> int:
+        return sum(stats.errors for stats in self.endpoints.values())
+
+    def budget_violations(self, budgets: dict[str, int] = QUERY_BUDGETS) -> list[str]:
+        """Endpoints over their query budget, or whose query count could not be read.
+
+        A count is missing when the server doesn't send `Server-Timing`, e.g.
+        with `profiling.enabled` off, which would otherwise pass unchecked.
+        """
+        violations = []
+        for name, stats in self.endpoints.items():
+            budget = budgets.get(name)
+            if budget is None:
+                continue
+            if stats.unmeasured:
+                violations.append(
+                    f"{name}: {stats.unmeasured} responses without a Server-Timing query count"
+                )
+            if stats.max_queries is not None and stats.max_queries > budget:
+                violations.append(f"{name}: {stats.max_queries} queries > budget {budget}")
+        return violations
+
+
+class LoadTestClient:
+    """One logged in virtual user, sending CSRF protected JSON requests."""
+
+    def __init__(self, base_url: str, timeout_s: float = 60.0):
+        self.base_url = base_url.rstrip("/")
+        self.timeout_s = timeout_s
+        self.session = requests.Session()
+
+    def login(self, username: str, password: str) -> None:
+        url = self.base_url + reverse("accounts:login")
+        self.session.get(url, timeout=self.timeout_s).raise_for_status()
+        response = self.session.post(
+            url,
+            data={
+                "username": username,
+                "password": password,
+                "csrfmiddlewaretoken": self.session.cookies["csrftoken"],
+            },
+            headers={"Referer": url},
+            timeout=self.timeout_s,
+        )
+        response.raise_for_status()
+        if "sessionid" not in self.session.cookies:
+            raise RuntimeError(f"Login failed for {username}")
+
+    def request(self, method: str, path: str, json: dict | None = None) -> requests.Response:
+        return self.session.request(
+            method,
+            self.base_url + path,
+            json=json,
+            headers={
+                "X-CSRFToken": self.session.cookies.get("csrftoken", ""),
+                "Referer": self.base_url + "/",
+            },
+            timeout=self.timeout_s,
+        )
+
+
+class LoadTest:
+    def __init__(self, config: LoadTestConfig):
+        if len(config.dates) < 2:
+            raise ValueError("Need bond data on at least two dates")
+        self.config = config
+        self._lock = threading.Lock()
+        self._stats = {name: EndpointStats(name) for name in QUERY_BUDGETS}
+
+    def run(self) -> LoadTestResult:
+        clients = [self._setup_user(username) for username in self.config.usernames]
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(clients)) as executor:
+            for future in [executor.submit(self._run_user, *client) for client in clients]:
+                future.result()
+        return LoadTestResult(time.perf_counter() - start, self._stats)
+
+    def _timed(
+        self, endpoint: str, client: LoadTestClient, method: str, path: str, json=None
+    ) -> requests.Response:
+        start = time.perf_counter()
+        response = client.request(method, path, json=json)
+        latency_s = time.perf_counter() - start
+        with self._lock:
+            self._stats[endpoint].record(
+                latency_s, response.ok, parse_sql_count(response.headers.get("Server-Timing"))
+            )
+        return response
+
+    def _add_scatter(self, client: LoadTestClient, analysis_id: int, date: dt.date) -> int | None:
+        response = self._timed(
+            "scatter_add",
+            client,
+            "POST",
+            reverse("yield_curves:add_bond_scatter", args=[analysis_id]),
+            {"country": self.config.country, "date": date.isoformat()},
+        )
+        return response.json()["scatter"]["id"] if response.ok else None
+
+    def _setup_user(self, username: str) -> tuple[LoadTestClient, int, int]:
+        client = LoadTestClient(self.config.base_url, self.config.timeout_s)
+        client.login(username, self.config.password)
+        response = client.request(
+            "POST",
+            reverse("yield_curves:create_analysis"),
+            {"name": f"Load test {dt.datetime.now():%Y-%m-%d %H:%M:%S}"},
+        )
+        response.raise_for_status()
+        analysis_id = resolve(response.json()["redirect_url"]).kwargs["analysis_id"]
+        base_scatter_id = self._add_scatter(client, analysis_id, self.config.dates[0])
+        if base_scatter_id is None:
+            raise RuntimeError(f"Failed to add base scatter for {username}")
+        return client, analysis_id, base_scatter_id
+
+    def _run_user(self, client: LoadTestClient, analysis_id: int, base_scatter_id: int) -> None:
+        other_dates = self.config.dates[1:]
+        for i in range(self.config.iterations):
+            scatter_id = self._add_scatter(client, analysis_id, other_dates[i % len(other_dates)])
+            if scatter_id is None:
+                continue
+            self._timed(
+                "scatter_data",
+                client,
+                "POST",
+                reverse("yield_curves:get_selected_scatters_data", args=[analysis_id]),
+                {"scatter_ids": [base_scatter_id, scatter_id]},
+            )
+            self._timed(
+                "zero_curve",
+                client,
+                "GET",
+                reverse("yield_curves:get_zero_curve_data", args=[analysis_id, scatter_id]),
+            )
+            self._timed("date_range", client, "GET", reverse("yield_curves:get_bond_date_range"))
+            self._timed(
+                "scatter_delete",
+                client,
+                "DELETE",
+                reverse("yield_curves:delete_bond_scatter", args=[analysis_id, scatter_id]),
+            )
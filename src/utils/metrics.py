@@ -0,0 +1,141 @@
+"""Metrics utils."""
+
+import json
+import os
+import resource
+import sys
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from src.utils.logger import logger
+
+
+def peak_rss_bytes() -> int:
+    """Peak resident set size of this process so far."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def format_prometheus(
+    name: str,
+    help_text: str,
+    samples: list[tuple[dict[str, str], float]],
+    metric_type: str = "gauge",
+) -> str:
+    """Render one metric family in the Prometheus text exposition format."""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}"]
+    for labels, value in samples:
+        label_str = ",".join(f'{k}="{v}"' for k, v in labels.items())
+        lines.append(f"{name}{{{label_str}}} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def write_atomic(path: str | Path, content: str) -> None:
+    """Write a file so that readers (e.g. a scraper) never see it half written."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_text(content)
+    os.replace(tmp_path, path)
+
+
+@dataclass
+class StageMetrics:
+    """Counters for one pipeline stage, accumulated over all of its calls."""
+
+    stage: str
+    calls: int = 0
+    wall_time_s: float = 0.0
+    cpu_time_s: float = 0.0
+    rows_in: int = 0
+    rows_out: int = 0
+    bytes_downloaded: int = 0
+    peak_rss_bytes: int = 0
+
+    @contextmanager
+    def measure(self) -> Iterator["StageMetrics"]:
+        # Thread CPU time, so stages overlapping in streaming mode are attributed correctly.
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield self
+        finally:
+            self.calls += 1
+            self.wall_time_s += time.perf_counter() - wall_start
+            self.cpu_time_s += time.thread_time() - cpu_start
+            self.peak_rss_bytes = max(self.peak_rss_bytes, peak_rss_bytes())
+
+
+# (field, metric name suffix, Prometheus type, help text) for each exported stage counter.
+_EXPORTED_FIELDS = [
+    ("calls", "calls_total", "counter", "Number of times the stage ran."),
+    ("wall_time_s", "wall_seconds", "gauge", "Wall-clock time spent in the stage."),
+    ("cpu_time_s", "cpu_seconds", "gauge", "CPU time spent in the stage."),
+    ("rows_in", "rows_in_total", "counter", "Rows received by the stage."),
+    ("rows_out", "rows_out_total", "counter", "Rows produced by the stage."),
+    ("bytes_downloaded", "downloaded_bytes_total", "counter", "Bytes downloaded by the stage."),
+    (
+        "peak_rss_bytes",
+        "peak_rss_bytes",
+        "gauge",
+        "Peak process RSS observed at the end of the stage.",
+    ),
+]
+
+
+@dataclass
+class PipelineMetrics:
+    pipeline: str
+    stages: list[StageMetrics] = field(default_factory=list)
+    wall_time_s: float = 0.0
+
+    def log(self) -> None:
+        """Emit one structured log record per stage (metrics under the `metrics` extra)."""
+        for stage in self.stages:
+            logger.info(
+                f"Pipeline {self.pipeline} stage {stage.stage}: "
+                f"{stage.wall_time_s:.3f}s wall, {stage.cpu_time_s:.3f}s cpu, "
+                f"{stage.rows_in} rows in, {stage.rows_out} rows out, "
+                f"{stage.bytes_downloaded} bytes downloaded, "
+                f"{stage.peak_rss_bytes / 2**20:.1f} MiB peak RSS",
+                extra={"metrics": {"pipeline": self.pipeline, **asdict(stage)}},
+            )
+        logger.info(
+            f"Pipeline {self.pipeline} finished in {self.wall_time_s:.3f}s",
+            extra={"metrics": {"pipeline": self.pipeline, "wall_time_s": self.wall_time_s}},
+        )
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), indent=2)
+
+    def to_prometheus(self) -> str:
+        families = [
+            format_prometheus(
+                f"pipeline_stage_{suffix}",
+                help_text,
+                [
+                    ({"pipeline": self.pipeline, "stage": stage.stage}, getattr(stage, attr))
+                    for stage in self.stages
+                ],
+                metric_type,
+            )
+            for attr, suffix, metric_type, help_text in _EXPORTED_FIELDS
+        ]
+        families.append(
+            format_prometheus(
+                "pipeline_wall_seconds",
+                "Wall-clock time of the whole pipeline run.",
+                [({"pipeline": self.pipeline}, self.wall_time_s)],
+            )
+        )
+        return "".join(families)
+
+    def write(self, path: str | Path) -> None:
+        """Write the metrics as JSON (`.json`) or Prometheus text (any other suffix)."""
+        content = self.to_json() if Path(path).suffix == ".json" else self.to_prometheus()
+        write_atomic(path, content)
+        logger.info(f"Wrote pipeline metrics to {path}")
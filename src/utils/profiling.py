@@ -0,0 +1,82 @@
+"""Request profiling utils.
+
+Code marks phases with `timed("phase")`; while a `RequestProfile` is active
+(see `ProfilingMiddleware`) their durations are accumulated on it, otherwise
+`timed` does nothing beyond one context variable lookup.
+"""
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+_current_profile: ContextVar["RequestProfile | None"] = ContextVar("current_profile", default=None)
+
+
+@dataclass
+class RequestProfile:
+    phases: dict[str, float] = field(default_factory=dict)  # Seconds, in first-seen order.
+    sql_count: int = 0
+    sql_time_s: float = 0.0
+
+    def add(self, phase: str, duration_s: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + duration_s
+
+    def record_query(self, execute, sql, params, many, context):
+        """Database execute wrapper counting and timing every query."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_count += 1
+            self.sql_time_s += time.perf_counter() - start
+
+    def server_timing(self, total_s: float | None = None) -> str:
+        """`Server-Timing` header value, with durations in milliseconds."""
+        entries = [
+            f'sql;dur={self.sql_time_s * 1e3:.2f};desc="{self.sql_count} queries"',
+            *(f"{phase};dur={duration_s * 1e3:.2f}" for phase, duration_s in self.phases.items()),
+        ]
+        if total_s is not None:
+            entries.append(f"total;dur={total_s * 1e3:.2f}")
+        return ", ".join(entries)
+
+
+def current_profile() -> RequestProfile | None:
+    return _current_profile.get()
+
+
+def record_query(execute, sql, params, many, context):
+    """Database execute wrapper recording queries on the current profile, if any.
+
+    Installed once per connection; since profiles live in a context variable,
+    this also sees queries that async ORM calls run in a worker thread.
+    """
+    profile = _current_profile.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    return profile.record_query(execute, sql, params, many, context)
+
+
+@contextmanager
+def profiling(profile: RequestProfile) -> Iterator[RequestProfile]:
+    """Make `profile` the target of `timed` phases in this context."""
+    token = _current_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _current_profile.reset(token)
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    profile = _current_profile.get()
+    if profile is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add(phase, time.perf_counter() - start)
@@ -0,0 +1,50 @@
+"""Lazy QuantLib access.
+
+Importing QuantLib takes tens of milliseconds and a fair amount of memory, so
+modules that only need it to calibrate curves go through `quantlib()` rather
+than importing it at module load. Calendars and day counters are built once
+per process and shared.
+"""
+
+from __future__ import annotations
+
+from functools import cache
+from types import ModuleType
+
+# Settlement calendar per issuer country. Add an entry when adding a sovereign source.
+QL_CALENDARS = {
+    "DE": lambda ql: ql.Germany(ql.Germany.Settlement),
+    "FR": lambda ql: ql.France(ql.France.Settlement),
+    "IT": lambda ql: ql.Italy(ql.Italy.Settlement),
+    "GB": lambda ql: ql.UnitedKingdom(ql.UnitedKingdom.Settlement),
+    "US": lambda ql: ql.UnitedStates(ql.UnitedStates.GovernmentBond),
+}
+
+
+@cache
+def quantlib() -> ModuleType:
+    import QuantLib
+
+    return QuantLib
+
+
+@cache
+def calendar(country: str):
+    try:
+        factory = QL_CALENDARS[country.upper()]
+    except KeyError:
+        raise ValueError(f"Unsupported country: {country}") from None
+    return factory(quantlib())
+
+
+@cache
+def bond_day_count():
+    ql = quantlib()
+    return ql.ActualActual(ql.ActualActual.Bond)
+
+
+def warm_up() -> None:
+    """Import QuantLib and build the shared calendars and day counters, e.g. before forking."""
+    for country in QL_CALENDARS:
+        calendar(country)
+    bond_day_count()
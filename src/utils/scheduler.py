@@ -0,0 +1,176 @@
+"""Ingest pipeline registry and scheduler."""
+
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+from src.utils.data import (
+    Extractor,
+    Loader,
+    StreamingExtractor,
+    Transformer,
+    run_pipeline,
+    run_streaming_pipeline,
+)
+from src.utils.logger import logger
+from src.utils.metrics import PipelineMetrics
+
+PipelineFactory = Callable[..., tuple[Extractor, Transformer, Loader]]
+
+
+class RateLimiter:
+    """Thread-safe token bucket allowing `rate` acquisitions per second on average."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait = (1.0 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+@dataclass(frozen=True)
+class PipelineSpec:
+    name: str
+    country: str
+    factory: PipelineFactory
+    rate_limit: float | None = None  # Requests per second against the source.
+    stream: bool = False
+
+
+@dataclass(frozen=True)
+class PipelineResult:
+    name: str
+    success: bool
+    duration_s: float
+    metrics: PipelineMetrics | None = None
+    error: str | None = None
+
+
+_registry: dict[str, PipelineSpec] = {}
+
+
+def register_pipeline(
+    name: str,
+    country: str,
+    rate_limit: float | None = None,
+    stream: bool = False,
+) -> Callable[[PipelineFactory], PipelineFactory]:
+    """Register a factory returning a source's (extractor, transformer, loader)."""
+
+    def decorator(factory: PipelineFactory) -> PipelineFactory:
+        if name in _registry:
+            raise ValueError(f"Pipeline already registered: {name}")
+        _registry[name] = PipelineSpec(
+            name=name,
+            country=country,
+            factory=factory,
+            rate_limit=rate_limit,
+            stream=stream,
+        )
+        return factory
+
+    return decorator
+
+
+def unregister_pipeline(name: str) -> None:
+    _registry.pop(name, None)
+
+
+def registered_pipelines() -> dict[str, PipelineSpec]:
+    return dict(_registry)
+
+
+def _run_one(
+    spec: PipelineSpec,
+    options: dict[str, Any],
+    metrics_dir: str | None,
+    on_thread_exit: Callable[[], None] | None,
+) -> PipelineResult:
+    start = time.perf_counter()
+    try:
+        extractor, transformer, loader = spec.factory(**options)
+        if spec.rate_limit is not None:
+            extractor.rate_limiter = RateLimiter(spec.rate_limit)
+
+        metrics_path = f"{metrics_dir}/{spec.name}.prom" if metrics_dir else None
+        if spec.stream and isinstance(extractor, StreamingExtractor):
+            metrics = run_streaming_pipeline(
+                extractor, transformer, loader, name=spec.name, metrics_path=metrics_path
+            )
+        else:
+            metrics = run_pipeline(
+                extractor, transformer, loader, name=spec.name, metrics_path=metrics_path
+            )
+    except Exception as e:
+        # Isolate failures: one broken source must not stop the others.
+        logger.exception(f"Pipeline {spec.name} failed")
+        return PipelineResult(
+            name=spec.name,
+            success=False,
+            duration_s=time.perf_counter() - start,
+            error=f"{type(e).__name__}: {e}",
+        )
+    finally:
+        if on_thread_exit is not None:
+            on_thread_exit()
+
+    return PipelineResult(
+        name=spec.name,
+        success=True,
+        duration_s=time.perf_counter() - start,
+        metrics=metrics,
+    )
+
+
+def run_pipelines(
+    names: list[str] | None = None,
+    max_concurrency: int = 4,
+    options: dict[str, Any] | None = None,
+    metrics_dir: str | None = None,
+    on_thread_exit: Callable[[], None] | None = None,
+) -> list[PipelineResult]:
+    """Run registered pipelines concurrently, at most `max_concurrency` at a time.
+
+    `options` are passed to every pipeline factory. `on_thread_exit` runs in the
+    worker thread after each pipeline, e.g. to close its database connection.
+    Results are returned in the order of `names`; a failing pipeline is
+    reported in its result rather than raised.
+    """
+    if names is None:
+        names = list(_registry)
+    unknown = [name for name in names if name not in _registry]
+    if unknown:
+        raise ValueError(f"Unknown pipelines: {', '.join(unknown)}")
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+
+    logger.info(f"Running {len(names)} pipelines with concurrency {max_concurrency}")
+    with ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="ingest") as pool:
+        futures = [
+            pool.submit(_run_one, _registry[name], options or {}, metrics_dir, on_thread_exit)
+            for name in names
+        ]
+        results = [future.result() for future in futures]
+
+    for result in results:
+        status = "succeeded" if result.success else f"failed ({result.error})"
+        logger.info(f"Pipeline {result.name} {status} in {result.duration_s:.1f}s")
+    return results
@@ -0,0 +1,219 @@
+"""Synthetic bond market data.
+
+Generates Bund-like universes priced off a known Svensson curve, for load
+tests and benchmarks at production scale without network access. Daily
+frames use the same columns as `BundesbankDataTransformer`, and workbooks
+use the Bundesbank layout so they can be fed through the ingest pipeline.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import string
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.constants import DAYS_IN_YEAR
+from src.curve_engine import svensson
+from src.curve_engine.cashflows import build_cash_flows
+
+COLUMNS = [
+    "date",
+    "isin",
+    "description",
+    "coupon",
+    "maturity_date",
+    "issue_volume",
+    "clean_price",
+    "yield",
+    "dirty_price",
+]
+
+# Original maturity in years and share of issuance, roughly as for Bunds, Bobls and Schatz.
+TENOR_WEIGHTS = {2: 0.25, 5: 0.25, 10: 0.3, 15: 0.05, 30: 0.15}
+
+# (beta0, beta1, beta2, beta3, kappa1, kappa2), as in svensson.zero_rates.
+DEFAULT_PARAMS = (0.025, -0.01, 0.01, 0.005, 1 / 1.5, 1 / 8.0)
+
+
+def isin_check_digit(body: str) -> str:
+    """Luhn check digit over the ISIN body with letters expanded to 10-35."""
+    digits = "".join(str(string.ascii_uppercase.index(c) + 10) if c.isalpha() else c for c in body)
+    total = 0
+    for i, digit in enumerate(reversed(digits)):
+        value = int(digit) * (2 if i % 2 == 0 else 1)
+        total += value // 10 + value % 10
+    return str((10 - total % 10) % 10)
+
+
+@dataclass(frozen=True)
+class SyntheticMarketConfig:
+    start_date: dt.date
+    end_date: dt.date
+    n_bonds: int = 40  # Approximate number of bonds outstanding on any date.
+    params: tuple[float, ...] = DEFAULT_PARAMS
+    params_volatility: tuple[float, ...] = (0.0004, 0.0004, 0.0006, 0.0006, 0.0, 0.0)
+    price_noise: float = 0.05  # Std. dev. of clean price noise, per 100 nominal.
+    country: str = "DE"
+    seed: int = 0
+    tenor_weights: dict[int, float] = field(default_factory=lambda: dict(TENOR_WEIGHTS))
+
+
+class SyntheticMarket:
+    def __init__(self, config: SyntheticMarketConfig):
+        self.config = config
+        self.rng = np.random.default_rng(config.seed)
+        self.dates = self._business_days()
+        self.curve_params = self._curve_params()
+        self.bonds = self._issue_bonds()
+
+    def _business_days(self) -> list[dt.date]:
+        days = np.arange(
+            np.datetime64(self.config.start_date, "D"),
+            np.datetime64(self.config.end_date, "D") + 1,
+        )
+        return [day.astype(dt.date) for day in days[np.is_busday(days)]]
+
+    def _curve_params(self) -> np.ndarray:
+        """One parameter vector per date, as a random walk around the base curve."""
+        steps = self.rng.normal(
+            scale=self.config.params_volatility,
+            size=(len(self.dates), len(self.config.params)),
+        )
+        steps[0] = 0.0
+        return np.asarray(self.config.params) + np.cumsum(steps, axis=0)
+
+    def _issue_bonds(self) -> pd.DataFrame:
+        """Bonds issued at a steady pace such that about `n_bonds` are alive at any time."""
+        tenors = np.array(list(self.config.tenor_weights))
+        weights = np.array(list(self.config.tenor_weights.values()))
+        weights = weights / weights.sum()
+        interval_days = (tenors @ weights) * DAYS_IN_YEAR / self.config.n_bonds
+
+        first_issue = self.config.start_date - dt.timedelta(days=int(tenors.max() * DAYS_IN_YEAR))
+        n_issues = int((self.config.end_date - first_issue).days / interval_days) + 1
+        issue_dates = [
+            first_issue + dt.timedelta(days=int(i * interval_days)) for i in range(n_issues)
+        ]
+        issue_tenors = self.rng.choice(tenors, size=n_issues, p=weights)
+        maturity_dates = [
+            issue.replace(year=issue.year + int(tenor), day=min(issue.day, 28))
+            for issue, tenor in zip(issue_dates, issue_tenors, strict=True)
+        ]
+
+        # Coupons near the par yield at issuance, in steps of 0.25%, floored at zero. The
+        # noise stands in for the rate history which spreads real coupons out.
+        par_yields = svensson.zero_rates(np.asarray(self.config.params), issue_tenors) * 100.0
+        par_yields = par_yields + self.rng.normal(scale=1.0, size=n_issues)
+        coupons = np.maximum(np.round(par_yields * 4.0) / 4.0, 0.0)
+
+        prefix = f"{self.config.country}0SYN"
+        isins = []
+        for i in range(n_issues):
+            body = f"{prefix}{i:05d}"
+            isins.append(body + isin_check_digit(body))
+
+        return pd.DataFrame(
+            {
+                "isin": isins,
+                "description": [
+                    f"{coupon:.2f} % Synthetic Bund {maturity:%d.%m.%Y}"
+                    for coupon, maturity in zip(coupons, maturity_dates, strict=True)
+                ],
+                "coupon": coupons,
+                "issue_date": issue_dates,
+                "maturity_date": maturity_dates,
+                "issue_volume": self.rng.choice([4.0, 5.0, 6.0, 8.0, 10.0], size=n_issues),
+            }
+        )
+
+    def iter_days(self) -> Iterator[pd.DataFrame]:
+        """One frame per business day with every outstanding bond's prices and yield.
+
+        Price noise is seeded per day, so repeated iterations give identical data.
+        """
+        issue_dates = np.asarray(self.bonds["issue_date"], dtype="datetime64[D]")
+        maturity_dates = np.asarray(self.bonds["maturity_date"], dtype="datetime64[D]")
+        for i, (date, params) in enumerate(zip(self.dates, self.curve_params, strict=True)):
+            rng = np.random.default_rng([self.config.seed, i])
+            day = np.datetime64(date, "D")
+            # Skip bonds in their last week, as their yields are dominated by noise.
+            alive = (issue_dates <= day) & (maturity_dates > day + 7)
+            bonds = self.bonds[alive]
+
+            cash_flows = build_cash_flows(bonds["coupon"], bonds["maturity_date"], date)
+            model_dirty = cash_flows.dirty_prices(
+                svensson.discount_factors(params, cash_flows.times)
+            )
+            clean = model_dirty - cash_flows.accrued
+            clean = clean + rng.normal(scale=self.config.price_noise, size=len(bonds))
+            dirty = clean + cash_flows.accrued
+
+            yield pd.DataFrame(
+                {
+                    "date": date,
+                    "isin": bonds["isin"].to_numpy(),
+                    "description": bonds["description"].to_numpy(),
+                    "coupon": bonds["coupon"].to_numpy(),
+                    "maturity_date": bonds["maturity_date"].to_numpy(),
+                    "issue_volume": bonds["issue_volume"].to_numpy(),
+                    "clean_price": clean.round(4),
+                    "yield": (cash_flows.yields(dirty) * 100.0).round(4),
+                    "dirty_price": dirty.round(4),
+                },
+                columns=COLUMNS,
+            )
+
+    def frame(self) -> pd.DataFrame:
+        return pd.concat(self.iter_days(), ignore_index=True)
+
+
+def to_bundesbank_sheet(day: pd.DataFrame) -> pd.DataFrame:
+    """Lay out one day's frame as a Bundesbank sheet, which the transformer parses."""
+    date = day["date"].iloc[0]
+    residual_life = [(maturity - date).days / DAYS_IN_YEAR for maturity in day["maturity_date"]]
+    units = ["ISIN", "%", "Issue", "dd.mm.yyyy", "Years", "EUR bn", "%", "%", "%"]
+    body = pd.DataFrame(
+        {
+            "ISIN": day["isin"].to_numpy(),
+            "Coupon": day["coupon"].to_numpy(),
+            "Issue": day["description"].to_numpy(),
+            "Maturity": [f"{maturity:%d.%m.%Y}" for maturity in day["maturity_date"]],
+            "Residual life": np.round(residual_life, 2),
+            "Issue volume": day["issue_volume"].to_numpy(),
+            "Clean price": day["clean_price"].to_numpy(),
+            "Yield": day["yield"].to_numpy(),
+            "Dirty price": day["dirty_price"].to_numpy(),
+        }
+    )
+    return pd.concat([pd.DataFrame([units], columns=body.columns), body], ignore_index=True)
+
+
+def write_bundesbank_workbooks(market: SyntheticMarket, directory: str | Path) -> list[Path]:
+    """Write one workbook per month, one sheet per business day named `dd.mm.yyyy`."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    paths = []
+    writer = None
+    month = None
+    try:
+        for day in market.iter_days():
+            date = day["date"].iloc[0]
+            if (date.year, date.month) != month:
+                if writer is not None:
+                    writer.close()
+                month = (date.year, date.month)
+                path = directory / f"bundesbank_synthetic_{date:%Y_%m}.xlsx"
+                writer = pd.ExcelWriter(path, engine="openpyxl")
+                paths.append(path)
+            to_bundesbank_sheet(day).to_excel(writer, sheet_name=f"{date:%d.%m.%Y}", index=False)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    return paths
@@ -0,0 +1,52 @@
+import tempfile
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from scripts.generate_synthetic_data import write_to_database
+from src.curve_engine.history import CurveHistory
+from src.utils.synthetic import SyntheticMarket, SyntheticMarketConfig
+
+
+class ViewTestCase(TestCase):
+    """Requests to the yield_curves views by a logged in user.
+
+    With `market_config` set, its synthetic market is written to the database
+    as `cls.market`; with `url_name` set, `self.url` is the view's URL. Both
+    clients are logged in as `cls.user`.
+    """
+
+    market_config: SyntheticMarketConfig | None = None
+    url_name: str | None = None
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.market = None
+        if cls.market_config is not None:
+            cls.market = SyntheticMarket(cls.market_config)
+            write_to_database(cls.market)
+        cls.user = User.objects.create_user(username=cls.__name__.lower(), password="password")
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        self.async_client.force_login(self.user)
+        if self.url_name is not None:
+            self.url = reverse(self.url_name)
+
+    def patch_curve_history(self, target: str) -> CurveHistory:
+        """A curve history in a temporary directory, returned by `target` during the test.
+
+        It holds the market's curves, if there is a market.
+        """
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        history = CurveHistory(tmp_dir.name)
+        if self.market is not None:
+            n_dates = len(self.market.dates)
+            history.extend("DE", self.market.dates, self.market.curve_params, [30.0] * n_dates)
+        patcher = patch(target, return_value=history)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return history
@@ -0,0 +1,161 @@
+import asyncio
+import datetime as dt
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from django.urls import reverse
+
+from src.apps.yield_curves.models import Analysis, BondScatter
+from src.curve_engine.carry import CARRY_TENORS
+from src.curve_engine.curve_engine import YieldCurveCalibrator
+from src.curve_engine.curve_store import CurveStore
+from src.curve_engine.executor import BondQuote, fit_zero_curve, warm_up_executor
+from src.curve_engine.limiter import Overloaded
+from src.utils.synthetic import SyntheticMarketConfig
+from tests.django.apps.yield_curves.base import ViewTestCase
+
+VALUATION_DATE = dt.date(2024, 6, 3)
+
+
+class TestAsyncViews(ViewTestCase):
+    market_config = SyntheticMarketConfig(
+        start_date=VALUATION_DATE, end_date=VALUATION_DATE, n_bonds=30
+    )
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.analysis = Analysis.objects.create(name="Async", user=cls.user)
+        cls.scatter = BondScatter.objects.create(
+            analysis=cls.analysis, country="DE", date=VALUATION_DATE
+        )
+
+    def test_fit_zero_curve_matches_calibrator(self):
+        bond_metrics = list(self.scatter.get_bond_data())
+        ttms = [0.5, 2.0, 10.0]
+
+        zero_curve = fit_zero_curve(
+            [BondQuote.from_bond_metric(metric) for metric in bond_metrics], VALUATION_DATE, ttms
+        )
+
+        calibrator = YieldCurveCalibrator(bond_metrics, VALUATION_DATE).calibrate()
+        assert zero_curve.ttms == ttms
+        assert zero_curve.zero_rates == [calibrator.zero_rate(ttm) for ttm in ttms]
+        assert {"helpers", "fit", "grid"} <= set(zero_curve.phases)
+
+    async def test_zero_curve(self):
+        response = await self.async_client.get(
+            reverse("yield_curves:get_zero_curve_data", args=[self.analysis.id, self.scatter.id])
+        )
+
+        assert response.status_code == 200
+        assert response.json()["count"] > 100
+        for phase in ("executor", "helpers", "fit", "grid"):
+            assert f"{phase};dur=" in response["Server-Timing"]
+
+    async def test_zero_curve_grids(self):
+        url = reverse("yield_curves:get_zero_curve_data", args=[self.analysis.id, self.scatter.id])
+
+        uniform = (await self.async_client.get(url)).json()["data"]
+        adaptive = (await self.async_client.get(url, {"grid": "adaptive", "points": 40})).json()
+        lttb = (await self.async_client.get(url, {"grid": "lttb", "points": 40})).json()
+        invalid = await self.async_client.get(url, {"grid": "cubic"})
+
+        assert len(adaptive["data"]) <= 40 < len(uniform)
+        assert adaptive["data"][0]["ttm_years"] < uniform[0]["ttm_years"]
+        assert adaptive["data"][-1]["ttm_years"] == pytest.approx(uniform[-1]["ttm_years"], abs=0.1)
+        assert lttb["count"] == 40
+        assert lttb["data"][0] == uniform[0]
+        assert lttb["data"][-1] == uniform[-1]
+        assert invalid.status_code == 400
+
+    async def test_carry_roll_down(self):
+        url = reverse(
+            "yield_curves:get_carry_roll_down_data", args=[self.analysis.id, self.scatter.id]
+        )
+
+        response = await self.async_client.get(url, {"horizons": "3,12"})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["horizon_months"] == [3, 12]
+        n_bonds = len(data["bonds"]["isins"])
+        assert n_bonds > 3
+        assert len(data["bonds"]["carry_bp"]) == n_bonds
+        assert all(len(row) == 2 for row in data["bonds"]["total_bp"])
+        assert data["tenors"]["tenor_years"] == list(CARRY_TENORS)
+        # The 1y tenor matures at the 1y horizon, so has no breakeven there.
+        assert data["tenors"]["breakeven_bp"][0][1] is None
+        assert "carry;dur=" in response["Server-Timing"]
+
+        for horizons in ("0", "x", "3,240"):
+            response = await self.async_client.get(url, {"horizons": horizons})
+            assert response.status_code == 400
+
+    async def test_zero_curve_from_store(self):
+        url = reverse("yield_curves:get_zero_curve_data", args=[self.analysis.id, self.scatter.id])
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = CurveStore(Path(tmp_dir) / "curves.bin")
+            with patch("src.curve_engine.curve_store.get_curve_store", return_value=store):
+                fitted = await self.async_client.get(url)
+                stored = await self.async_client.get(url)
+            store.close()
+
+        assert fitted.json() == stored.json()
+        assert "executor;dur=" in fitted["Server-Timing"]
+        assert "executor;dur=" not in stored["Server-Timing"]
+        assert "store;dur=" in stored["Server-Timing"]
+
+    async def test_cheap_requests_not_blocked_by_fit(self):
+        await asyncio.to_thread(warm_up_executor)
+        finished = {}
+
+        async def get(name, url):
+            response = await self.async_client.get(url)
+            finished[name] = time.perf_counter()
+            return response
+
+        zero_curve, date_range = await asyncio.gather(
+            get(
+                "zero_curve",
+                reverse(
+                    "yield_curves:get_zero_curve_data", args=[self.analysis.id, self.scatter.id]
+                ),
+            ),
+            get("date_range", reverse("yield_curves:get_bond_date_range")),
+        )
+
+        assert zero_curve.status_code == date_range.status_code == 200
+        assert date_range.json()["max_date"] == VALUATION_DATE.isoformat()
+        assert finished["date_range"] < finished["zero_curve"]
+
+    async def test_scatter_data_residuals(self):
+        url = reverse("yield_curves:get_selected_scatters_data", args=[self.analysis.id])
+        body = {"scatter_ids": [self.scatter.id]}
+
+        response = await self.async_client.post(url, body, content_type="application/json")
+        with patch(
+            "src.apps.yield_curves.views.aget_curve", side_effect=Overloaded(503, 1, "busy")
+        ):
+            overloaded = await self.async_client.post(url, body, content_type="application/json")
+
+        assert response.status_code == 200
+        points = response.json()[0]["data"]
+        assert points
+        for point in points:
+            assert point["residual_bp"] == pytest.approx(
+                (point["yield"] - point["fitted_yield"]) * 100.0, abs=0.5
+            )
+            # Synthetic prices are the curve's plus noise of a few cents.
+            assert abs(point["residual_bp"]) < 25.0
+        assert "residuals;dur=" in response["Server-Timing"]
+        assert overloaded.status_code == 200
+        assert "residual_bp" not in overloaded.json()[0]["data"][0]
+
+        with patch("src.apps.yield_curves.views.aget_curve", side_effect=RuntimeError("broken")):
+            failed = await self.async_client.post(url, body, content_type="application/json")
+        assert failed.status_code == 500
@@ -0,0 +1,79 @@
+import datetime as dt
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from src.apps.yield_curves.models import BondMetric
+from src.constants import DAYS_IN_YEAR
+from src.utils.synthetic import SyntheticMarketConfig
+from tests.django.apps.yield_curves.base import ViewTestCase
+
+
+class TestBondHistory(ViewTestCase):
+    market_config = SyntheticMarketConfig(
+        start_date=dt.date(2024, 1, 1), end_date=dt.date(2024, 1, 31), n_bonds=10
+    )
+    url_name = "yield_curves:get_bond_history"
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.isins = list(
+            BondMetric.objects.filter(date=dt.date(2024, 1, 31))
+            .order_by("bond_id")
+            .values_list("bond_id", flat=True)[:3]
+        )
+
+    def test_columns_per_isin(self):
+        response = self.client.get(
+            self.url, {"isins": ",".join(self.isins), "start": "2024-01-10", "end": "2024-01-20"}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert list(data["bonds"]) == self.isins
+        assert data["missing"] == []
+        for isin, bond in data["bonds"].items():
+            metrics = BondMetric.objects.filter(
+                bond_id=isin, date__range=(dt.date(2024, 1, 10), dt.date(2024, 1, 20))
+            ).order_by("date")
+            assert bond["dates"] == [metric.date.isoformat() for metric in metrics]
+            assert bond["clean_price"] == [float(metric.clean_price) for metric in metrics]
+            assert bond["yield"] == [float(metric._yield) for metric in metrics]
+            assert bond["ttm_years"] == [
+                round((metric.bond.maturity_date - metric.date).days / DAYS_IN_YEAR, 4)
+                for metric in metrics
+            ]
+        assert data["count"] == sum(len(bond["dates"]) for bond in data["bonds"].values())
+
+    def test_single_query_for_metrics(self):
+        self.client.get(self.url, {"isins": self.isins[0]})
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url, {"isins": ",".join(self.isins)})
+
+        metric_queries = [q for q in queries if "yield_curves_bondmetric" in q["sql"]]
+        assert len(metric_queries) == 1
+
+    def test_missing_isins(self):
+        response = self.client.get(self.url, {"isins": f"{self.isins[0]},XX0000000000"})
+
+        assert list(response.json()["bonds"]) == [self.isins[0]]
+        assert response.json()["missing"] == ["XX0000000000"]
+
+    def test_invalid(self):
+        assert self.client.get(self.url).status_code == 400
+        assert self.client.get(self.url, {"isins": self.isins[0], "start": "x"}).status_code == 400
+        too_many = ",".join(f"DE{i:010d}" for i in range(51))
+        assert self.client.get(self.url, {"isins": too_many}).status_code == 400
+
+    def test_index(self):
+        # The migrated table, not just the model, must have the unique covering index.
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT indexdef FROM pg_indexes WHERE indexname = %s",
+                ["bondmetric_bond_date_uniq"],
+            )
+            (indexdef,) = cursor.fetchone()
+        assert indexdef.startswith("CREATE UNIQUE INDEX")
+        assert indexdef.endswith("(bond_id, date) INCLUDE (clean_price, yield)")
@@ -0,0 +1,68 @@
+import datetime as dt
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.urls import reverse
+
+from src.apps.yield_curves.models import Analysis, BondScatter
+from src.curve_engine.curve_store import afit_zero_curve
+from src.utils.synthetic import SyntheticMarketConfig
+from tests.django.apps.yield_curves.base import ViewTestCase
+
+START = dt.date(2024, 6, 3)
+END = dt.date(2024, 6, 28)
+
+
+class TestCurveDifference(ViewTestCase):
+    market_config = SyntheticMarketConfig(start_date=START, end_date=END, n_bonds=30)
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.analysis = Analysis.objects.create(name="Difference", user=cls.user)
+        cls.base = BondScatter.objects.create(analysis=cls.analysis, country="DE", date=START)
+        cls.other = BondScatter.objects.create(analysis=cls.analysis, country="DE", date=END)
+        cls.same = BondScatter.objects.create(analysis=cls.analysis, country="DE", date=START)
+
+    def url(self, base, other):
+        return reverse(
+            "yield_curves:get_curve_difference_data", args=[self.analysis.id, base.id, other.id]
+        )
+
+    async def test_difference(self):
+        response = await self.async_client.get(self.url(self.base, self.other))
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["base"]["date"] == START.isoformat()
+        assert data["other"]["date"] == END.isoformat()
+        assert data["ttm_years"][:3] == [0.1, 0.2, 0.3]
+        assert data["count"] > 100
+        for column in ("zero_spread_bp", "forward_spread_bp", "discount_spread"):
+            assert len(data[column]) == data["count"]
+        # The synthetic curve moves between the dates.
+        assert max(abs(spread) for spread in data["zero_spread_bp"]) > 0.1
+        assert "grid;dur=" in response["Server-Timing"]
+
+    async def test_same_quotes_are_fitted_once(self):
+        with patch("src.curve_engine.curve_store.afit_zero_curve", wraps=afit_zero_curve) as fit:
+            response = await self.async_client.get(self.url(self.base, self.same))
+
+        assert response.status_code == 200
+        assert fit.call_count == 1
+        data = response.json()
+        assert set(data["zero_spread_bp"]) == {0.0}
+        assert set(data["forward_spread_bp"]) == {0.0}
+
+    async def test_other_users_scatter(self):
+        other_user = await User.objects.acreate(username="someone")
+        analysis = await Analysis.objects.acreate(name="Theirs", user=other_user)
+        scatter = await BondScatter.objects.acreate(analysis=analysis, country="DE", date=END)
+        response = await self.async_client.get(
+            reverse(
+                "yield_curves:get_curve_difference_data",
+                args=[self.analysis.id, self.base.id, scatter.id],
+            )
+        )
+
+        assert response.status_code == 404
@@ -0,0 +1,60 @@
+import datetime as dt
+from unittest.mock import patch
+
+import numpy as np
+
+from src.curve_engine.history import TENORS
+from tests.django.apps.yield_curves.base import ViewTestCase
+
+PARAMS = np.array([0.025, -0.01, 0.005, 0.01, 0.5, 0.1])
+START = dt.date(2000, 1, 1)
+
+
+class TestCurveFactors(ViewTestCase):
+    url_name = "yield_curves:curve_factors"
+
+    def setUp(self):
+        super().setUp()
+        self.history = self.patch_curve_history("src.curve_engine.factors.get_curve_history")
+
+    def extend(self, n_dates, first=0):
+        rng = np.random.default_rng(1)
+        dates = [START + dt.timedelta(days=i) for i in range(n_dates)]
+        params = np.tile(PARAMS, (n_dates, 1))
+        params[:, :3] += np.cumsum(rng.normal(size=(n_dates, 3)) * 1e-4, axis=0)
+        self.history.extend("DE", dates[first:], params[first:], [30.0] * (n_dates - first))
+
+    def test_loadings_and_scores(self):
+        self.extend(500)
+
+        response = self.client.get(self.url, {"start": "2001-01-01", "end": "2001-01-10"})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["tenors"] == list(TENORS)
+        assert data["factors"] == ["level", "slope", "curvature"]
+        assert len(data["loadings"]) == 3
+        assert all(len(row) == len(TENORS) for row in data["loadings"])
+        assert data["n_obs"] == 499
+        assert data["dates"][0] == "2001-01-01"
+        assert data["count"] == len(data["scores"]) == 10
+        assert all(len(row) == 3 for row in data["scores"])
+        assert "update;dur=" in response["Server-Timing"]
+
+        # New dates are added to the running components without starting over.
+        self.extend(510, first=500)
+        with patch("src.curve_engine.factors.logger") as logger:
+            response = self.client.get(self.url, {"n_factors": 2})
+        logger.info.assert_not_called()
+        data = response.json()
+        assert data["n_obs"] == 509
+        assert data["factors"] == ["level", "slope"]
+        assert data["count"] == 509
+
+    def test_unavailable(self):
+        assert self.client.get(self.url).status_code == 404
+        self.extend(500)
+        assert self.client.get(self.url, {"country": "FR"}).status_code == 404
+        assert self.client.get(self.url, {"n_factors": 0}).status_code == 400
+        assert self.client.get(self.url, {"start": "x"}).status_code == 400
+        assert self.client.get(self.url, {"country": "../.."}).status_code == 400
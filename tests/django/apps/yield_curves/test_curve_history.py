@@ -0,0 +1,70 @@
+import datetime as dt
+
+import numpy as np
+
+from src.curve_engine import svensson
+from tests.django.apps.yield_curves.base import ViewTestCase
+
+PARAMS = np.array([0.025, -0.01, 0.005, 0.01, 0.5, 0.1])
+START = dt.date(2000, 1, 1)
+
+
+class TestCurveHistory(ViewTestCase):
+    url_name = "yield_curves:curve_history"
+
+    def setUp(self):
+        super().setUp()
+        history = self.patch_curve_history("src.apps.yield_curves.views.get_curve_history")
+        self.dates = [START + dt.timedelta(days=i) for i in range(2000)]
+        self.params = np.tile(PARAMS, (len(self.dates), 1))
+        self.params[:, 0] += 0.01 * np.sin(np.arange(len(self.dates)) / 100.0)
+        history.extend("DE", self.dates, self.params, [30.0] * len(self.dates))
+
+    def test_rates_and_spreads(self):
+        response = self.client.get(
+            self.url,
+            {"country": "de", "start": "2000-01-11", "end": "2000-01-20", "tenors": "2,10"},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        params = self.params[10:20]
+        assert data["dates"][0] == "2000-01-11"
+        assert data["count"] == data["total"] == 10
+        assert not data["downsampled"]
+        assert set(data["series"]) == {"2y", "10y", "2s10s", "5s30s"}
+        np.testing.assert_allclose(
+            data["series"]["10y"], svensson.zero_rates(params, 10.0) * 100.0, atol=1e-4
+        )
+        np.testing.assert_allclose(
+            data["series"]["5s30s"],
+            (svensson.zero_rates(params, 30.0) - svensson.zero_rates(params, 5.0)) * 1e4,
+            atol=1e-2,
+        )
+
+    def test_downsampled(self):
+        response = self.client.get(self.url, {"max_points": 200, "spreads": ""})
+
+        data = response.json()
+        assert data["count"] == 200
+        assert data["total"] == len(self.dates)
+        assert data["downsampled"]
+        assert data["dates"][0] == self.dates[0].isoformat()
+        assert data["dates"][-1] == self.dates[-1].isoformat()
+        assert set(data["series"]) == {"2y", "5y", "10y", "30y"}
+
+    def test_invalid(self):
+        for params in (
+            {"tenors": "ten"},
+            {"spreads": "2y10y"},
+            {"tenors": "-1"},
+            {"tenors": "nan"},
+            {"tenors": "2,inf"},
+            {"max_points": 2},
+            {"country": "../.."},
+            {"country": "DEU"},
+        ):
+            assert self.client.get(self.url, params).status_code == 400
+
+    def test_no_history(self):
+        assert self.client.get(self.url, {"country": "FR"}).status_code == 404
@@ -0,0 +1,102 @@
+import datetime as dt
+import json
+from unittest.mock import patch
+
+from src.apps.yield_curves.models import BondMetric
+from src.utils.configuration import conf
+from src.utils.synthetic import SyntheticMarketConfig
+from tests.django.apps.yield_curves.base import ViewTestCase
+
+
+def limits(overrides):
+    """A `conf.get` stand-in with the keys in `overrides` set."""
+    get = conf.get
+    return lambda key, default=None: overrides.get(key, get(key, default))
+
+
+class TestPortfolioValuation(ViewTestCase):
+    market_config = SyntheticMarketConfig(
+        start_date=dt.date(2024, 1, 1), end_date=dt.date(2024, 1, 31), n_bonds=20
+    )
+    url_name = "yield_curves:portfolio_valuation"
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.isins = list(
+            BondMetric.objects.filter(date=dt.date(2024, 1, 31))
+            .order_by("bond_id")
+            .values_list("bond_id", flat=True)[:3]
+        )
+
+    def setUp(self):
+        super().setUp()
+        self.patch_curve_history("src.apps.yield_curves.views.get_curve_history")
+
+    async def post(self, body):
+        return await self.async_client.post(self.url, body, content_type="application/json")
+
+    async def test_streams_one_line_per_date(self):
+        holdings = [{"isin": isin, "notional": 1e6} for isin in self.isins]
+        response = await self.post(
+            {
+                "holdings": [*holdings, {"isin": "DE0000000000", "notional": 1}],
+                "start": "2024-01-15",
+            }
+        )
+
+        assert response.status_code == 200
+        assert response["Content-Type"] == "application/x-ndjson"
+        assert response.is_async
+        content = b"".join([chunk async for chunk in response.streaming_content])
+        header, *days = [json.loads(line) for line in content.splitlines()]
+        assert header["isins"] == self.isins
+        assert header["missing"] == ["DE0000000000"]
+        assert [day["date"] for day in days] == [
+            date.isoformat() for date in self.market.dates if date >= dt.date(2024, 1, 15)
+        ]
+        for day in days:
+            assert abs(day["model_value"] - sum(day["holdings"]["model_value"])) < 0.02
+            assert day["unquoted"] == 0
+            # Synthetic quotes are the curve's prices plus a few cents of noise.
+            assert abs(day["market_value"] - day["model_value"]) < 0.002 * day["model_value"]
+            assert day["dv01"] > 0
+
+    async def test_invalid(self):
+        holdings = [{"isin": self.isins[0], "notional": 1e6}]
+        for body in (
+            {"holdings": []},
+            {"holdings": [{"isin": self.isins[0]}]},
+            {"holdings": [{"isin": self.isins[0], "notional": "x"}]},
+            {"holdings": holdings, "country": "../.."},
+            "{",
+        ):
+            assert (await self.post(body)).status_code == 400
+
+    async def test_limits(self):
+        holdings = [{"isin": isin, "notional": 1e6} for isin in self.isins]
+        n_dates = len(self.market.dates)
+
+        with patch(
+            "src.apps.yield_curves.views.conf.get",
+            side_effect=limits(
+                {"portfolio.max_dates": str(n_dates - 1), "portfolio.max_rows": "7"}
+            ),
+        ):
+            too_many_dates = await self.post({"holdings": holdings})
+            in_range = await self.post({"holdings": holdings, "start": "2024-01-15"})
+        with patch(
+            "src.apps.yield_curves.views.conf.get",
+            side_effect=limits({"portfolio.max_total_rows": str(n_dates * len(holdings) - 1)}),
+        ):
+            too_many_rows = await self.post({"holdings": holdings})
+        with patch(
+            "src.apps.yield_curves.views.conf.get",
+            side_effect=limits({"portfolio.max_holdings": str(len(holdings) - 1)}),
+        ):
+            too_many_holdings = await self.post({"holdings": holdings})
+
+        assert too_many_dates.status_code == 400
+        assert in_range.status_code == 200
+        assert too_many_rows.status_code == 400
+        assert too_many_holdings.status_code == 400
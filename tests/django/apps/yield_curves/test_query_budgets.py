@@ -0,0 +1,133 @@
+import datetime as dt
+import json
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import LiveServerTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from scripts.generate_synthetic_data import write_to_database
+from src.apps.yield_curves.models import Analysis, BondScatter
+from src.utils.load_test import (
+    QUERY_BUDGETS,
+    EndpointStats,
+    LoadTest,
+    LoadTestConfig,
+    LoadTestResult,
+    parse_sql_count,
+)
+from src.utils.synthetic import SyntheticMarket, SyntheticMarketConfig
+from tests.django.apps.yield_curves.base import ViewTestCase
+
+
+class TestQueryBudgets(ViewTestCase):
+    """The load test's query budgets hold, however many bonds a scatter has."""
+
+    market_config = SyntheticMarketConfig(
+        start_date=dt.date(2024, 6, 3), end_date=dt.date(2024, 6, 4), n_bonds=30
+    )
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.analysis = Analysis.objects.create(name="Budget", user=cls.user)
+        cls.base_scatter = BondScatter.objects.create(
+            analysis=cls.analysis, country="DE", date=dt.date(2024, 6, 3)
+        )
+
+    def assert_within_budget(self, endpoint: str, method: str, url: str, data=None):
+        with CaptureQueriesContext(connection) as queries:
+            if data is None:
+                response = getattr(self.client, method)(url)
+            else:
+                response = getattr(self.client, method)(
+                    url, data=json.dumps(data), content_type="application/json"
+                )
+
+        assert response.status_code == 200, response.content
+        assert parse_sql_count(response["Server-Timing"]) == len(queries)
+        assert len(queries) <= QUERY_BUDGETS[endpoint], (endpoint, len(queries))
+        return response
+
+    def test_query_budgets(self):
+        response = self.assert_within_budget(
+            "scatter_add",
+            "post",
+            reverse("yield_curves:add_bond_scatter", args=[self.analysis.id]),
+            {"country": "DE", "date": "2024-06-04"},
+        )
+        scatter_id = response.json()["scatter"]["id"]
+
+        response = self.assert_within_budget(
+            "scatter_data",
+            "post",
+            reverse("yield_curves:get_selected_scatters_data", args=[self.analysis.id]),
+            {"scatter_ids": [self.base_scatter.id, scatter_id]},
+        )
+        assert all(scatter["count"] > 20 for scatter in response.json())
+
+        self.assert_within_budget(
+            "zero_curve",
+            "get",
+            reverse("yield_curves:get_zero_curve_data", args=[self.analysis.id, scatter_id]),
+        )
+        self.assert_within_budget("date_range", "get", reverse("yield_curves:get_bond_date_range"))
+        self.assert_within_budget(
+            "scatter_delete",
+            "delete",
+            reverse("yield_curves:delete_bond_scatter", args=[self.analysis.id, scatter_id]),
+        )
+
+
+# The login page renders static asset URLs, which the manifest storage only knows after
+# collectstatic.
+@override_settings(
+    STORAGES={"staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"}}
+)
+class TestLoadTest(LiveServerTestCase):
+    def test_load_test(self):
+        market = SyntheticMarket(
+            SyntheticMarketConfig(
+                start_date=dt.date(2024, 6, 3), end_date=dt.date(2024, 6, 5), n_bonds=20
+            )
+        )
+        write_to_database(market)
+        for username in ["load_0", "load_1"]:
+            User.objects.create_user(username=username, password="password")
+
+        result = LoadTest(
+            LoadTestConfig(
+                base_url=self.live_server_url,
+                usernames=["load_0", "load_1"],
+                password="password",
+                dates=market.dates,
+                iterations=2,
+            )
+        ).run()
+
+        # Each of the live server's request threads has its own Postgres connection, so
+        # the query counts it reports are per request, as in TestQueryBudgets.
+        assert result.errors == 0
+        assert result.budget_violations() == []
+        summaries = {summary["endpoint"]: summary for summary in result.summaries()}
+        # Each user's base scatter plus one per iteration.
+        assert summaries["scatter_add"]["requests"] == 6
+        assert summaries["zero_curve"]["requests"] == 4
+        assert summaries["date_range"]["p99_ms"] >= summaries["date_range"]["p50_ms"] > 0.0
+
+
+class TestParseSqlCount(TestCase):
+    def test_parse_sql_count(self):
+        assert parse_sql_count('sql;dur=1.20;desc="4 queries", fit;dur=3.00') == 4
+        assert parse_sql_count("fit;dur=3.00") is None
+        assert parse_sql_count(None) is None
+
+    def test_missing_count_is_a_violation(self):
+        stats = EndpointStats("date_range")
+        stats.record(0.01, True, 2)
+        stats.record(0.01, True, None)
+
+        violations = LoadTestResult(1.0, {"date_range": stats}).budget_violations()
+
+        assert violations == ["date_range: 1 responses without a Server-Timing query count"]
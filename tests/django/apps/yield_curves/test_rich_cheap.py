@@ -0,0 +1,45 @@
+import datetime as dt
+from unittest.mock import patch
+
+from src.utils.synthetic import SyntheticMarketConfig
+from tests.django.apps.yield_curves.base import ViewTestCase
+
+
+class TestRichCheap(ViewTestCase):
+    market_config = SyntheticMarketConfig(
+        start_date=dt.date(2024, 1, 1), end_date=dt.date(2024, 2, 29), n_bonds=15
+    )
+    url_name = "yield_curves:rich_cheap"
+
+    def setUp(self):
+        super().setUp()
+        self.patch_curve_history("src.curve_engine.screening.get_curve_history")
+
+    def test_cheapest_first(self):
+        response = self.client.get(self.url, {"window": 30, "min_obs": 10})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["date"] == self.market.dates[-1].isoformat()
+        assert data["count"] == len(data["bonds"]) > 10
+        zscores = [bond["zscore"] for bond in data["bonds"] if bond["zscore"] is not None]
+        assert zscores == sorted(zscores, reverse=True)
+        assert all(bond["n_obs"] <= 30 for bond in data["bonds"])
+        assert "screen;dur=" in response["Server-Timing"]
+
+    def test_as_of_date(self):
+        date = self.market.dates[20]
+
+        response = self.client.get(self.url, {"date": date.isoformat()})
+
+        assert response.json()["date"] == date.isoformat()
+
+    def test_invalid(self):
+        assert self.client.get(self.url, {"window": "x"}).status_code == 400
+        assert self.client.get(self.url, {"window": 1}).status_code == 400
+        assert self.client.get(self.url, {"country": "../.."}).status_code == 400
+        assert self.client.get(self.url, {"date": "2000-01-01"}).status_code == 404
+
+    def test_no_history(self):
+        with patch("src.curve_engine.screening.get_curve_history", return_value=None):
+            assert self.client.get(self.url).status_code == 404
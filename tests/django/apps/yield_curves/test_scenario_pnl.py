@@ -0,0 +1,84 @@
+import datetime as dt
+from unittest.mock import patch
+
+from src.apps.yield_curves.models import BondMetric
+from src.curve_engine.limiter import Overloaded
+from src.curve_engine.scenarios import KEY_RATE_TENORS
+from src.utils.configuration import conf
+from src.utils.synthetic import SyntheticMarketConfig
+from tests.django.apps.yield_curves.base import ViewTestCase
+
+VALUATION_DATE = dt.date(2024, 6, 3)
+
+
+class TestScenarioPnl(ViewTestCase):
+    market_config = SyntheticMarketConfig(
+        start_date=VALUATION_DATE, end_date=VALUATION_DATE, n_bonds=30
+    )
+    url_name = "yield_curves:scenario_pnl"
+
+    async def post(self, body):
+        return await self.async_client.post(self.url, body, content_type="application/json")
+
+    async def test_pnl_and_key_rates(self):
+        response = await self.post(
+            {
+                "date": VALUATION_DATE.isoformat(),
+                "scenarios": [
+                    {"type": "parallel", "bp": 100},
+                    {"type": "twist", "short_bp": -10, "long_bp": 10},
+                    {"type": "key_rate", "tenor": 10, "bp": 1},
+                ],
+            }
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        n_bonds = await BondMetric.objects.filter(date=VALUATION_DATE).acount()
+        assert len(data["isins"]) == len(data["pnl"]) == len(data["key_rate_dv01"]) == n_bonds
+        assert data["scenarios"] == ["parallel +100bp", "twist -10/+10bp", "10y +1bp"]
+        assert data["key_rate_tenors"] == list(KEY_RATE_TENORS)
+        column = KEY_RATE_TENORS.index(10.0)
+        for pnl, dv01s in zip(data["pnl"], data["key_rate_dv01"], strict=True):
+            assert pnl[0] < 0
+            assert abs(pnl[2] + dv01s[column]) < 1e-4
+        assert "scenarios;dur=" in response["Server-Timing"]
+
+    async def test_invalid(self):
+        assert (await self.post({"scenarios": []})).status_code == 400
+        assert (
+            await self.post({"date": "2024-06-03", "scenarios": [{"type": "x"}]})
+        ).status_code == 400
+        assert (await self.post({"date": "2000-01-03"})).status_code == 404
+        for country in ("D", "", "DEU"):
+            assert (
+                await self.post({"country": country, "date": VALUATION_DATE.isoformat()})
+            ).status_code == 400
+
+    async def test_limit(self):
+        # Limits overridden through the environment arrive as strings.
+        get = conf.get
+        with patch(
+            "src.apps.yield_curves.views.conf.get",
+            side_effect=lambda key, default=None: (
+                "1" if key == "scenarios.max_scenarios" else get(key, default)
+            ),
+        ):
+            response = await self.post(
+                {
+                    "date": VALUATION_DATE.isoformat(),
+                    "scenarios": [{"type": "parallel", "bp": 1}, {"type": "parallel", "bp": -1}],
+                }
+            )
+
+        assert response.status_code == 400
+        assert response.json()["error"] == "At most 1 scenarios"
+
+    async def test_overloaded(self):
+        with patch(
+            "src.apps.yield_curves.views.aget_curve", side_effect=Overloaded(503, 2, "queue_full")
+        ):
+            response = await self.post({"date": VALUATION_DATE.isoformat()})
+
+        assert response.status_code == 503
+        assert response["Retry-After"] == "2"
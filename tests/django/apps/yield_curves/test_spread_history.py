@@ -0,0 +1,94 @@
+import datetime as dt
+from unittest.mock import patch
+
+import numpy as np
+
+from src.apps.yield_curves.models import BondMetric
+from src.curve_engine.spreads import svensson_spreads
+from src.utils.configuration import conf
+from src.utils.synthetic import SyntheticMarketConfig
+from tests.django.apps.yield_curves.base import ViewTestCase
+
+
+class TestSpreadHistory(ViewTestCase):
+    market_config = SyntheticMarketConfig(
+        start_date=dt.date(2024, 1, 1), end_date=dt.date(2024, 1, 31), n_bonds=20
+    )
+    url_name = "yield_curves:spread_history"
+
+    def setUp(self):
+        super().setUp()
+        self.patch_curve_history("src.apps.yield_curves.views.get_curve_history")
+
+    def test_whole_scatter(self):
+        date = self.market.dates[5]
+
+        response = self.client.get(self.url, {"start": date, "end": date})
+
+        assert response.status_code == 200
+        data = response.json()
+        bond_metrics = list(BondMetric.curve_universe("DE").filter(date=date).order_by("bond_id"))
+        assert data["isins"] == [metric.bond_id for metric in bond_metrics]
+        assert set(data["dates"]) == {date.isoformat()}
+        expected = svensson_spreads(bond_metrics, date, self.market.curve_params[5])
+        np.testing.assert_allclose(data["z_spread_bp"], expected.zspreads_bp, atol=0.006)
+        np.testing.assert_allclose(
+            data["asset_swap_spread_bp"], expected.asset_swap_spreads_bp, atol=0.006
+        )
+
+    def test_history_of_isins(self):
+        isin = BondMetric.objects.filter(date=self.market.dates[-1]).first().bond_id
+
+        response = self.client.get(
+            self.url, {"isins": isin, "start": self.market.dates[0], "end": self.market.dates[-1]}
+        )
+
+        data = response.json()
+        assert set(data["isins"]) == {isin}
+        assert data["count"] == BondMetric.objects.filter(bond_id=isin).count()
+        assert data["dates"] == sorted(data["dates"])
+        # Synthetic prices are the curve's plus a few cents of noise.
+        assert max(abs(spread) for spread in data["z_spread_bp"]) < 30.0
+        assert "spreads;dur=" in response["Server-Timing"]
+
+    def test_chunked(self):
+        params = {"start": self.market.dates[0], "end": self.market.dates[-1]}
+        whole = self.client.get(self.url, params).json()
+
+        with patch("src.apps.yield_curves.views.SPREAD_CHUNK_DATES", 4):
+            chunked = self.client.get(self.url, params).json()
+
+        assert chunked == whole
+        assert len(set(whole["dates"])) > 4
+
+    def test_limits(self):
+        date = self.market.dates[5]
+        get = conf.get
+        # Limits overridden through the environment arrive as strings.
+        with patch(
+            "src.apps.yield_curves.views.conf.get",
+            side_effect=lambda key, default=None: (
+                "10" if key.startswith("spreads.") else get(key, default)
+            ),
+        ):
+            too_long = self.client.get(self.url, {"start": date, "end": date + dt.timedelta(11)})
+            too_many_quotes = self.client.get(self.url, {"start": date, "end": date})
+
+        assert too_long.status_code == 400
+        assert too_many_quotes.status_code == 400
+        assert "quotes in range" in too_many_quotes.json()["error"]
+
+    def test_invalid(self):
+        date = self.market.dates[5].isoformat()
+        for params in (
+            {},
+            {"start": date},
+            {"start": "x", "end": date},
+            {"start": date, "end": "2000-01-01"},
+            {"start": date, "end": date, "country": "../.."},
+        ):
+            assert self.client.get(self.url, params).status_code == 400
+        assert (
+            self.client.get(self.url, {"start": "2000-01-01", "end": "2000-01-31"}).status_code
+            == 404
+        )
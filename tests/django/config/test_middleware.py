@@ -0,0 +1,66 @@
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
+
+from src.config.middleware import ProfilingMiddleware
+from src.utils.profiling import timed
+
+
+async def async_view(request):
+    with timed("fit"):
+        await User.objects.acount()
+    return HttpResponse("ok")
+
+
+def view(request):
+    with timed("fit"):
+        User.objects.count()
+        User.objects.exists()
+    return HttpResponse("ok")
+
+
+class TestProfilingMiddleware(TestCase):
+    def setUp(self):
+        self.middleware = ProfilingMiddleware(view)
+        self.request = RequestFactory().get("/analysis/1/zero-curve/")
+
+    def test_server_timing(self):
+        response = self.middleware(self.request)
+
+        entries = [entry.split(";")[0] for entry in response["Server-Timing"].split(", ")]
+        assert entries == ["sql", "fit", "total"]
+        assert 'desc="2 queries"' in response["Server-Timing"]
+
+    async def test_server_timing_async(self):
+        middleware = ProfilingMiddleware(async_view)
+        response = await middleware(self.request)
+
+        assert "sql;dur=" in response["Server-Timing"]
+        assert 'desc="1 queries"' in response["Server-Timing"]
+        assert "fit;dur=" in response["Server-Timing"]
+
+    def test_disabled(self):
+        self.middleware.enabled = False
+
+        assert "Server-Timing" not in self.middleware(self.request)
+
+    def test_disabled_by_default(self):
+        with patch("src.config.middleware.conf.get", side_effect=lambda key, default=None: default):
+            assert not ProfilingMiddleware(view).enabled
+
+    def test_cprofile_dump(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            self.middleware.cprofile_dir = Path(tmp)
+            self.middleware.cprofile_threshold_s = 10.0
+            self.middleware(self.request)
+            assert list(Path(tmp).iterdir()) == []
+
+            self.middleware.cprofile_threshold_s = 0.0
+            self.middleware(self.request)
+            (dump,) = Path(tmp).iterdir()
+            assert dump.name.endswith(".prof")
+            assert "GET_analysis_1_zero_curve" in dump.name
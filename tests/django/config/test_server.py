@@ -0,0 +1,114 @@
+import asyncio
+import datetime as dt
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import requests
+import uvicorn
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TransactionTestCase
+from django.urls import reverse
+
+from scripts.generate_synthetic_data import write_to_database
+from src.apps.yield_curves.models import Analysis, BondScatter
+from src.config import gunicorn_conf
+from src.config.asgi import application
+from src.curve_engine import curve_store
+from src.curve_engine.limiter import CalibrationLimiter
+from src.utils.synthetic import SyntheticMarket, SyntheticMarketConfig
+
+VALUATION_DATE = dt.date(2024, 6, 3)
+
+
+class TestGunicornConf(SimpleTestCase):
+    def test_workers_are_uvicorn(self):
+        assert gunicorn_conf.worker_class == "uvicorn_worker.UvicornWorker"
+
+
+class TestServer(TransactionTestCase):
+    """Requests through uvicorn, the server of the deployed gunicorn workers."""
+
+    def setUp(self):
+        write_to_database(
+            SyntheticMarket(
+                SyntheticMarketConfig(
+                    start_date=VALUATION_DATE, end_date=VALUATION_DATE, n_bonds=30
+                )
+            )
+        )
+        user = User.objects.create_user(username="server", password="password")
+        analysis = Analysis.objects.create(name="Server", user=user)
+        scatter = BondScatter.objects.create(analysis=analysis, country="DE", date=VALUATION_DATE)
+        self.zero_curve_url = reverse(
+            "yield_curves:get_zero_curve_data", args=[analysis.id, scatter.id]
+        )
+        self.client.force_login(user)
+        self.cookies = {
+            settings.SESSION_COOKIE_NAME: self.client.cookies[settings.SESSION_COOKIE_NAME].value
+        }
+
+        sock = socket.socket()
+        sock.bind(("127.0.0.1", 0))
+        self.base_url = f"http://127.0.0.1:{sock.getsockname()[1]}"
+        self.server = uvicorn.Server(
+            uvicorn.Config(application, lifespan="off", log_level="warning")
+        )
+        thread = threading.Thread(target=self.server.run, kwargs={"sockets": [sock]})
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(setattr, self.server, "should_exit", True)
+        while not self.server.started:
+            time.sleep(0.01)
+
+    def get(self, url):
+        response = requests.get(self.base_url + url, cookies=self.cookies, timeout=30)
+        return response, time.perf_counter()
+
+    def test_worker_serves_requests_concurrently(self):
+        fit = curve_store.aget_curve
+
+        async def slow_fit(*args, **kwargs):
+            await asyncio.sleep(1.0)
+            return await fit(*args, **kwargs)
+
+        with (
+            patch("src.apps.yield_curves.views.aget_curve", side_effect=slow_fit),
+            ThreadPoolExecutor(max_workers=2) as pool,
+        ):
+            zero_curve = pool.submit(self.get, self.zero_curve_url)
+            time.sleep(0.2)
+            date_range = pool.submit(self.get, reverse("yield_curves:get_bond_date_range"))
+            (zero_curve, zero_curve_done), (date_range, date_range_done) = (
+                zero_curve.result(),
+                date_range.result(),
+            )
+
+        assert zero_curve.status_code == date_range.status_code == 200
+        assert date_range.json()["max_date"] == VALUATION_DATE.isoformat()
+        # One event loop serves the date range while the zero curve waits on its fit.
+        assert date_range_done < zero_curve_done
+
+    def test_limiter_sees_concurrent_requests(self):
+        fit = curve_store.afit_zero_curve
+
+        async def slow_fit(*args, **kwargs):
+            await asyncio.sleep(1.0)
+            return await fit(*args, **kwargs)
+
+        limiter = CalibrationLimiter(max_concurrent=1, max_queue=0, max_wait_s=10.0)
+        with (
+            patch("src.curve_engine.curve_store.afit_zero_curve", side_effect=slow_fit),
+            patch("src.curve_engine.curve_store.get_limiter", return_value=limiter),
+            ThreadPoolExecutor(max_workers=2) as pool,
+        ):
+            first = pool.submit(self.get, self.zero_curve_url)
+            time.sleep(0.2)
+            second = pool.submit(self.get, self.zero_curve_url)
+            statuses = [first.result()[0].status_code, second.result()[0].status_code]
+
+        assert statuses == [200, 429]
+        assert limiter.rejected["queue_full"] == 1
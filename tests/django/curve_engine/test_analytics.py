@@ -0,0 +1,97 @@
+import datetime as dt
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from src.apps.yield_curves.models import Bond, BondMetric
+from src.curve_engine.analytics import annotate_bond_metrics, bond_analytics
+from src.curve_engine.cashflows import build_cash_flows
+
+VALUATION_DATE = dt.date(2025, 3, 14)
+COUPONS = [2.5, 0.0, 4.0, 1.0]
+MATURITIES = [dt.date(2032, 2, 15), dt.date(2026, 5, 31), dt.date(2045, 7, 4), dt.date(2025, 1, 15)]
+CLEAN_PRICES = [97.5, 97.0, 110.0, 100.0]
+
+
+class TestBondAnalytics(SimpleTestCase):
+    def setUp(self):
+        self.analytics = bond_analytics(COUPONS, MATURITIES, VALUATION_DATE, CLEAN_PRICES)
+
+    def test_matches_finite_differences(self):
+        cash_flows = build_cash_flows(COUPONS[:3], MATURITIES[:3], VALUATION_DATE)
+        yields = self.analytics.yields[:3]
+
+        def price(shift):
+            return (cash_flows.amounts * (1.0 + yields + shift)[:, None] ** -cash_flows.times).sum(
+                axis=1
+            )
+
+        h = 1e-4
+        dirty = price(0.0)
+        np.testing.assert_allclose(dirty, np.array(CLEAN_PRICES[:3]) + cash_flows.accrued)
+        np.testing.assert_allclose(
+            self.analytics.modified_durations[:3],
+            (price(-h) - price(h)) / (2 * h) / dirty,
+            rtol=1e-6,
+        )
+        np.testing.assert_allclose(
+            self.analytics.convexities[:3],
+            (price(h) - 2 * dirty + price(-h)) / h**2 / dirty,
+            rtol=1e-4,
+        )
+        np.testing.assert_allclose(
+            self.analytics.dv01s[:3], price(-1e-4 / 2) - price(1e-4 / 2), rtol=1e-6
+        )
+        np.testing.assert_array_equal(self.analytics.accrued_interest[:3], cash_flows.accrued)
+
+    def test_zero_coupon(self):
+        t = (MATURITIES[1] - VALUATION_DATE).days / 365.25
+        y = self.analytics.yields[1]
+
+        assert abs(self.analytics.modified_durations[1] - t / (1 + y)) < 1e-12
+        assert abs(self.analytics.convexities[1] - t * (t + 1) / (1 + y) ** 2) < 1e-12
+
+    def test_quoted_dirty_price(self):
+        # An annual-coupon Bund on its coupon date has accrued half a year's coupon on the
+        # semi-annual schedule; the quote accrues it from the February coupon.
+        maturity, valuation_date = dt.date(2035, 2, 15), dt.date(2025, 8, 15)
+        accrued = 2.5 * (valuation_date - dt.date(2025, 2, 15)).days / 365
+        analytics = bond_analytics([2.5], [maturity], valuation_date, [98.0], [98.0 + accrued])
+        cash_flows = build_cash_flows([2.5], [maturity], valuation_date)
+
+        assert abs(analytics.accrued_interest[0] - 1.24) < 0.01
+        np.testing.assert_allclose(
+            (cash_flows.amounts * (1.0 + analytics.yields[0]) ** -cash_flows.times).sum(),
+            98.0 + accrued,
+        )
+        np.testing.assert_allclose(
+            analytics.dv01s[0], analytics.modified_durations[0] * (98.0 + accrued) * 1e-4
+        )
+
+    def test_matured(self):
+        assert np.isnan(self.analytics.modified_durations[3])
+        assert np.isnan(self.analytics.dv01s[3])
+
+    def test_annotate_bond_metrics(self):
+        bond_metrics = [
+            BondMetric(
+                date=VALUATION_DATE,
+                clean_price=clean_price,
+                dirty_price=clean_price + 1.0,
+                _yield=0.0,
+                bond=Bond(isin=f"DE{i:010d}", coupon=coupon, maturity_date=maturity),
+            )
+            for i, (coupon, maturity, clean_price) in enumerate(
+                zip(COUPONS, MATURITIES, CLEAN_PRICES, strict=True)
+            )
+        ]
+
+        annotate_bond_metrics(bond_metrics)
+
+        analytics = bond_analytics(
+            COUPONS, MATURITIES, VALUATION_DATE, CLEAN_PRICES, np.add(CLEAN_PRICES, 1.0)
+        )
+        assert bond_metrics[0].accrued_interest == 1.0
+        assert bond_metrics[0].modified_duration == analytics.modified_durations[0]
+        assert bond_metrics[2].dv01 == analytics.dv01s[2]
+        assert bond_metrics[3].convexity is None
@@ -0,0 +1,54 @@
+import json
+import tempfile
+from pathlib import Path
+
+from django.test import SimpleTestCase
+
+from src.curve_engine.benchmark import (
+    PHASES,
+    BenchmarkResult,
+    benchmark_case,
+    find_regressions,
+    load_baseline,
+    save_baseline,
+)
+
+
+def _result(phase: str, median_s: float) -> BenchmarkResult:
+    return BenchmarkResult(
+        method="svensson", n_bonds=20, phase=phase, median_s=median_s, min_s=median_s, repeats=1
+    )
+
+
+class TestBenchmark(SimpleTestCase):
+    def test_benchmark_case(self):
+        results = benchmark_case("nelson_siegel", n_bonds=20, repeats=1)
+
+        assert [result.phase for result in results] == list(PHASES)
+        assert all(result.median_s > 0.0 for result in results)
+
+    def test_find_regressions(self):
+        baseline = {"svensson/20/calibrate": 0.1, "svensson/20/grid": 1e-4}
+        results = [
+            _result("calibrate", 0.2),
+            _result("grid", 5e-4),  # Too fast to be meaningful.
+            _result("helpers", 1.0),  # Not in the baseline.
+        ]
+
+        regressions = find_regressions(results, baseline, threshold=0.25)
+
+        assert [regression.key for regression in regressions] == ["svensson/20/calibrate"]
+        assert regressions[0].ratio == 2.0
+        assert find_regressions(results, baseline, threshold=1.5) == []
+
+    def test_baseline_round_trip(self):
+        results = [_result("calibrate", 0.1), _result("grid", 0.01)]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "baseline.json"
+            save_baseline(results, path)
+
+            assert "quantlib" in json.loads(path.read_text())["environment"]
+            assert load_baseline(path) == {
+                "svensson/20/calibrate": 0.1,
+                "svensson/20/grid": 0.01,
+            }
@@ -0,0 +1,98 @@
+import datetime as dt
+import functools
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from src.curve_engine import svensson
+from src.curve_engine.carry import (
+    CARRY_TENORS,
+    breakeven_bp,
+    carry_roll_down,
+    horizon_years,
+    tenor_carry_roll_down,
+)
+from src.curve_engine.cashflows import build_cash_flows
+
+VALUATION_DATE = dt.date(2025, 3, 14)
+PARAMS = np.array([0.03, -0.02, 0.01, 0.02, 2.0, 0.1])
+COUPONS = [2.5, 0.0, 4.0, 1.0]
+MATURITIES = [dt.date(2032, 2, 15), dt.date(2035, 3, 14), dt.date(2045, 7, 4), dt.date(2025, 5, 2)]
+HORIZONS = horizon_years([3, 6, 12])
+
+
+class TestCarryRollDown(SimpleTestCase):
+    def setUp(self):
+        self.discount = functools.partial(svensson.discount_factors, PARAMS)
+        self.cash_flows = build_cash_flows(COUPONS, MATURITIES, VALUATION_DATE)
+        self.dirty_prices = self.cash_flows.dirty_prices(self.discount(self.cash_flows.times))
+
+    def test_flat_curve_has_neither(self):
+        discount = functools.partial(svensson.discount_factors, np.array([0.03, 0, 0, 0, 1.0, 1.0]))
+        dirty_prices = self.cash_flows.dirty_prices(discount(self.cash_flows.times))
+
+        result = carry_roll_down(self.cash_flows, discount, dirty_prices, HORIZONS)
+
+        assert result.carry_bp.shape == (4, 3)
+        np.testing.assert_allclose(result.carry_bp, 0.0, atol=1e-8)
+        np.testing.assert_allclose(result.roll_down_bp, 0.0, atol=1e-8)
+
+    def test_matches_bond_by_bond_repricing(self):
+        result = carry_roll_down(self.cash_flows, self.discount, self.dirty_prices, HORIZONS)
+
+        # On the curve the bonds are priced on their z-spreads are zero, so the total is
+        # the aged flows' value on the same curve, with flows received before the horizon
+        # reinvested at the bond's yield, over the funded price.
+        yields = self.cash_flows.yields(self.dirty_prices)
+        for i in range(4):
+            times, amounts = self.cash_flows.times[i], self.cash_flows.amounts[i]
+            for j, horizon in enumerate(HORIZONS):
+                live = times > horizon
+                value = (amounts[live] * self.discount(times[live] - horizon)).sum() + (
+                    amounts[~live] * (1 + yields[i]) ** (horizon - times[~live])
+                ).sum()
+                expected = (value / self.dirty_prices[i] - 1 / self.discount(horizon)) * 1e4
+                assert abs(result.total_bp[i, j] - expected) < 1e-6, (i, j)
+        # The bond maturing inside every horizon earns its yield to the end and rolls nowhere.
+        np.testing.assert_allclose(result.roll_down_bp[3], 0.0, atol=1e-8)
+
+    def test_upward_sloping_curve_rolls_down(self):
+        result = carry_roll_down(self.cash_flows, self.discount, self.dirty_prices, HORIZONS)
+
+        # Yields above the short rate earn carry, and yields fall as the bonds shorten
+        # on the curve below its hump at about 20 years.
+        assert np.all(result.carry_bp[:3] > 0)
+        assert np.all(result.roll_down_bp[:2] > 0)
+        assert np.all(np.diff(result.total_bp[:3], axis=1) > 0)
+
+    def test_cheap_bond_keeps_its_spread(self):
+        cheap = self.dirty_prices - np.array([2.0, 0.0, 0.0, 0.0])
+
+        base = carry_roll_down(self.cash_flows, self.discount, self.dirty_prices, HORIZONS)
+        result = carry_roll_down(self.cash_flows, self.discount, cheap, HORIZONS)
+
+        assert np.all(result.carry_bp[0] > base.carry_bp[0])
+        np.testing.assert_allclose(result.total_bp[1:], base.total_bp[1:])
+
+    def test_tenors(self):
+        result = tenor_carry_roll_down(self.discount, HORIZONS)
+
+        tenors = np.array(CARRY_TENORS)[:, None]
+        # A zero-coupon bond's return over funding with the curve unchanged, exactly.
+        expected = (
+            self.discount(tenors - HORIZONS) / self.discount(tenors) - 1 / self.discount(HORIZONS)
+        ) * 1e4
+        np.testing.assert_allclose(result.total_bp, expected, atol=1e-8)
+        assert abs(result.total_bp[0, 2]) < 1e-8  # The 1y bond matures at the 1y horizon.
+
+    def test_breakeven(self):
+        breakevens = breakeven_bp(self.discount, HORIZONS)
+
+        assert breakevens.shape == (len(CARRY_TENORS), 3)
+        assert np.isnan(breakevens[0, 2])
+        # Rolled-down rates that far higher leave the tenor's return equal to funding.
+        tenor, horizon = 10.0, HORIZONS[1]
+        rise = breakevens[CARRY_TENORS.index(tenor), 1] * 1e-4
+        rolled_zero = -np.log(self.discount(tenor - horizon)) / (tenor - horizon)
+        horizon_value = np.exp(-(rolled_zero + rise) * (tenor - horizon))
+        assert abs(horizon_value / self.discount(tenor) - 1 / self.discount(horizon)) < 1e-12
@@ -0,0 +1,39 @@
+import numpy as np
+from django.test import SimpleTestCase
+
+from src.curve_engine import svensson
+from src.curve_engine.comparison import curve_difference
+
+BASE = np.array([0.025, -0.01, 0.005, 0.01, 0.5, 0.1])
+TTMS = np.arange(1, 301) / 10.0
+
+
+class TestCurveDifference(SimpleTestCase):
+    def test_parallel_shift(self):
+        difference = curve_difference(BASE, BASE + np.array([0.001, 0, 0, 0, 0, 0]), TTMS)
+
+        np.testing.assert_allclose(difference.zero_spreads_bp, 10.0, atol=1e-9)
+        np.testing.assert_allclose(difference.forward_spreads_bp, 10.0, atol=1e-9)
+        assert np.all(difference.discount_spreads < 0)
+
+    def test_matches_each_curve(self):
+        other = np.array([0.03, -0.02, 0.01, 0.02, 2.0, 0.1])
+
+        difference = curve_difference(BASE, other, TTMS)
+
+        np.testing.assert_allclose(
+            difference.zero_spreads_bp,
+            (svensson.zero_rates(other, TTMS) - svensson.zero_rates(BASE, TTMS)) * 1e4,
+        )
+        np.testing.assert_allclose(
+            difference.discount_spreads,
+            svensson.discount_factors(other, TTMS) - svensson.discount_factors(BASE, TTMS),
+            atol=1e-15,
+        )
+        # Forwards are the slope of minus the log discount factors.
+        step = 1e-5
+        numerical = (
+            np.log(svensson.discount_factors(other, TTMS - step))
+            - np.log(svensson.discount_factors(other, TTMS + step))
+        ) / (2 * step)
+        np.testing.assert_allclose(svensson.forward_rates(other, TTMS), numerical, atol=1e-8)
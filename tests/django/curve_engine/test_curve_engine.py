@@ -1,5 +1,6 @@
 import datetime as dt
 
+import numpy as np
 from django.test import TestCase
 
 from src.apps.yield_curves.models import (
@@ -73,3 +74,45 @@ class TestCalibrator(TestCase):
         assert abs(zero_rate_calibrated - bond3._yield) < 1e-6, (
             f"expected {bond3._yield}, got {zero_rate_calibrated}"
         )
+
+    def test_parameters(self):
+        parameters = self.calibrator.parameters
+
+        assert len(parameters) == 6
+        assert self.calibrator.max_ttm >= self.calibrator.bond_metrics[-1].ttm
+
+    def test_residuals(self):
+        residuals = self.calibrator.residuals()
+
+        for i, bond_metric in enumerate(self.calibrator.bond_metrics):
+            ql_bond = bond_metric.bond.build_ql_bond(self.calibrator.valuation_date)
+            ql_bond.setPricingEngine(self.calibrator.engine)
+            # Residuals time flows in years of DAYS_IN_YEAR days rather than Actual/Actual.
+            assert abs(residuals.fitted_clean_prices[i] - ql_bond.cleanPrice()) < 0.05
+        # Three bonds, six parameters: the curve goes through every price.
+        assert abs(residuals.residuals_bp).max() < 1.0
+
+    def test_spreads(self):
+        spreads = self.calibrator.spreads()
+
+        # The curve goes through every price, so no bond trades at a spread to it.
+        assert abs(spreads.zspreads_bp).max() < 1.0
+        assert abs(spreads.asset_swap_spreads_bp).max() < 1.0
+
+    def test_carry_roll_down(self):
+        result = self.calibrator.carry_roll_down([0.25, 0.5, 1.0])
+
+        assert result.carry_bp.shape == result.roll_down_bp.shape == (3, 3)
+        assert np.isfinite(result.total_bp).all()
+
+    def test_residuals_other_methods(self):
+        calibrator = YieldCurveCalibrator(
+            self.calibrator.bond_metrics,
+            valuation_date=self.calibrator.valuation_date,
+            fitting_method="nelson_siegel",
+        ).calibrate()
+
+        residuals = calibrator.residuals()
+
+        assert residuals.fitted_yields.shape == (3,)
+        assert abs(residuals.residuals_bp).max() < 5.0
@@ -0,0 +1,195 @@
+import asyncio
+import datetime as dt
+import multiprocessing
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from src.curve_engine import svensson
+from src.curve_engine.curve_store import (
+    GRID_TTMS,
+    CurveStore,
+    StoredCurve,
+    aget_curve,
+    quotes_fingerprint,
+)
+from src.curve_engine.executor import BondQuote, ZeroCurve
+from src.curve_engine.history import CurveHistory
+from src.utils.synthetic import SyntheticMarket, SyntheticMarketConfig
+
+VALUATION_DATE = dt.date(2024, 6, 3)
+PARAMS = np.array([0.025, -0.01, 0.005, 0.01, 0.5, 0.1])
+
+
+def make_curve(params=PARAMS, n_points=300):
+    ttms = GRID_TTMS[:n_points]
+    return StoredCurve(
+        parameters=params,
+        zero_rates=svensson.zero_rates(params, ttms),
+        discount_factors=svensson.discount_factors(params, ttms),
+    )
+
+
+def append_curves(path, worker, n_curves):
+    store = CurveStore(path)
+    for i in range(n_curves):
+        store.append("DE", VALUATION_DATE, f"{worker}-{i}".encode(), make_curve())
+    store.close()
+
+
+class TestCurveStore(SimpleTestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp_dir.name) / "curves.bin"
+        self.store = CurveStore(self.path)
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp_dir.cleanup()
+
+    def test_round_trip(self):
+        curve = make_curve()
+        self.store.append("DE", VALUATION_DATE, b"quotes", curve)
+
+        stored = self.store.get("DE", VALUATION_DATE, b"quotes")
+
+        np.testing.assert_array_equal(stored.parameters, PARAMS)
+        np.testing.assert_array_equal(stored.zero_rates, curve.zero_rates)
+        np.testing.assert_array_equal(stored.discount_factors, curve.discount_factors)
+        np.testing.assert_array_equal(stored.ttms, GRID_TTMS[:300])
+        # Served straight from the mapped file.
+        assert isinstance(stored.zero_rates, np.memmap)
+        assert not stored.zero_rates.flags.writeable
+
+    def test_misses(self):
+        self.store.append("DE", VALUATION_DATE, b"quotes", make_curve())
+
+        assert self.store.get("DE", VALUATION_DATE, b"repriced") is None
+        assert self.store.get("FR", VALUATION_DATE, b"quotes") is None
+        assert self.store.get("DE", VALUATION_DATE, b"quotes", "nelson_siegel") is None
+        assert self.store.get("DE", dt.date(2024, 6, 4), b"quotes") is None
+
+    def test_later_record_supersedes(self):
+        self.store.append("DE", VALUATION_DATE, b"quotes", make_curve())
+        self.store.append("DE", VALUATION_DATE, b"quotes", make_curve(PARAMS * 2))
+
+        np.testing.assert_array_equal(
+            self.store.get("DE", VALUATION_DATE, b"quotes").parameters, PARAMS * 2
+        )
+
+    def test_fingerprint_ending_in_nul(self):
+        self.store.append("DE", VALUATION_DATE, b"quotes\0", make_curve())
+
+        assert self.store.get("DE", VALUATION_DATE, b"quotes\0") is not None
+
+    def test_sees_appends_by_other_handles(self):
+        reader = CurveStore(self.path)
+        assert reader.get("DE", VALUATION_DATE, b"quotes") is None
+
+        self.store.append("DE", VALUATION_DATE, b"quotes", make_curve())
+
+        assert reader.get("DE", VALUATION_DATE, b"quotes") is not None
+        reader.close()
+
+    def test_concurrent_appends_from_processes(self):
+        context = multiprocessing.get_context("fork")
+        processes = [
+            context.Process(target=append_curves, args=(self.path, worker, 25))
+            for worker in range(4)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+        assert len(self.store) == 100
+        for worker in range(4):
+            for i in range(25):
+                stored = self.store.get("DE", VALUATION_DATE, f"{worker}-{i}".encode())
+                np.testing.assert_array_equal(stored.parameters, PARAMS)
+
+    def test_rejects_other_files(self):
+        other = Path(self.tmp_dir.name) / "other.bin"
+        other.write_bytes(b"x" * 128)
+
+        with self.assertRaises(ValueError):
+            CurveStore(other)
+
+    def test_from_zero_curve_stops_at_first_gap(self):
+        ttms = GRID_TTMS[:5].tolist()
+        zero_curve = ZeroCurve(
+            ttms=ttms[:3] + ttms[4:],
+            zero_rates=[0.01, 0.02, 0.03, 0.05],
+            discount_factors=[0.99, 0.98, 0.97, 0.95],
+            parameters=PARAMS.tolist(),
+        )
+
+        curve = StoredCurve.from_zero_curve(zero_curve)
+
+        np.testing.assert_array_equal(curve.zero_rates, [0.01, 0.02, 0.03])
+        np.testing.assert_array_equal(curve.ttms, GRID_TTMS[:3])
+
+
+class TestGetCurve(SimpleTestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.store = CurveStore(Path(self.tmp_dir.name) / "curves.bin")
+        market = SyntheticMarket(
+            SyntheticMarketConfig(start_date=VALUATION_DATE, end_date=VALUATION_DATE, n_bonds=30)
+        )
+        self.quotes = [
+            BondQuote(
+                isin=row.isin,
+                description=row.description,
+                coupon=row.coupon,
+                maturity_date=row.maturity_date,
+                clean_price=row.clean_price,
+            )
+            for row in next(market.iter_days()).itertuples()
+        ]
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp_dir.cleanup()
+
+    def test_fits_once(self):
+        with patch("src.curve_engine.curve_store.get_curve_store", return_value=self.store):
+            fitted = asyncio.run(aget_curve("DE", VALUATION_DATE, self.quotes))
+            stored = asyncio.run(aget_curve("DE", VALUATION_DATE, list(reversed(self.quotes))))
+
+        assert len(self.store) == 1
+        assert isinstance(stored.zero_rates, np.memmap)
+        np.testing.assert_array_equal(stored.parameters, fitted.parameters)
+        np.testing.assert_array_equal(stored.zero_rates, fitted.zero_rates)
+        np.testing.assert_allclose(
+            stored.zero_rates, svensson.zero_rates(stored.parameters, stored.ttms), atol=1e-12
+        )
+
+    def test_history_only_grows_at_the_end(self):
+        history = CurveHistory(self.tmp_dir.name)
+        later = VALUATION_DATE + dt.timedelta(days=1)
+        history.append("DE", later, PARAMS, 30.0)
+
+        with (
+            patch("src.curve_engine.curve_store.get_curve_store", return_value=self.store),
+            patch("src.curve_engine.curve_store.get_curve_history", return_value=history),
+        ):
+            asyncio.run(aget_curve("DE", VALUATION_DATE, self.quotes))
+            assert history.dates("DE").astype(object).tolist() == [later]
+            assert history._generation("DE") == 0
+
+            history = CurveHistory(Path(self.tmp_dir.name) / "empty")
+            with patch("src.curve_engine.curve_store.get_curve_history", return_value=history):
+                fitted = asyncio.run(aget_curve("FR", VALUATION_DATE, self.quotes))
+
+        assert history.dates("FR").astype(object).tolist() == [VALUATION_DATE]
+        np.testing.assert_array_equal(history.parameters("FR").values[0], fitted.parameters)
+
+    def test_fingerprint(self):
+        repriced = [*self.quotes[1:], BondQuote(**{**vars(self.quotes[0]), "clean_price": 1.0})]
+
+        assert quotes_fingerprint(self.quotes) == quotes_fingerprint(self.quotes[::-1])
+        assert quotes_fingerprint(self.quotes) != quotes_fingerprint(repriced)
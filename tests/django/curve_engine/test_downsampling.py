@@ -0,0 +1,69 @@
+import numpy as np
+from django.test import SimpleTestCase
+
+from src.curve_engine import svensson
+from src.curve_engine.downsampling import adaptive_indices, lttb_indices
+
+
+class TestLttb(SimpleTestCase):
+    def setUp(self):
+        self.x = np.arange(1000, dtype=float)
+        self.y = np.sin(self.x / 50.0)
+
+    def test_keeps_endpoints(self):
+        indices = lttb_indices(self.x, self.y, 100)
+
+        assert len(indices) == 100
+        assert indices[0] == 0
+        assert indices[-1] == 999
+        assert np.all(np.diff(indices) > 0)
+
+    def test_keeps_spikes(self):
+        self.y[437] = 5.0
+
+        assert 437 in lttb_indices(self.x, self.y, 50)
+
+    def test_spike_in_any_series(self):
+        other = np.cos(self.x / 50.0)
+        other[612] = -5.0
+
+        assert 612 in lttb_indices(self.x, np.column_stack([self.y, other]), 50)
+
+    def test_short_series_unchanged(self):
+        np.testing.assert_array_equal(lttb_indices(self.x[:10], self.y[:10], 50), np.arange(10))
+
+    def test_needs_three_points(self):
+        with self.assertRaises(ValueError):
+            lttb_indices(self.x, self.y, 2)
+
+
+class TestAdaptive(SimpleTestCase):
+    def setUp(self):
+        self.ttms = np.arange(1, 3001) * 0.01
+        self.zero_rates = svensson.zero_rates(
+            np.array([0.03, -0.02, 0.01, 0.02, 2.0, 0.1]), self.ttms
+        )
+
+    def test_denser_where_curve_bends(self):
+        indices = adaptive_indices(self.ttms, self.zero_rates, 60)
+
+        assert indices[0] == 0
+        assert indices[-1] == len(self.ttms) - 1
+        # Uniform spacing would put 4 of 60 points below 2 years.
+        assert np.sum(self.ttms[indices] < 2.0) > 8
+
+    def test_tracks_curve_better_than_uniform(self):
+        def max_error(indices):
+            interpolated = np.interp(self.ttms, self.ttms[indices], self.zero_rates[indices])
+            return np.abs(interpolated - self.zero_rates).max()
+
+        adaptive = adaptive_indices(self.ttms, self.zero_rates, 40)
+        uniform = np.linspace(0, len(self.ttms) - 1, len(adaptive)).astype(int)
+
+        assert max_error(adaptive) < max_error(uniform) / 2
+
+    def test_straight_line(self):
+        indices = adaptive_indices(self.ttms, 0.01 * self.ttms, 31)
+
+        assert len(indices) == 31
+        assert np.ptp(np.diff(indices)) <= 1
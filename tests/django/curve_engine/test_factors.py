@@ -0,0 +1,154 @@
+import datetime as dt
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from src.curve_engine.factors import CurveFactors, get_curve_factors
+from src.curve_engine.history import TENORS, CurveHistory
+
+PARAMS = np.array([0.025, -0.01, 0.005, 0.01, 0.5, 0.1])
+START = dt.date(2024, 1, 1)
+
+
+def curves(n_dates, seed=0):
+    """Curves whose level, slope and curvature each follow a random walk."""
+    rng = np.random.default_rng(seed)
+    dates = [START + dt.timedelta(days=i) for i in range(n_dates)]
+    params = np.tile(PARAMS, (n_dates, 1))
+    steps = rng.normal(size=(n_dates, 3)) * np.array([5e-4, 2e-4, 1e-4])
+    params[:, :3] += np.cumsum(steps, axis=0)
+    return dates, params, [30.0] * n_dates
+
+
+class TestCurveFactors(SimpleTestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.history = CurveHistory(Path(self.tmp_dir.name) / "history")
+        self.root = Path(self.tmp_dir.name) / "factors"
+        self.dates, self.params, self.max_ttms = curves(300)
+
+    def batch_changes(self):
+        rates = self.history.zero_rates("DE", list(TENORS))
+        return np.diff(rates.values, axis=0) * 1e4
+
+    def test_incremental_matches_batch(self):
+        factors = CurveFactors("DE", self.history)
+        self.history.extend("DE", self.dates[:100], self.params[:100], self.max_ttms[:100])
+        assert factors.update() == 99
+        for i in range(100, 120):
+            self.history.append("DE", self.dates[i], self.params[i], self.max_ttms[i])
+            assert factors.update() == 1
+        self.history.extend("DE", self.dates[120:], self.params[120:], self.max_ttms[120:])
+        factors.update()
+
+        changes = self.batch_changes()
+        assert factors.n_obs == len(changes) == 299
+        np.testing.assert_allclose(factors.means_bp, changes.mean(axis=0), atol=1e-10)
+        np.testing.assert_allclose(factors.covariance, np.cov(changes.T), rtol=1e-9, atol=1e-12)
+
+        result = factors.factors()
+        _, vectors = np.linalg.eigh(np.cov(changes.T))
+        for i in range(3):
+            assert abs(abs(result.loadings[i] @ vectors[:, -1 - i]) - 1.0) < 1e-8
+
+    def test_level_slope_curvature(self):
+        self.history.extend("DE", self.dates, self.params, self.max_ttms)
+
+        assert CurveFactors("DE", self.history).factors() is None  # Not updated yet.
+        factors = CurveFactors("DE", self.history)
+        factors.update()
+        result = factors.factors()
+
+        assert result.names == ["level", "slope", "curvature"]
+        assert result.loadings.shape == (3, len(TENORS))
+        np.testing.assert_allclose(result.loadings @ result.loadings.T, np.eye(3), atol=1e-12)
+        assert np.all(np.diff(result.explained) < 0)
+        assert result.explained.sum() > 0.99
+        # Level moves every tenor the same way; slope moves the long end against the short.
+        assert np.all(result.loadings[0] > 0)
+        assert result.loadings[1, -1] > 0 > result.loadings[1, 0]
+        assert factors.factors(5).names[3:] == ["pc4", "pc5"]
+
+    def test_scores(self):
+        self.history.extend("DE", self.dates, self.params, self.max_ttms)
+        factors = CurveFactors("DE", self.history)
+        factors.update()
+        result = factors.factors()
+
+        scores = factors.scores(result, self.dates[10], self.dates[19])
+
+        assert scores.dates[0] == np.datetime64(self.dates[10])
+        assert scores.values.shape == (10, 3)
+        expected = (self.batch_changes()[9:19] - result.means_bp) @ result.loadings.T
+        np.testing.assert_allclose(scores.values, expected, atol=1e-10)
+        assert len(factors.scores(result).dates) == 299
+        assert len(factors.scores(result, self.dates[-1] + dt.timedelta(days=1)).dates) == 0
+
+    def test_skips_gaps(self):
+        # A week missing from the history is not a daily change.
+        keep = np.r_[0:100, 107:300]
+        dates = [self.dates[i] for i in keep]
+        self.history.extend("DE", dates, self.params[keep], [30.0] * len(keep))
+        factors = CurveFactors("DE", self.history)
+
+        assert factors.update() == len(keep) - 2
+        result = factors.factors()
+        changes = np.delete(self.batch_changes(), 99, axis=0)
+        np.testing.assert_allclose(factors.means_bp, changes.mean(axis=0), atol=1e-10)
+        scores = factors.scores(result, dates[98], dates[101])
+        assert scores.dates.astype(object).tolist() == [dates[98], dates[99], dates[101]]
+
+    def test_state_is_saved(self):
+        self.history.extend("DE", self.dates[:200], self.params[:200], self.max_ttms[:200])
+        factors = CurveFactors("DE", self.history, self.root)
+        factors.update()
+        self.history.extend("DE", self.dates[200:], self.params[200:], self.max_ttms[200:])
+
+        restarted = CurveFactors("DE", self.history, self.root)
+        assert restarted.n_obs == 199
+        with patch.object(self.history, "zero_rates", wraps=self.history.zero_rates) as rates:
+            assert restarted.update() == 100
+        # Only the new dates, and the last one seen, are read.
+        assert rates.call_args.args[2] == self.dates[199]
+        np.testing.assert_allclose(
+            restarted.covariance, np.cov(self.batch_changes().T), rtol=1e-9, atol=1e-12
+        )
+        # Another process's factors pick up the saved state rather than recomputing it.
+        assert factors.update() == 0
+        assert factors.n_obs == 299
+
+    def test_rebuilds_when_history_is_refitted(self):
+        self.history.extend("DE", self.dates, self.params, self.max_ttms)
+        factors = CurveFactors("DE", self.history, self.root)
+        factors.update()
+
+        self.history.append("DE", self.dates[150], self.params[150] + 0.001, 30.0)
+        factors.update()
+
+        np.testing.assert_allclose(
+            factors.covariance, np.cov(self.batch_changes().T), rtol=1e-9, atol=1e-12
+        )
+
+    def test_get_curve_factors(self):
+        self.history.extend("DE", self.dates, self.params, self.max_ttms)
+
+        with patch("src.curve_engine.factors.get_curve_history", return_value=self.history):
+            factors = get_curve_factors("DE")
+        assert factors.n_obs == 299
+        assert (self.history.root / "DE" / "factors.npz").exists()
+
+        with patch("src.curve_engine.factors.get_curve_history", return_value=None):
+            assert get_curve_factors("DE") is None
+
+    def test_invalid_country(self):
+        with patch("src.curve_engine.factors.get_curve_history", return_value=self.history):
+            for country in ("../..", "de", "DEU"):
+                with self.assertRaises(ValueError):
+                    get_curve_factors(country)
+                with self.assertRaises(ValueError):
+                    CurveFactors(country, self.history, self.root)
+        assert not self.root.exists()
@@ -0,0 +1,116 @@
+import datetime as dt
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from src.curve_engine import svensson
+from src.curve_engine.history import TENORS, CurveHistory
+
+PARAMS = np.array([0.025, -0.01, 0.005, 0.01, 0.5, 0.1])
+START = dt.date(2024, 1, 1)
+
+
+def curves(n_dates, level=0.0):
+    dates = [START + dt.timedelta(days=i) for i in range(n_dates)]
+    params = np.tile(PARAMS, (n_dates, 1))
+    params[:, 0] += level + 1e-4 * np.arange(n_dates)
+    return dates, params, [30.0] * n_dates
+
+
+class TestCurveHistory(SimpleTestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.history = CurveHistory(self.tmp_dir.name)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_empty(self):
+        series = self.history.series("DE", 10.0)
+
+        assert len(series.dates) == len(series.values) == 0
+
+    def test_series_is_a_contiguous_view(self):
+        dates, params, max_ttms = curves(30)
+        self.history.extend("DE", dates[:10], params[:10], max_ttms[:10])
+        for i in range(10, 30):
+            self.history.append("DE", dates[i], params[i], max_ttms[i])
+
+        series = self.history.series("DE", 10.0, dates[5], dates[14])
+
+        assert series.dates.astype(object).tolist() == dates[5:15]
+        np.testing.assert_allclose(series.values, svensson.zero_rates(params[5:15], 10.0))
+        assert isinstance(series.values, np.memmap)
+        assert series.values.flags.c_contiguous
+
+    def test_standard_tenors_match_parameters(self):
+        dates, params, max_ttms = curves(5)
+        self.history.extend("DE", dates, params, max_ttms)
+
+        for tenor in TENORS:
+            np.testing.assert_allclose(
+                self.history.series("DE", tenor).values, svensson.zero_rates(params, tenor)
+            )
+        np.testing.assert_allclose(
+            self.history.series("DE", 12.5).values, svensson.zero_rates(params, 12.5)
+        )
+        np.testing.assert_array_equal(self.history.parameters("DE").values, params)
+
+    def test_inserts_and_replaces_out_of_order(self):
+        dates, params, max_ttms = curves(10)
+        self.history.extend("DE", dates[5:], params[5:], max_ttms[5:])
+        reader = CurveHistory(self.tmp_dir.name)
+        before = reader.parameters("DE")
+
+        self.history.extend("DE", dates[:5], params[:5], max_ttms[:5])
+        self.history.append("DE", dates[7], params[7] + 0.01, max_ttms[7])
+
+        expected = params.copy()
+        expected[7] += 0.01
+        after = reader.parameters("DE")
+        assert after.dates.astype(object).tolist() == dates
+        np.testing.assert_array_equal(after.values, expected)
+        # Maps taken before the rewrite still read the old generation.
+        np.testing.assert_array_equal(before.values, params[5:])
+
+    def test_latest_only(self):
+        dates, params, max_ttms = curves(3)
+        self.history.extend("DE", dates[1:2], params[1:2], max_ttms[1:2])
+
+        assert self.history.append("DE", dates[2], params[2], max_ttms[2], latest_only=True)
+        assert not self.history.append("DE", dates[0], params[0], max_ttms[0], latest_only=True)
+        assert not self.history.append(
+            "DE", dates[1], params[1] + 0.01, max_ttms[1], latest_only=True
+        )
+
+        assert self.history.dates("DE").astype(object).tolist() == dates[1:]
+        np.testing.assert_array_equal(self.history.parameters("DE").values, params[1:])
+        assert self.history._generation("DE") == 0
+
+    def test_identical_refit_is_a_no_op(self):
+        dates, params, max_ttms = curves(3)
+        self.history.extend("DE", dates, params, max_ttms)
+
+        self.history.append("DE", dates[1], params[1], max_ttms[1])
+
+        assert self.history._generation("DE") == 0
+
+    def test_countries_are_separate(self):
+        dates, params, max_ttms = curves(3)
+        self.history.extend("DE", dates, params, max_ttms)
+        self.history.extend("FR", dates[:1], params[:1] + 0.01, max_ttms[:1])
+
+        assert len(self.history.dates("DE")) == 3
+        assert len(self.history.dates("FR")) == 1
+
+    def test_invalid_country(self):
+        dates, params, max_ttms = curves(1)
+
+        for country in ("../..", "de", "DEU", "DE\n"):
+            with self.assertRaises(ValueError):
+                self.history.dates(country)
+            with self.assertRaises(ValueError):
+                self.history.extend(country, dates, params, max_ttms)
+        assert list(Path(self.tmp_dir.name).iterdir()) == []
@@ -0,0 +1,203 @@
+import asyncio
+import datetime as dt
+import threading
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from scripts.generate_synthetic_data import write_to_database
+from src.apps.yield_curves.models import Analysis, BondScatter
+from src.curve_engine.limiter import CalibrationLimiter, Overloaded
+from src.utils.configuration import conf
+from src.utils.synthetic import SyntheticMarket, SyntheticMarketConfig
+
+
+def metrics_token(token):
+    """A `conf.get` stand-in setting `calibration.metrics_token` to `token`."""
+    get = conf.get
+    return lambda key, default=None: (
+        token if key == "calibration.metrics_token" else get(key, default)
+    )
+
+
+class InMemorySlots:
+    """Global slots shared by the limiters of a test, standing in for separate processes."""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.tokens = set()
+        self.lock = threading.Lock()
+
+    def try_acquire(self, token):
+        with self.lock:
+            if len(self.tokens) >= self.limit:
+                return False
+            self.tokens.add(token)
+            return True
+
+    def release(self, token):
+        with self.lock:
+            self.tokens.discard(token)
+
+
+async def overload(limiters, n_requests, fit_s):
+    """Send `n_requests` concurrent fits round-robin to `limiters`; return outcomes and peak load."""
+    running = 0
+    peak = 0
+
+    async def fit(limiter):
+        nonlocal running, peak
+        try:
+            async with limiter.slot():
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(fit_s)
+                running -= 1
+        except Overloaded as e:
+            return e.status
+        return 200
+
+    outcomes = await asyncio.gather(*(fit(limiters[i % len(limiters)]) for i in range(n_requests)))
+    return outcomes, peak
+
+
+class TestCalibrationLimiter(SimpleTestCase):
+    def test_rejects_beyond_queue(self):
+        limiter = CalibrationLimiter(max_concurrent=2, max_queue=3, max_wait_s=5.0)
+
+        outcomes, peak = asyncio.run(overload([limiter], n_requests=10, fit_s=0.05))
+
+        assert peak == 2
+        assert outcomes.count(200) == 5
+        assert outcomes.count(429) == 5
+        assert limiter.rejected == {"queue_full": 5, "timeout": 0, "global": 0}
+        assert limiter.active == limiter.waiting == 0
+
+    def test_times_out_in_queue(self):
+        limiter = CalibrationLimiter(max_concurrent=1, max_queue=5, max_wait_s=0.05)
+
+        outcomes, _ = asyncio.run(overload([limiter], n_requests=4, fit_s=0.2))
+
+        assert outcomes == [200, 503, 503, 503]
+        assert limiter.rejected["timeout"] == 3
+        assert limiter.active == limiter.waiting == 0
+
+    def test_shared_across_threads(self):
+        # Under WSGI each request runs its async view in its own thread and event loop.
+        limiter = CalibrationLimiter(max_concurrent=2, max_queue=20, max_wait_s=5.0)
+        running = 0
+        peak = 0
+        lock = threading.Lock()
+        outcomes = []
+
+        async def fit():
+            nonlocal running, peak
+            async with limiter.slot():
+                with lock:
+                    running += 1
+                    peak = max(peak, running)
+                await asyncio.sleep(0.02)
+                with lock:
+                    running -= 1
+            outcomes.append(200)
+
+        threads = [threading.Thread(target=asyncio.run, args=(fit(),)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert peak == 2
+        assert len(outcomes) == 8
+        assert limiter.active == 0
+
+    def test_global_limit(self):
+        slots = InMemorySlots(limit=1)
+        limiters = [
+            CalibrationLimiter(
+                max_concurrent=2,
+                max_queue=2,
+                max_wait_s=0.3,
+                global_slots=slots,
+                global_poll_s=0.01,
+            )
+            for _ in range(2)
+        ]
+
+        outcomes, peak = asyncio.run(overload(limiters, n_requests=4, fit_s=0.05))
+
+        assert peak == 1
+        assert outcomes.count(200) == 4
+        assert not slots.tokens
+
+    def test_metrics(self):
+        limiter = CalibrationLimiter(max_concurrent=1, max_queue=0, max_wait_s=1.0)
+        asyncio.run(overload([limiter], n_requests=3, fit_s=0.01))
+
+        metrics = limiter.metrics({"pid": "1"})
+
+        assert 'calibration_queue_depth{pid="1"} 0' in metrics
+        assert 'calibration_admitted_total{pid="1"} 1' in metrics
+        assert 'calibration_rejected_total{pid="1",reason="queue_full"} 2' in metrics
+
+    def test_retry_after_scales_with_queue(self):
+        limiter = CalibrationLimiter(max_concurrent=2, max_queue=8, max_wait_s=1.0, mean_fit_s=3.0)
+
+        assert limiter.retry_after_s() == 2
+
+
+class TestZeroCurveOverloaded(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        valuation_date = dt.date(2024, 6, 3)
+        write_to_database(
+            SyntheticMarket(
+                SyntheticMarketConfig(
+                    start_date=valuation_date, end_date=valuation_date, n_bonds=10
+                )
+            )
+        )
+        cls.user = User.objects.create_user(username="limited", password="password")
+        analysis = Analysis.objects.create(name="Limited", user=cls.user)
+        scatter = BondScatter.objects.create(analysis=analysis, country="DE", date=valuation_date)
+        cls.url = reverse("yield_curves:get_zero_curve_data", args=[analysis.id, scatter.id])
+
+    def test_rejected_with_retry_after(self):
+        self.client.force_login(self.user)
+        full = CalibrationLimiter(max_concurrent=0, max_queue=0, max_wait_s=1.0, mean_fit_s=2.5)
+
+        with patch("src.curve_engine.curve_store.get_limiter", return_value=full):
+            response = self.client.get(self.url)
+
+        assert response.status_code == 429
+        assert response["Retry-After"] == "3"
+        assert "queue full" in response.json()["error"]
+
+    def test_metrics_endpoint(self):
+        staff = User.objects.create_user(username="staff", password="password", is_staff=True)
+        self.client.force_login(staff)
+
+        response = self.client.get(reverse("yield_curves:calibration_metrics"))
+
+        assert response.status_code == 200
+        assert "calibration_rejected_total" in response.content.decode()
+
+    def test_metrics_endpoint_forbidden(self):
+        self.client.force_login(self.user)
+
+        with patch("src.apps.yield_curves.views.conf.get", side_effect=metrics_token(None)):
+            response = self.client.get(reverse("yield_curves:calibration_metrics"))
+
+        assert response.status_code == 403
+
+    def test_metrics_endpoint_token(self):
+        url = reverse("yield_curves:calibration_metrics")
+
+        with patch("src.apps.yield_curves.views.conf.get", side_effect=metrics_token("secret")):
+            response = self.client.get(url, headers={"authorization": "Bearer secret"})
+            wrong = self.client.get(url, headers={"authorization": "Bearer wrong"})
+
+        assert response.status_code == 200
+        assert wrong.status_code == 403
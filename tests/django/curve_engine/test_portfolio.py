@@ -0,0 +1,105 @@
+import datetime as dt
+import tempfile
+
+import numpy as np
+from django.test import TestCase
+
+from scripts.generate_synthetic_data import write_to_database
+from src.apps.yield_curves.models import BondMetric
+from src.curve_engine import svensson
+from src.curve_engine.cashflows import build_cash_flows
+from src.curve_engine.history import CurveHistory
+from src.curve_engine.portfolio import Holding, Portfolio
+from src.utils.synthetic import SyntheticMarket, SyntheticMarketConfig
+
+
+class TestPortfolio(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.market = SyntheticMarket(
+            SyntheticMarketConfig(
+                start_date=dt.date(2024, 1, 1), end_date=dt.date(2024, 1, 31), n_bonds=20
+            )
+        )
+        write_to_database(cls.market)
+        cls.isins = list(
+            BondMetric.objects.filter(date=dt.date(2024, 1, 31))
+            .order_by("bond_id")
+            .values_list("bond_id", flat=True)[:4]
+        )
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.history = CurveHistory(self.tmp_dir.name)
+        self.history.extend(
+            "DE", self.market.dates, self.market.curve_params, [30.0] * len(self.market.dates)
+        )
+        self.portfolio, self.missing = Portfolio.load(
+            "DE",
+            [
+                Holding(self.isins[0], 1e6),
+                Holding(self.isins[1], 2e6),
+                Holding("XX0000000000", 1e6),
+                Holding(self.isins[2], -5e5),
+                Holding(self.isins[0], 1e6),
+            ],
+        )
+
+    def valuation(self, **kwargs):
+        valuations = list(self.portfolio.valuations(self.history, **kwargs))
+        return (
+            np.concatenate([valuation.dates for valuation in valuations]),
+            *(
+                np.vstack([getattr(valuation, name) for valuation in valuations])
+                for name in ("model_values", "market_values", "dv01s")
+            ),
+        )
+
+    def test_load(self):
+        assert self.portfolio.isins == self.isins[:3]
+        assert self.portfolio.notionals.tolist() == [2e6, 2e6, -5e5]
+        assert self.missing == ["XX0000000000"]
+
+    def test_values(self):
+        dates, model_values, market_values, dv01s = self.valuation()
+
+        assert len(dates) == len(self.market.dates)
+        row = 10
+        date = self.market.dates[row]
+        bonds = [BondMetric.objects.get(bond_id=isin, date=date) for isin in self.portfolio.isins]
+        cash_flows = build_cash_flows(
+            [float(metric.bond.coupon) for metric in bonds],
+            [metric.bond.maturity_date for metric in bonds],
+            date,
+        )
+        scale = self.portfolio.notionals / 100.0
+
+        def model(shift):
+            params = self.market.curve_params[row] + np.array([shift, 0, 0, 0, 0, 0])
+            return cash_flows.dirty_prices(svensson.discount_factors(params, cash_flows.times))
+
+        np.testing.assert_allclose(model_values[row], model(0.0) * scale)
+        dirty_prices = np.array([float(metric.dirty_price) for metric in bonds])
+        np.testing.assert_allclose(market_values[row], dirty_prices * scale)
+        np.testing.assert_allclose(dv01s[row], (model(-1e-4) - model(1e-4)) / 2 * scale, rtol=1e-6)
+
+    def test_market_value_is_quoted_dirty_price(self):
+        date = self.market.dates[10]
+        BondMetric.objects.filter(bond_id=self.isins[1], date=date).update(dirty_price=101.25)
+
+        _, _, market_values, _ = self.valuation(start=date, end=date)
+
+        assert market_values[0, 1] == 101.25 * 2e6 / 100.0
+
+    def test_chunks(self):
+        whole = self.valuation()
+        chunked = self.valuation(max_rows=7)
+
+        for a, b in zip(whole, chunked, strict=True):
+            np.testing.assert_array_equal(a, b)
+
+    def test_range(self):
+        dates, *_ = self.valuation(start=dt.date(2024, 1, 10), end=dt.date(2024, 1, 12))
+
+        assert dates.tolist() == [dt.date(2024, 1, 10), dt.date(2024, 1, 11), dt.date(2024, 1, 12)]
@@ -0,0 +1,68 @@
+import datetime as dt
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from src.curve_engine import svensson
+from src.curve_engine.cashflows import build_cash_flows
+from src.curve_engine.scenarios import KEY_RATE_TENORS, Scenario, ScenarioEngine
+
+VALUATION_DATE = dt.date(2025, 3, 14)
+PARAMS = np.array([0.03, -0.02, 0.01, 0.02, 2.0, 0.1])
+COUPONS = [2.5, 0.0, 4.0, 1.0]
+MATURITIES = [dt.date(2032, 2, 15), dt.date(2035, 3, 14), dt.date(2045, 7, 4), dt.date(2026, 1, 15)]
+
+
+class TestScenarios(SimpleTestCase):
+    def setUp(self):
+        self.engine = ScenarioEngine.from_svensson(COUPONS, MATURITIES, VALUATION_DATE, PARAMS)
+
+    def test_parallel_matches_shifted_curve(self):
+        pnl = self.engine.pnl([Scenario.parallel(25), Scenario.parallel(-50)])
+
+        cash_flows = build_cash_flows(COUPONS, MATURITIES, VALUATION_DATE)
+        for column, bp in enumerate([25, -50]):
+            shifted = PARAMS + np.array([bp * 1e-4, 0, 0, 0, 0, 0])
+            expected = cash_flows.dirty_prices(svensson.discount_factors(shifted, cash_flows.times))
+            np.testing.assert_allclose(pnl[:, column], expected - self.engine.base_prices)
+        assert (pnl[:, 0] < 0).all()
+
+    def test_key_rate_dv01s(self):
+        key_rate_dv01s = self.engine.key_rate_dv01s()
+
+        parallel = self.engine.pnl([Scenario.parallel(1), Scenario.parallel(-1)])
+        np.testing.assert_allclose(
+            key_rate_dv01s.sum(axis=1), (parallel[:, 1] - parallel[:, 0]) / 2, rtol=1e-6
+        )
+        # A 10 year zero coupon bond moves (almost) only with the 10 year rate.
+        zero_coupon = key_rate_dv01s[1]
+        assert zero_coupon[KEY_RATE_TENORS.index(10.0)] > 0.999 * zero_coupon.sum()
+
+    def test_shapes(self):
+        twist = Scenario.twist(-10, 20)
+        butterfly = Scenario.butterfly(10, -10, belly=5.0)
+
+        assert twist.shifts_bp[0] == -10 and twist.shifts_bp[-1] == 20
+        assert np.all(np.diff(twist.shifts_bp) > 0)
+        assert butterfly.shifts_bp[KEY_RATE_TENORS.index(5.0)] == -10
+        assert butterfly.shifts_bp[0] == butterfly.shifts_bp[-1] == 10
+
+    def test_chunks(self):
+        scenarios = [Scenario.parallel(bp) for bp in range(-50, 51, 10)]
+        chunked = ScenarioEngine.from_svensson(COUPONS, MATURITIES, VALUATION_DATE, PARAMS)
+        chunked.chunk_size = 3
+
+        np.testing.assert_allclose(chunked.pnl(scenarios), self.engine.pnl(scenarios))
+
+    def test_from_spec(self):
+        assert Scenario.from_spec({"type": "key_rate", "tenor": 10, "bp": 5}) == Scenario.key_rate(
+            10.0, 5.0
+        )
+        for spec in (
+            {"type": "cubic"},
+            {"type": "parallel"},
+            {"type": "key_rate", "tenor": 4, "bp": 1},
+            {"type": "butterfly", "wings_bp": 1, "belly_bp": 1, "belly": 40},
+        ):
+            with self.assertRaises(ValueError):
+                Scenario.from_spec(spec)
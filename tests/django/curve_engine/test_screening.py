@@ -0,0 +1,119 @@
+import datetime as dt
+import tempfile
+from unittest.mock import patch
+
+import numpy as np
+from django.test import TestCase
+
+from scripts.generate_synthetic_data import write_to_database
+from src.apps.yield_curves.models import BondMetric
+from src.curve_engine.history import CurveHistory
+from src.curve_engine.residuals import svensson_residuals
+from src.curve_engine.screening import Quotes, RichCheapScreen, _screens, get_screen
+from src.utils.synthetic import SyntheticMarket, SyntheticMarketConfig
+
+
+class TestRichCheapScreen(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.market = SyntheticMarket(
+            SyntheticMarketConfig(
+                start_date=dt.date(2024, 1, 1), end_date=dt.date(2024, 3, 29), n_bonds=20
+            )
+        )
+        write_to_database(cls.market)
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.history = CurveHistory(self.tmp_dir.name)
+        self.extend_history(0, 40)
+
+    def extend_history(self, start, end):
+        self.history.extend(
+            "DE",
+            self.market.dates[start:end],
+            self.market.curve_params[start:end],
+            [30.0] * (end - start),
+        )
+
+    def test_matches_residuals_of_one_date(self):
+        screen = RichCheapScreen("DE", self.history)
+
+        assert screen.update() == 40
+        date = self.market.dates[17]
+        bond_metrics = list(BondMetric.curve_universe("DE").filter(date=date).order_by("bond_id"))
+        expected = svensson_residuals(bond_metrics, date, self.market.curve_params[17])
+        row = screen.residuals_bp[list(screen.dates).index(np.datetime64(date))]
+        columns = [screen.isins.index(metric.bond_id) for metric in bond_metrics]
+        np.testing.assert_allclose(row[columns], expected.residuals_bp, atol=1e-3)
+        # Quoted bonds only; the rest of the row is NaN.
+        assert np.isnan(row).sum() == len(screen.isins) - len(bond_metrics)
+
+    def test_incremental_update(self):
+        screen = RichCheapScreen("DE", self.history, chunk_size=16)
+        screen.update()
+        self.extend_history(40, len(self.market.dates))
+
+        with patch.object(Quotes, "load", wraps=Quotes.load) as load:
+            added = screen.update()
+
+        assert added == len(self.market.dates) - 40
+        assert load.call_args_list[0].args == ("DE", self.market.dates[40], self.market.dates[55])
+        rebuilt = RichCheapScreen("DE", self.history)
+        rebuilt.update()
+        assert screen.isins == rebuilt.isins
+        np.testing.assert_array_equal(screen.residuals_bp, rebuilt.residuals_bp)
+        assert screen.update() == 0
+
+    def test_rebuilds_after_refit(self):
+        screen = RichCheapScreen("DE", self.history)
+        screen.update()
+        before = screen.residuals_bp[5].copy()
+
+        params = self.market.curve_params[5] + np.array([0.001, 0, 0, 0, 0, 0])
+        self.history.append("DE", self.market.dates[5], params, 30.0)
+        screen.update()
+
+        assert len(screen.dates) == 40
+        quoted = ~np.isnan(before)
+        # Raising the level by 10bp makes every bond 10bp richer to the curve.
+        np.testing.assert_allclose(screen.residuals_bp[5][quoted], before[quoted] - 10.0, atol=0.5)
+
+    def test_zscores(self):
+        screen = RichCheapScreen("DE", self.history)
+        screen.dates = np.array(self.market.dates[:6], dtype="datetime64[D]")
+        screen.isins = ["A", "B", "C"]
+        screen.residuals_bp = np.array(
+            [
+                [1.0, 0.0, 5.0],
+                [2.0, 0.0, np.nan],
+                [3.0, 0.0, 5.0],
+                [4.0, np.nan, 5.0],
+                [5.0, 0.0, np.nan],
+                [9.0, 0.0, np.nan],
+            ],
+            dtype=np.float32,
+        )
+
+        zscores = screen.zscores(window=5, min_obs=3)
+
+        assert zscores.date == screen.dates[-1]
+        assert list(zscores.isins) == ["A", "B"]
+        window = np.array([2.0, 3.0, 4.0, 5.0, 9.0])
+        assert zscores.zscores[0] == (9.0 - window.mean()) / window.std(ddof=1)
+        assert list(zscores.n_obs) == [5, 4]
+        # A bond whose residual never moves has no z-score.
+        assert np.isnan(zscores.zscores[1])
+        earlier = screen.zscores(self.market.dates[2], window=5, min_obs=3)
+        assert list(earlier.isins) == ["A", "B", "C"]
+        assert earlier.zscores[2] != earlier.zscores[2]
+        assert screen.zscores(dt.date(2000, 1, 1)) is None
+
+    def test_get_screen_rejects_invalid_countries(self):
+        with patch("src.curve_engine.screening.get_curve_history", return_value=self.history):
+            for country in ("../..", "de", "DEU"):
+                with self.assertRaises(ValueError):
+                    get_screen(country)
+            assert get_screen("DE").dates.tolist() == self.market.dates[:40]
+        assert set(_screens) <= {"DE"}
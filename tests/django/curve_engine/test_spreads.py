@@ -0,0 +1,64 @@
+import datetime as dt
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from src.curve_engine import svensson
+from src.curve_engine.cashflows import build_cash_flows
+from src.curve_engine.screening import Quotes
+from src.curve_engine.spreads import asset_swap_spreads, quote_spreads, zspreads
+
+VALUATION_DATE = dt.date(2025, 3, 14)
+PARAMS = np.array([0.03, -0.02, 0.01, 0.02, 2.0, 0.1])
+COUPONS = [2.5, 0.0, 4.0, 1.0]
+MATURITIES = [dt.date(2032, 2, 15), dt.date(2035, 3, 14), dt.date(2045, 7, 4), dt.date(2026, 1, 15)]
+SPREADS = np.array([0.0025, -0.001, 0.004, 0.0])
+
+
+class TestSpreads(SimpleTestCase):
+    def setUp(self):
+        self.cash_flows = build_cash_flows(COUPONS, MATURITIES, VALUATION_DATE)
+        self.discount = svensson.discount_factors(PARAMS, self.cash_flows.times)
+        # Shifting beta0 shifts every continuously compounded zero rate in parallel.
+        shifted = np.stack([PARAMS + np.array([s, 0, 0, 0, 0, 0]) for s in SPREADS])
+        self.dirty_prices = self.cash_flows.dirty_prices(
+            svensson.discount_factors(shifted[:, None, :], self.cash_flows.times)
+        )
+
+    def test_zspreads_recover_shift(self):
+        np.testing.assert_allclose(
+            zspreads(self.cash_flows, self.discount, self.dirty_prices), SPREADS, atol=1e-12
+        )
+
+    def test_asset_swap_spreads(self):
+        asw = asset_swap_spreads(self.cash_flows, self.discount, self.dirty_prices)
+
+        assert asw[3] == 0.0
+        # Same sign as the z-spread and of similar size.
+        assert np.all(np.sign(asw[:3]) == np.sign(SPREADS[:3]))
+        np.testing.assert_allclose(asw[:3], SPREADS[:3], rtol=0.3)
+        annuity = np.where(self.cash_flows.times[0] > 0, self.discount[0], 0.0).sum() / 2
+        curve_price = self.cash_flows.dirty_prices(self.discount)[0]
+        assert abs(asw[0] - (curve_price - self.dirty_prices[0]) / 100 / annuity) < 1e-15
+
+    def test_quote_spreads_across_dates(self):
+        dates = np.array([VALUATION_DATE, VALUATION_DATE + dt.timedelta(days=1)], dtype="M8[D]")
+        params = np.stack([PARAMS, PARAMS + np.array([0.001, 0, 0, 0, 0, 0])])
+        quotes = Quotes(
+            dates=np.repeat(dates, 2),
+            isins=np.array(["A", "B", "A", "B"]),
+            clean_prices=np.array([97.5, 75.0, 97.4, 74.0]),
+            coupons=np.array([2.5, 0.0, 2.5, 0.0]),
+            maturity_dates=np.array([MATURITIES[0], MATURITIES[1]] * 2, dtype="M8[D]"),
+        )
+
+        spreads = quote_spreads(dates, params, quotes)
+
+        for i in range(4):
+            cash_flows = build_cash_flows(
+                quotes.coupons[i : i + 1], quotes.maturity_dates[i : i + 1], quotes.dates[i].item()
+            )
+            discount = svensson.discount_factors(params[i // 2], cash_flows.times)
+            dirty = quotes.clean_prices[i : i + 1] + cash_flows.accrued
+            expected = zspreads(cash_flows, discount, dirty)[0] * 1e4
+            assert abs(spreads.zspreads_bp[i] - expected) < 1e-8
@@ -0,0 +1,119 @@
+import datetime as dt
+
+import numpy as np
+import QuantLib as ql
+from django.test import SimpleTestCase
+
+from src.apps.yield_curves.models import Bond, BondMetric
+from src.curve_engine import svensson
+from src.curve_engine.cashflows import build_cash_flows
+from src.curve_engine.curve_engine import YieldCurveCalibrator
+from src.utils.synthetic import SyntheticMarket, SyntheticMarketConfig
+
+
+class TestSvensson(SimpleTestCase):
+    def setUp(self):
+        market = SyntheticMarket(
+            SyntheticMarketConfig(
+                start_date=dt.date(2024, 3, 1),
+                end_date=dt.date(2024, 3, 1),
+                n_bonds=40,
+                price_noise=0.0,
+            )
+        )
+        self.params = market.curve_params[0]
+        day = next(market.iter_days())
+        bond_metrics = [
+            BondMetric(
+                date=row.date,
+                clean_price=row.clean_price,
+                dirty_price=row.dirty_price,
+                _yield=0.0,
+                bond=Bond(
+                    isin=row.isin,
+                    description=row.description,
+                    coupon=row.coupon,
+                    maturity_date=row.maturity_date,
+                ),
+            )
+            for row in day.itertuples()
+        ]
+        self.calibrator = YieldCurveCalibrator(bond_metrics, dt.date(2024, 3, 1))
+        self.calibrator.calibrate()
+
+    def test_matches_quantlib_curve(self):
+        fitted = np.array(self.calibrator.parameters)
+        ttms = np.linspace(0.25, 25.0, 25)
+
+        expected = [self.calibrator.zero_rate(ttm) for ttm in ttms]
+        np.testing.assert_allclose(svensson.zero_rates(fitted, ttms), expected, atol=1e-12)
+
+        expected = [self.calibrator.discount_factor(ttm) for ttm in ttms]
+        np.testing.assert_allclose(svensson.discount_factors(fitted, ttms), expected, atol=1e-12)
+
+    def test_forward_rates_match_quantlib_curve(self):
+        fitted = np.array(self.calibrator.parameters)
+        ttms = np.linspace(0.25, 25.0, 25)
+
+        # QuantLib's instantaneous forwards are differences over a small step.
+        expected = [
+            self.calibrator.curve.forwardRate(ttm, ttm, ql.Continuous).rate() for ttm in ttms
+        ]
+        np.testing.assert_allclose(svensson.forward_rates(fitted, ttms), expected, atol=1e-6)
+
+    def test_recovers_synthetic_curve(self):
+        ttms = np.linspace(1.0, 25.0, 25)
+        fitted = [self.calibrator.zero_rate(ttm) for ttm in ttms]
+        np.testing.assert_allclose(fitted, svensson.zero_rates(self.params, ttms), atol=5e-4)
+
+
+class TestCashFlows(SimpleTestCase):
+    def test_accrued_matches_quantlib(self):
+        valuation_date = dt.date(2025, 3, 14)
+        cash_flows = build_cash_flows(
+            [2.5, 0.0], [dt.date(2032, 2, 15), dt.date(2026, 5, 31)], valuation_date
+        )
+
+        ql.Settings.instance().evaluationDate = ql.Date(14, 3, 2025)
+        schedule = ql.Schedule(
+            ql.Date(15, 2, 2020),
+            ql.Date(15, 2, 2032),
+            ql.Period(ql.Semiannual),
+            ql.NullCalendar(),
+            ql.Unadjusted,
+            ql.Unadjusted,
+            ql.DateGeneration.Backward,
+            False,
+        )
+        ql_bond = ql.FixedRateBond(
+            0, 100.0, schedule, [0.025], ql.ActualActual(ql.ActualActual.ISMA)
+        )
+
+        assert abs(cash_flows.accrued[0] - ql_bond.accruedAmount()) < 1e-10
+        assert cash_flows.accrued[1] == 0.0
+        assert cash_flows.amounts[0].sum() == 100.0 + 14 * 1.25
+        assert cash_flows.amounts[1].sum() == 100.0
+
+    def test_yields(self):
+        cash_flows = build_cash_flows(
+            [2.5, 0.0, 4.0],
+            [dt.date(2032, 2, 15), dt.date(2026, 5, 31), dt.date(2045, 7, 4)],
+            dt.date(2025, 3, 14),
+        )
+        dirty_prices = cash_flows.dirty_prices(1.03**-cash_flows.times)
+        np.testing.assert_allclose(cash_flows.yields(dirty_prices), 0.03, atol=1e-12)
+
+    def test_valuation_date_per_bond(self):
+        coupons = [2.5, 4.0]
+        maturities = [dt.date(2032, 2, 15), dt.date(2045, 7, 4)]
+        valuation_dates = [dt.date(2025, 3, 14), dt.date(2030, 8, 1)]
+
+        cash_flows = build_cash_flows(coupons, maturities, np.array(valuation_dates))
+
+        for i, valuation_date in enumerate(valuation_dates):
+            single = build_cash_flows(coupons[i : i + 1], maturities[i : i + 1], valuation_date)
+            n_flows = single.times.shape[1]
+            np.testing.assert_array_equal(cash_flows.times[i, :n_flows], single.times[0])
+            np.testing.assert_array_equal(cash_flows.amounts[i, :n_flows], single.amounts[0])
+            assert not cash_flows.amounts[i, n_flows:].any()
+            assert cash_flows.accrued[i] == single.accrued[0]
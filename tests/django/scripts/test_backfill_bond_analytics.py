@@ -0,0 +1,40 @@
+import datetime as dt
+
+from django.test import TestCase
+
+from scripts.backfill_bond_analytics import backfill
+from scripts.generate_synthetic_data import write_to_database
+from src.apps.yield_curves.models import BondMetric
+from src.curve_engine.analytics import ANALYTICS_FIELDS
+from src.utils.synthetic import SyntheticMarket, SyntheticMarketConfig
+
+
+class TestBackfillAnalytics(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        market = SyntheticMarket(
+            SyntheticMarketConfig(
+                start_date=dt.date(2024, 1, 1), end_date=dt.date(2024, 1, 10), n_bonds=30
+            )
+        )
+        write_to_database(market)
+        cls.expected = {
+            metric.pk: [getattr(metric, field) for field in ANALYTICS_FIELDS]
+            for metric in BondMetric.objects.all()
+        }
+
+    def test_backfill(self):
+        BondMetric.objects.filter(date__gte=dt.date(2024, 1, 5)).update(
+            **dict.fromkeys(ANALYTICS_FIELDS)
+        )
+        n_missing = BondMetric.objects.filter(modified_duration__isnull=True).count()
+
+        n_rows = backfill(chunk_size=50)
+
+        assert n_rows == n_missing > 0
+        assert not BondMetric.objects.filter(modified_duration__isnull=True).exists()
+        for metric in BondMetric.objects.all():
+            assert [getattr(metric, field) for field in ANALYTICS_FIELDS] == self.expected[
+                metric.pk
+            ]
+        assert backfill() == 0
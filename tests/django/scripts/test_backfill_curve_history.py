@@ -0,0 +1,50 @@
+import datetime as dt
+import tempfile
+
+import numpy as np
+from django.test import TestCase
+
+from scripts.backfill_curve_history import backfill
+from scripts.generate_synthetic_data import write_to_database
+from src.curve_engine import svensson
+from src.curve_engine.history import CurveHistory
+from src.utils.synthetic import SyntheticMarket, SyntheticMarketConfig
+
+
+class TestBackfill(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.market = SyntheticMarket(
+            SyntheticMarketConfig(
+                start_date=dt.date(2024, 1, 1), end_date=dt.date(2024, 1, 10), n_bonds=30
+            )
+        )
+        write_to_database(cls.market)
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.history = CurveHistory(self.tmp_dir.name)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_backfill(self):
+        n_dates = backfill(self.history, "DE", end=dt.date(2024, 1, 5), chunk_size=2)
+
+        dates = self.history.dates("DE").astype(object).tolist()
+        assert n_dates == len(dates) == len([d for d in self.market.dates if d.day <= 5])
+        assert dates == sorted(dates)
+        # The fitted curves recover the synthetic market's.
+        np.testing.assert_allclose(
+            self.history.series("DE", 10.0).values,
+            svensson.zero_rates(self.market.curve_params[:n_dates], 10.0),
+            atol=5e-4,
+        )
+
+    def test_skips_dates_already_in_history(self):
+        backfill(self.history, "DE", end=dt.date(2024, 1, 5))
+
+        n_dates = backfill(self.history, "DE")
+
+        assert n_dates == len(self.market.dates) - len([d for d in self.market.dates if d.day <= 5])
+        assert len(self.history.dates("DE")) == len(self.market.dates)
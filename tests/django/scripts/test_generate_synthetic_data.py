@@ -0,0 +1,34 @@
+import datetime as dt
+
+from django.test import TestCase
+
+from scripts.generate_synthetic_data import run, write_to_database
+from src.apps.yield_curves.models import Bond, BondMetric
+from src.utils.synthetic import SyntheticMarket, SyntheticMarketConfig
+
+
+class TestWriteToDatabase(TestCase):
+    def test_write_to_database(self):
+        market = SyntheticMarket(
+            SyntheticMarketConfig(
+                start_date=dt.date(2024, 1, 1),
+                end_date=dt.date(2024, 1, 5),
+                n_bonds=30,
+            )
+        )
+
+        write_to_database(market)
+        # Idempotent: a second run updates rather than duplicates rows.
+        write_to_database(market)
+
+        assert Bond.objects.count() == len(market.bonds)
+        assert BondMetric.objects.count() == len(market.frame())
+        assert BondMetric.objects.values("date").distinct().count() == 5
+
+    def test_database_is_opt_in(self):
+        # Synthetic bonds would join the real Bund universe, so only write them when asked.
+        assert run("start=2024-01-01", "end=2024-01-05") == 0
+        assert not Bond.objects.exists()
+
+        assert run("start=2024-01-01", "end=2024-01-05", "n_bonds=10", "db=true") == 0
+        assert Bond.objects.exists()
@@ -0,0 +1,205 @@
+import datetime as dt
+import io
+from unittest.mock import Mock, patch
+
+import pandas as pd
+from django.db import IntegrityError, connection, transaction
+from django.test import SimpleTestCase, TestCase
+
+from scripts.get_bund_data import (
+    WORKBOOK_ENTRY,
+    BundesbankDataExtractor,
+    BundesbankDataLoader,
+    BundesbankDataTransformer,
+    ExcelFile,
+    ExcelSheet,
+    File,
+    file_version,
+    parse_args,
+)
+from src.apps.yield_curves.models import BondMetric, IngestManifest
+
+
+def make_sheet(clean_price: float) -> ExcelSheet:
+    # Layout as read from a Bundesbank workbook: a units row, then one row per bond.
+    data = pd.DataFrame(
+        [
+            ["ISIN", "%", "Issue", "Maturity", "Years", "EUR bn", "Price", "%", "Price"],
+            [
+                "DE0001102580",
+                2.5,
+                "Bund 2032",
+                "15.02.2032",
+                7.1,
+                25.0,
+                clean_price,
+                2.6,
+                clean_price + 1.0,
+            ],
+        ]
+    )
+    return ExcelSheet(name="02.01.2025", data=data, file_key="2025-01")
+
+
+class TestBundDataArgs(SimpleTestCase):
+    def test_metrics_path_read_when_parsed(self):
+        with patch("scripts.get_bund_data.conf.get", return_value="metrics/bund.prom"):
+            assert parse_args(()).metrics_path == "metrics/bund.prom"
+        assert parse_args(("metrics_path=other.json",)).metrics_path == "other.json"
+
+    def test_date(self):
+        assert parse_args(("date=2025-01-02",)).date == dt.date(2025, 1, 2)
+        assert parse_args(()).date is None
+
+
+class TestIngestManifest(TestCase):
+    def setUp(self):
+        self.extractor = BundesbankDataExtractor(date=dt.date(2025, 1, 2))
+        self.transformer = BundesbankDataTransformer()
+        self.loader = BundesbankDataLoader()
+
+    def _ingest(self, sheet: ExcelSheet) -> bool:
+        entry = IngestManifest.objects.filter(sheet_name=sheet.name).first()
+        if not self.extractor._register_sheet(sheet, entry):
+            return False
+        extracted = self.extractor.Extracted(
+            available_files=[], excel_files=[ExcelFile(sheets=[sheet])]
+        )
+        self.loader.load(self.transformer.transform(extracted))
+        return True
+
+    def test_loads_and_records_sheet(self):
+        assert self._ingest(make_sheet(99.5))
+
+        entry = IngestManifest.objects.get(file_key="2025-01", sheet_name="02.01.2025")
+        assert entry.status == IngestManifest.Status.LOADED
+        assert entry.row_count == 1
+        metric = BondMetric.objects.get(bond_id="DE0001102580")
+        assert metric.clean_price == 99.5
+        # Risk is computed for every loaded row; a 7 year bond has a duration of about 6.5.
+        assert 6.0 < metric.modified_duration < 7.0
+        # Accrued interest is the quoted dirty less clean price.
+        assert abs(metric.accrued_interest - (float(metric.dirty_price) - 99.5)) < 1e-9
+        assert abs(metric.dv01 - metric.modified_duration * float(metric.dirty_price) / 1e4) < 1e-9
+        assert metric.convexity > 0
+
+    def test_skips_unchanged_sheet(self):
+        assert self._ingest(make_sheet(99.5))
+        assert not self._ingest(make_sheet(99.5))
+
+    def test_reloads_changed_sheet(self):
+        assert self._ingest(make_sheet(99.5))
+        assert self._ingest(make_sheet(98.25))
+
+        assert BondMetric.objects.count() == 1
+        assert BondMetric.objects.get(bond_id="DE0001102580").clean_price == 98.25
+
+    def test_bond_metrics_are_unique_per_date(self):
+        # The migrated table, not just the model, must have the key the upsert conflicts on.
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT indexdef FROM pg_indexes WHERE indexname = %s",
+                ["yield_curves_bondmetric_pkey"],
+            )
+            (indexdef,) = cursor.fetchone()
+        assert indexdef.startswith("CREATE UNIQUE INDEX")
+        assert indexdef.endswith("(date, bond_id)")
+
+        assert self._ingest(make_sheet(99.5))
+        metric = BondMetric.objects.get()
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            BondMetric.objects.bulk_create([metric])
+
+    def test_resumes_pending_sheet(self):
+        sheet = make_sheet(99.5)
+        # Registered by the extractor but never loaded, e.g. the run crashed.
+        self.extractor._register_sheet(sheet, None)
+        entry = IngestManifest.objects.get(sheet_name=sheet.name)
+        assert entry.status == IngestManifest.Status.PENDING
+
+        assert self._ingest(sheet)
+
+
+class TestResume(TestCase):
+    def setUp(self):
+        self.files = [
+            File(url=f"https://example.com/{month}.xlsx", month=month, year=2025, text="")
+            for month in (3, 2, 1)
+        ]
+        self.extractor = BundesbankDataExtractor(backfill=True)
+        self.extractor.throttle = lambda: None
+
+    def record(self, file_key: str, n_sheets: int, n_loaded: int):
+        IngestManifest.objects.create(
+            source="bundesbank",
+            file_key=file_key,
+            sheet_name=WORKBOOK_ENTRY,
+            content_hash=file_version({"ETag": '"v1"'}),
+            status=IngestManifest.Status.LOADED,
+            row_count=n_sheets,
+        )
+        for i in range(n_sheets):
+            IngestManifest.objects.create(
+                source="bundesbank",
+                file_key=file_key,
+                sheet_name=f"{i + 1:02d}.{file_key[-2:]}.2025",
+                content_hash="hash",
+                status=IngestManifest.Status.LOADED
+                if i < n_loaded
+                else IngestManifest.Status.PENDING,
+            )
+
+    def downloaded(self, headers=None) -> list[str]:
+        head = Mock(headers={"ETag": '"v1"'} if headers is None else headers)
+        with (
+            patch.object(self.extractor, "_get_available_files", return_value=self.files),
+            patch.object(self.extractor, "_iter_excel_sheets", return_value=iter([])) as download,
+            patch("scripts.get_bund_data.requests.head", return_value=head),
+        ):
+            list(self.extractor.extract_batches())
+        return [call.args[0].file_key for call in download.call_args_list]
+
+    def test_skips_loaded_files_without_downloading(self):
+        # January was loaded in full; a crash left February's last sheet pending.
+        self.record("2025-01", n_sheets=3, n_loaded=3)
+        self.record("2025-02", n_sheets=3, n_loaded=2)
+
+        assert self.downloaded() == ["2025-02", "2025-03"]
+
+    def test_latest_file_is_always_downloaded(self):
+        self.record("2025-03", n_sheets=3, n_loaded=3)
+
+        assert self.downloaded() == ["2025-01", "2025-02", "2025-03"]
+
+    def test_file_opened_but_not_registered(self):
+        # The workbook entry alone, as when the run died before its sheets were read.
+        self.record("2025-01", n_sheets=3, n_loaded=0)
+        IngestManifest.objects.filter(file_key="2025-01").exclude(
+            sheet_name=WORKBOOK_ENTRY
+        ).delete()
+
+        assert "2025-01" in self.downloaded()
+
+    def test_revised_file_is_downloaded(self):
+        self.record("2025-01", n_sheets=3, n_loaded=3)
+
+        assert "2025-01" in self.downloaded(headers={"ETag": '"v2"'})
+        # Without validators a revision can't be ruled out.
+        assert "2025-01" in self.downloaded(headers={})
+
+    def test_workbook_recorded_once_every_sheet_is_registered(self):
+        workbook = io.BytesIO()
+        with pd.ExcelWriter(workbook, engine="openpyxl") as writer:
+            for name in ("02.01.2025", "03.01.2025"):
+                make_sheet(99.5).data.to_excel(writer, sheet_name=name, index=False)
+        response = Mock(content=workbook.getvalue(), headers={"ETag": '"v1"'})
+
+        with patch("scripts.get_bund_data.requests.get", return_value=response):
+            sheets = self.extractor._iter_excel_sheets(self.files[-1])
+            next(sheets)
+            assert not IngestManifest.objects.filter(sheet_name=WORKBOOK_ENTRY).exists()
+            list(sheets)
+
+        workbook_entry = IngestManifest.objects.get(sheet_name=WORKBOOK_ENTRY)
+        assert workbook_entry.row_count == 2
+        assert workbook_entry.is_loaded(file_version({"ETag": '"v1"'}))
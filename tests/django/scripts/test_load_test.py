@@ -0,0 +1,34 @@
+from unittest.mock import patch
+
+from django.contrib.auth import authenticate
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from scripts.load_test import USERNAME_PREFIX, run
+from src.utils.load_test import LoadTestResult
+
+
+class TestLoadTestScript(TestCase):
+    def test_users_are_temporary(self):
+        User.objects.create_user(username=f"{USERNAME_PREFIX}0", password="password")
+        configs = []
+
+        def load_test(config):
+            configs.append(config)
+            # The virtual users can log in while the test runs.
+            assert all(
+                authenticate(username=username, password=config.password)
+                for username in config.usernames
+            )
+            return type("LoadTest", (), {"run": lambda _: LoadTestResult(1.0, {})})()
+
+        with patch("scripts.load_test.LoadTest", side_effect=load_test):
+            assert run("users=2") == 0
+            assert run("users=2") == 0
+
+        first, second = configs
+        assert len(first.password) > 20
+        assert first.password != second.password
+        assert not set(first.usernames) & set(second.usernames)
+        # Only the users created for the runs are deleted.
+        assert list(User.objects.values_list("username", flat=True)) == [f"{USERNAME_PREFIX}0"]
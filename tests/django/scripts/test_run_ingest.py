@@ -0,0 +1,21 @@
+import datetime as dt
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from scripts import run_ingest
+
+
+class TestRunIngest(SimpleTestCase):
+    def test_date_is_parsed(self):
+        with patch("scripts.run_ingest.run_pipelines", return_value=[]) as run_pipelines:
+            assert run_ingest.run("sources=bundesbank", "date=2025-01-02") == 0
+
+        options = run_pipelines.call_args.kwargs["options"]
+        assert options == {"date": dt.date(2025, 1, 2), "backfill": False}
+
+    def test_invalid_date(self):
+        with patch("scripts.run_ingest.run_pipelines") as run_pipelines:
+            assert run_ingest.run("date=02.01.2025") == -1
+
+        run_pipelines.assert_not_called()
@@ -21,3 +21,12 @@ class TestConfiguration:
 
     def test_environment_variable_override(self, conf: Configuration):
         assert conf.get("some.nested.value") == "some_secret_password"
+
+
+def test_loads_on_first_access(monkeypatch, tmp_path):
+    monkeypatch.setenv("CONFIG_PATH", str(tmp_path / "missing.yml"))
+    monkeypatch.chdir(tmp_path)
+    conf = Configuration()
+
+    with pytest.raises(FileNotFoundError):
+        conf.get("debug")
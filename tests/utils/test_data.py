@@ -1,8 +1,17 @@
+import threading
 from unittest.mock import MagicMock, patch
 
+import pytest
 from pydantic.main import BaseModel
 
-from src.utils.data import Extractor, Loader, Transformer, run_pipeline
+from src.utils.data import (
+    Extractor,
+    Loader,
+    StreamingExtractor,
+    Transformer,
+    run_pipeline,
+    run_streaming_pipeline,
+)
 
 
 class MyExtractor(Extractor):
@@ -45,3 +54,69 @@ def test_run_pipeline(mock_extract: MagicMock, mock_transform: MagicMock, mock_l
     assert mock_extract.called
     mock_transform.assert_called_once_with(mock_extracted)
     mock_load.assert_called_once_with(mock_transformed)
+
+
+class MyStreamingExtractor(StreamingExtractor):
+    class Extracted(BaseModel):
+        data: int
+
+    def __init__(self, n_batches: int, fail_at: int | None = None):
+        self.n_batches = n_batches
+        self.fail_at = fail_at
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def extract(self):
+        raise NotImplementedError
+
+    def extract_batches(self):
+        for i in range(self.n_batches):
+            if i == self.fail_at:
+                raise RuntimeError("extract failed")
+            with self.lock:
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            yield self.Extracted(data=i)
+
+
+class MyStreamingTransformer(Transformer):
+    class Transformed(BaseModel):
+        data: int
+
+    def transform(self, extracted):
+        return self.Transformed(data=extracted.data * 10)
+
+
+class MyStreamingLoader(Loader):
+    def __init__(self, extractor: MyStreamingExtractor):
+        self.extractor = extractor
+        self.loaded = []
+
+    def load(self, transformed):
+        self.loaded.append(transformed.data)
+        with self.extractor.lock:
+            self.extractor.in_flight -= 1
+
+
+def test_run_streaming_pipeline():
+    extractor = MyStreamingExtractor(n_batches=50)
+    loader = MyStreamingLoader(extractor)
+
+    metrics = run_streaming_pipeline(extractor, MyStreamingTransformer(), loader, max_queue_size=2)
+
+    assert metrics.stages[2].calls == 50
+    assert loader.loaded == [i * 10 for i in range(50)]
+    # Two bounded queues, plus one batch held by each of the three stages.
+    assert extractor.max_in_flight <= 2 * 2 + 3
+
+
+def test_run_streaming_pipeline_propagates_errors():
+    extractor = MyStreamingExtractor(n_batches=10, fail_at=3)
+    loader = MyStreamingLoader(extractor)
+
+    with pytest.raises(RuntimeError, match="extract failed"):
+        run_streaming_pipeline(extractor, MyStreamingTransformer(), loader)
+
+    # Batches already in flight may be dropped, but nothing past the failure is loaded.
+    assert loader.loaded == [0, 10, 20][: len(loader.loaded)]
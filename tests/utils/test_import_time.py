@@ -0,0 +1,51 @@
+"""Test that QuantLib is only imported on first calibration."""
+
+import os
+import subprocess
+import sys
+
+SETUP = "import django; django.setup(); "
+
+
+def run_python(code: str) -> subprocess.CompletedProcess:
+    env = {**os.environ, "DJANGO_SETTINGS_MODULE": "src.config.settings"}
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", SETUP + code],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def import_times_us(stderr: str) -> dict[str, int]:
+    """Cumulative import time per module from `-X importtime` output."""
+    times = {}
+    for line in stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, module = line[len("import time:") :].split("|")
+            if cumulative.strip().isdigit():
+                times[module.strip()] = int(cumulative)
+    return times
+
+
+def test_app_import_skips_quantlib():
+    result = run_python(
+        "import sys; "
+        "import src.apps.yield_curves.views, src.curve_engine.curve_engine, src.config.urls; "
+        "print('QuantLib' in sys.modules)"
+    )
+
+    assert result.stdout.strip() == "False"
+    times = import_times_us(result.stderr)
+    assert "QuantLib" not in times
+    print(f"yield_curves views import: {times['src.apps.yield_curves.views'] / 1e3:.1f}ms")
+
+
+def test_calibration_imports_quantlib():
+    result = run_python(
+        "import sys; from src.utils.ql import warm_up; warm_up(); print('QuantLib' in sys.modules)"
+    )
+
+    assert result.stdout.strip() == "True"
+    print(f"QuantLib import: {import_times_us(result.stderr)['QuantLib'] / 1e3:.1f}ms")
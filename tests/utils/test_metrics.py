@@ -0,0 +1,46 @@
+"""Test metrics module."""
+
+import json
+
+from src.utils.metrics import PipelineMetrics, StageMetrics, format_prometheus
+
+
+def test_stage_metrics_measure():
+    metrics = StageMetrics(stage="extract")
+    for _ in range(3):
+        with metrics.measure():
+            sum(range(10_000))
+
+    assert metrics.calls == 3
+    assert metrics.wall_time_s > 0.0
+    assert metrics.cpu_time_s >= 0.0
+    assert metrics.peak_rss_bytes > 0
+
+
+def test_format_prometheus():
+    text = format_prometheus("pipeline_stage_rows_in_total", "Rows.", [({"stage": "load"}, 12)])
+    assert text == (
+        "# HELP pipeline_stage_rows_in_total Rows.\n"
+        "# TYPE pipeline_stage_rows_in_total gauge\n"
+        'pipeline_stage_rows_in_total{stage="load"} 12\n'
+    )
+
+
+def test_pipeline_metrics_write(tmp_path):
+    metrics = PipelineMetrics(
+        pipeline="bundesbank",
+        stages=[StageMetrics(stage="extract", rows_out=5, bytes_downloaded=1024)],
+        wall_time_s=1.5,
+    )
+
+    metrics.write(tmp_path / "metrics.json")
+    metrics.write(tmp_path / "metrics.prom")
+
+    data = json.loads((tmp_path / "metrics.json").read_text())
+    assert data["stages"][0]["bytes_downloaded"] == 1024
+    prom = (tmp_path / "metrics.prom").read_text()
+    assert 'pipeline_stage_rows_out_total{pipeline="bundesbank",stage="extract"} 5' in prom
+    assert 'pipeline_wall_seconds{pipeline="bundesbank"} 1.5' in prom
+    assert "# TYPE pipeline_stage_rows_out_total counter\n" in prom
+    assert "# TYPE pipeline_stage_calls_total counter\n" in prom
+    assert "# TYPE pipeline_stage_peak_rss_bytes gauge\n" in prom
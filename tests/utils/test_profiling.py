@@ -0,0 +1,32 @@
+"""Test profiling module."""
+
+from src.utils.profiling import RequestProfile, current_profile, profiling, timed
+
+
+def test_timed_without_profile():
+    with timed("fit"):
+        pass
+
+    assert current_profile() is None
+
+
+def test_timed_accumulates_phases():
+    profile = RequestProfile()
+    with profiling(profile):
+        for _ in range(2):
+            with timed("fit"):
+                sum(range(10_000))
+        with timed("serialize"):
+            pass
+
+    assert current_profile() is None
+    assert list(profile.phases) == ["fit", "serialize"]
+    assert profile.phases["fit"] > 0.0
+
+
+def test_server_timing():
+    profile = RequestProfile(phases={"fit": 0.0125}, sql_count=3, sql_time_s=0.002)
+
+    assert profile.server_timing(total_s=0.02) == (
+        'sql;dur=2.00;desc="3 queries", fit;dur=12.50, total;dur=20.00'
+    )
@@ -0,0 +1,100 @@
+"""Test ingest scheduler module."""
+
+import threading
+import time
+
+import pytest
+from pydantic import BaseModel
+
+from src.utils.data import Extractor, Loader, Transformer
+from src.utils.scheduler import (
+    RateLimiter,
+    register_pipeline,
+    run_pipelines,
+    unregister_pipeline,
+)
+
+
+class Gauge:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.current = 0
+        self.peak = 0
+
+    def __enter__(self):
+        with self.lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+
+    def __exit__(self, *exc):
+        with self.lock:
+            self.current -= 1
+
+
+class SleepyExtractor(Extractor):
+    class Extracted(BaseModel):
+        data: int
+
+    def __init__(self, gauge: Gauge, fail: bool = False):
+        self.gauge = gauge
+        self.fail = fail
+
+    def extract(self):
+        with self.gauge:
+            self.throttle()
+            time.sleep(0.05)
+        if self.fail:
+            raise RuntimeError("source unavailable")
+        return self.Extracted(data=1)
+
+
+class PassThroughTransformer(Transformer):
+    def transform(self, extracted):
+        return extracted
+
+
+class NullLoader(Loader):
+    def load(self, transformed):
+        return
+
+
+@pytest.fixture
+def pipelines():
+    gauge = Gauge()
+    names = [f"source_{i}" for i in range(6)]
+    for i, name in enumerate(names):
+        register_pipeline(name, country="DE")(
+            lambda i=i: (
+                SleepyExtractor(gauge, fail=i == 2),
+                PassThroughTransformer(),
+                NullLoader(),
+            )
+        )
+    yield names, gauge
+    for name in names:
+        unregister_pipeline(name)
+
+
+def test_run_pipelines_concurrency_and_isolation(pipelines):
+    names, gauge = pipelines
+
+    results = run_pipelines(names, max_concurrency=3)
+
+    assert gauge.peak == 3
+    assert [result.name for result in results] == names
+    assert [result.success for result in results] == [True, True, False, True, True, True]
+    assert "source unavailable" in results[2].error
+
+
+def test_run_pipelines_unknown_name():
+    with pytest.raises(ValueError, match="Unknown pipelines"):
+        run_pipelines(["does_not_exist"])
+
+
+def test_rate_limiter():
+    limiter = RateLimiter(rate=50.0)
+    start = time.monotonic()
+    for _ in range(6):
+        limiter.acquire()
+    # The first acquisition is free, the next five are spaced 1 / rate apart.
+    assert time.monotonic() - start >= 5 / 50.0 * 0.9
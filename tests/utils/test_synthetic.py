@@ -0,0 +1,57 @@
+"""Test synthetic market data module."""
+
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.synthetic import (
+    COLUMNS,
+    SyntheticMarket,
+    SyntheticMarketConfig,
+    isin_check_digit,
+    write_bundesbank_workbooks,
+)
+
+
+@pytest.fixture(scope="module")
+def market() -> SyntheticMarket:
+    return SyntheticMarket(
+        SyntheticMarketConfig(
+            start_date=dt.date(2024, 1, 29),
+            end_date=dt.date(2024, 2, 2),
+            n_bonds=50,
+        )
+    )
+
+
+def test_isin_check_digit():
+    # DE0001102580, a listed Bund.
+    assert isin_check_digit("DE000110258") == "0"
+
+
+def test_frame(market: SyntheticMarket):
+    frame = market.frame()
+
+    assert list(frame.columns) == COLUMNS
+    assert frame["date"].nunique() == 5
+    sizes = frame.groupby("date").size()
+    assert sizes.between(40, 60).all()
+    maturities = (pd.to_datetime(frame["maturity_date"]) - pd.to_datetime(frame["date"])).dt.days
+    assert maturities.max() / 365.25 > 25
+    assert np.all(frame["dirty_price"] >= frame["clean_price"])
+    assert frame.equals(market.frame())
+
+
+def test_write_bundesbank_workbooks(market: SyntheticMarket, tmp_path):
+    paths = write_bundesbank_workbooks(market, tmp_path)
+
+    assert [path.name for path in paths] == [
+        "bundesbank_synthetic_2024_01.xlsx",
+        "bundesbank_synthetic_2024_02.xlsx",
+    ]
+    with pd.ExcelFile(paths[1], engine="openpyxl") as workbook:
+        assert workbook.sheet_names == ["01.02.2024", "02.02.2024"]
+        sheet = workbook.parse("01.02.2024")
+    assert sheet.iloc[1:, 0].str.startswith("DE0SYN").all()